@@ -3,16 +3,20 @@ from util import *
 
 class VisitorForAliasInfo(ast.NodeVisitor):
     def __init__(self, source_code_path, module_path, codebase_parent_path, codebase_root_path,
-                alias_info):
+                alias_info,
+                module_search_index=None, package_module_paths=None):
 
         self.source_code_path = source_code_path
         self.module_path = module_path
         self.codebase_parent_path = codebase_parent_path
         self.codebase_root_path = codebase_root_path
+        self.module_search_index = module_search_index
+        self.package_module_paths = package_module_paths
 
         self.alias_info = alias_info
 
     def visit_Module(self, node):
+        # only the top-level statements are read, the nodes within them are not visited
         for inner_node in node.body:
             if isinstance(inner_node, ast.ClassDef):
                 self._parse_ClassDef(inner_node)
@@ -22,8 +26,6 @@ class VisitorForAliasInfo(ast.NodeVisitor):
                 self._parse_ImportFrom(inner_node)
             self._check_non_ClassDef_Import_ImportFrom_alias_str(inner_node)
 
-        self.generic_visit(node)
-
     def _check_non_ClassDef_Import_ImportFrom_alias_str(self, node):
         """
         Adds alias_str from irrelevant nodes with node as "other" to alias_info \\
@@ -60,7 +62,8 @@ class VisitorForAliasInfo(ast.NodeVisitor):
             alias_asname = alias.asname
             alias_str = alias_asname if alias_asname != None else alias_name
 
-            path_with_alias_str = get_path_of_node_module(node, self.source_code_path, self.codebase_parent_path, self.codebase_root_path, alias_name)
+            path_with_alias_str = get_path_of_node_module(node, self.source_code_path, self.codebase_parent_path, self.codebase_root_path, alias_name,
+                                                          self.module_search_index, self.package_module_paths)
             self.alias_info.append([(alias_str, alias_name, path_with_alias_str, node)])
 
     def _parse_ImportFrom(self, node):
@@ -73,7 +76,8 @@ class VisitorForAliasInfo(ast.NodeVisitor):
             alias_asname = alias.asname
             alias_str = alias_asname if alias_asname != None else alias_name
 
-            path_with_alias_str = get_path_of_node_module(node, self.source_code_path, self.codebase_parent_path, self.codebase_root_path, alias_name)
+            path_with_alias_str = get_path_of_node_module(node, self.source_code_path, self.codebase_parent_path, self.codebase_root_path, alias_name,
+                                                          self.module_search_index, self.package_module_paths)
             self.alias_info.append([(alias_str, alias_name, path_with_alias_str, node)])
 
     def _add_alias_str_other_entry(self, node):
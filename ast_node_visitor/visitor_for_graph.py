@@ -32,12 +32,15 @@ class VisitorForGraph(ast.NodeVisitor):
     def __init__(self, source_code_path, module_path, codebase_parent_path, codebase_root_path,
                 class_hierarchy_graph, alias_name_path_resolved_path,
                 path_last_alias_str_info, path_type,
-                log_ast_parse=False):
+                log_ast_parse=False,
+                module_search_index=None, package_module_paths=None):
 
         self.source_code_path = source_code_path
         self.module_path = module_path
         self.codebase_parent_path = codebase_parent_path
         self.codebase_root_path = codebase_root_path
+        self.module_search_index = module_search_index
+        self.package_module_paths = package_module_paths
 
         self.class_hierarchy_graph = class_hierarchy_graph
         self.alias_name_path_resolved_path = alias_name_path_resolved_path
@@ -53,7 +56,11 @@ class VisitorForGraph(ast.NodeVisitor):
         self.current_class_name = ""
         self.edge_case = False
 
+        # whether a possible circular import was found in the current alias path resolution
+        self.circular_import_found = False
+
     def visit_Module(self, node):
+        # only the top-level statements are read, the nodes within them are not visited
         for inner_node in node.body:
             if isinstance(inner_node, ast.Import):
                 self._parse_Import(inner_node)
@@ -64,7 +71,6 @@ class VisitorForGraph(ast.NodeVisitor):
             elif isinstance(inner_node, ast.Delete):
                 for target_node in inner_node.targets:
                     remove_alias_str_entry(target_node, self.alias_str_path_node)
-        self.generic_visit(node)
 
     def _parse_Import(self, node):
         """
@@ -94,7 +100,8 @@ class VisitorForGraph(ast.NodeVisitor):
             alias_str = alias_asname if alias_asname != None else alias_name
 
             if alias_str == "*":
-                path = get_path_of_node_module(node, self.source_code_path, self.codebase_parent_path, self.codebase_root_path, alias_name)
+                path = get_path_of_node_module(node, self.source_code_path, self.codebase_parent_path, self.codebase_root_path, alias_name,
+                                               self.module_search_index, self.package_module_paths)
                 if path not in self.path_last_alias_str_info:   # path of module of from module import * is not in code base
                     continue
                 path = path if self.path_type[path] == PathType.file else path + ".__init__"
@@ -221,6 +228,7 @@ class VisitorForGraph(ast.NodeVisitor):
         """
 
         visited_paths = set()
+        self.circular_import_found = False
         return self._get_alias_path_and_node_helper(visited_paths, path_with_alias_str, alias_str, alias_name, node, not_last_defined)
 
     def _get_alias_path_and_node_helper(self, visited_paths, path_with_alias_str, alias_str, alias_name, node, not_last_defined=False):
@@ -229,7 +237,8 @@ class VisitorForGraph(ast.NodeVisitor):
         if isinstance(node, ast.Import) or isinstance(node, ast.ImportFrom):
             path = None
             if not_last_defined:
-                path = get_path_of_node_module(node, self.source_code_path, self.codebase_parent_path, self.codebase_root_path, alias_name)
+                path = get_path_of_node_module(node, self.source_code_path, self.codebase_parent_path, self.codebase_root_path, alias_name,
+                                               self.module_search_index, self.package_module_paths)
             else:
                 last_alias_str_info = self.path_last_alias_str_info[path_with_alias_str] if path_with_alias_str in self.path_last_alias_str_info else None
                 if last_alias_str_info == None:
@@ -264,11 +273,20 @@ class VisitorForGraph(ast.NodeVisitor):
                             if p in visited_paths:
                                 if self.log_ast_parse and not NO_OUTPUT_CIRCULAR_IMPORT:
                                     print(f"\npossible circular import with import that began at {p} or traversed to {p}")
-                                self.alias_name_path_resolved_path[(alias_name, p)] = None
+                                self.circular_import_found = True
                                 continue
 
+                            circular_import_found = self.circular_import_found
+                            self.circular_import_found = False
+
                             ret = self._get_alias_path_and_node_helper(visited_paths, p, alias_str_other, alias_name_other, node_other)
-                            self.alias_name_path_resolved_path[(alias_name, p)] = ret
+
+                            # a resolution cut short by a circular import depends on the paths visited before it
+                            # and is not memoized so that the resolved path does not depend on the order that modules are visited
+                            if not self.circular_import_found:
+                                self.alias_name_path_resolved_path[(alias_name, p)] = ret
+                            self.circular_import_found = self.circular_import_found or circular_import_found
+
                             if ret != None:
                                 return ret
 
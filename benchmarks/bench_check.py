@@ -0,0 +1,223 @@
+import contextlib
+import io
+import os
+import pickle
+import random
+import sys
+import tempfile
+import time
+from array import array
+
+from benchmark_runs import *
+
+from check_inheritance_consistency import *
+from reference_c3_merge import *
+
+CLASSES_OPTION = "--classes"
+
+WORKLOAD_ARGUMENT_INDEX = 1 # 0-indexed
+
+# synthetic class hierarchy graphs, no corpus is needed
+LAYERED_WORKLOAD = "layered"
+WIDE_WORKLOAD = "wide"
+DIAMONDS_WORKLOAD = "diamonds"
+WORKLOADS = (LAYERED_WORKLOAD, WIDE_WORKLOAD, DIAMONDS_WORKLOAD)
+
+DEFAULT_NUM_CLASSES = { LAYERED_WORKLOAD: 100000, WIDE_WORKLOAD: 500000 }
+
+# width and number of stacked diamonds of DIAMONDS_WORKLOAD
+DIAMONDS = ((10, 10), (100, 5), (500, 2), (1000, 1))
+
+SEED = 0
+
+def get_layered_graph(num_classes):
+    """
+    Returns a class hierarchy graph of num_classes classes in 200 layers \\
+    Each class inherits from a class of the previous layer, and from a class of the first layer 30% of the time
+    """
+
+    rng = random.Random(SEED)
+    layer_size = num_classes // 200
+
+    class_hierarchy_graph = dict()
+    for i in range(num_classes):
+        layer = i // layer_size
+        inherited_class_identifiers = []
+        if layer > 0:
+            inherited_class_identifiers.append(f"m.C{(layer - 1) * layer_size + rng.randrange(layer_size)}")
+        if layer > 1 and rng.random() < 0.3:
+            inherited_class_identifiers.append(f"m.C{rng.randrange(layer_size)}")
+        class_hierarchy_graph[f"m.C{i}"] = (inherited_class_identifiers, "/src/m.py")
+
+    return class_hierarchy_graph
+
+def get_wide_graph(num_classes):
+    """
+    Returns a class hierarchy graph of num_classes classes in 25 layers, 10 classes per module \\
+    Each class inherits from a class of the previous layer, and from a class of the first layer 30% of the time \\
+    Half of the classes of the first layer inherit from an external class
+    """
+
+    rng = random.Random(SEED)
+    layer_size = num_classes // 25
+
+    class_hierarchy_graph = dict()
+    for i in range(num_classes):
+        layer = i // layer_size
+        inherited_class_identifiers = []
+        if layer == 0:
+            if rng.random() < 0.5:
+                inherited_class_identifiers.append("external.Base")
+        else:
+            k = (layer - 1) * layer_size + rng.randrange(layer_size)
+            inherited_class_identifiers.append(f"pkg.mod{k // 10}.Class{k}")
+        if layer > 1 and rng.random() < 0.3:
+            k = rng.randrange(layer_size)
+            inherited_class_identifiers.append(f"pkg.mod{k // 10}.Class{k}")
+        class_hierarchy_graph[f"pkg.mod{i // 10}.Class{i}"] = (inherited_class_identifiers, f"/src/pkg/mod{i // 10}.py")
+
+    return class_hierarchy_graph
+
+def get_diamonds_graph(width, num_diamonds):
+    """
+    Returns a class hierarchy graph of num_diamonds stacked diamonds \\
+    In each diamond, width classes inherit from the bottom of the previous diamond and one class inherits from all of them
+    """
+
+    class_hierarchy_graph = {"m.R": ([], "/src/m.py")}
+    bottom = "m.R"
+    for i in range(num_diamonds):
+        middle = [f"m.M{i}_{j}" for j in range(width)]
+        for class_identifier in middle:
+            class_hierarchy_graph[class_identifier] = ([bottom], "/src/m.py")
+        bottom = f"m.B{i}"
+        class_hierarchy_graph[bottom] = (middle, "/src/m.py")
+
+    return class_hierarchy_graph
+
+def dump_graph_pickle(class_hierarchy_graph, cwd, name):
+    """
+    Writes class_hierarchy_graph as the pickle dump file of source code named name in cwd and returns its path
+    """
+
+    graph_pickle_dump_path = os.path.join(cwd, name + CLASS_HIERARCHY_GRAPH_DUMP_SUFFIX + ".pkl")
+    with open(graph_pickle_dump_path, "wb") as f:
+        pickle.dump(class_hierarchy_graph, f)
+    f.close()
+
+    return graph_pickle_dump_path
+
+def time_check(repo_path, class_hierarchy_graph, cwd, name, runs):
+    """
+    Times check_inheritance_consistency.py of the checkout at repo_path on class_hierarchy_graph, best of runs, \\
+    then prints the peak memory of one more run with --profile
+    """
+
+    graph_pickle_dump_path = dump_graph_pickle(class_hierarchy_graph, cwd, name)
+    wall_seconds = get_best_wall_seconds(repo_path, "check_inheritance_consistency.py", [graph_pickle_dump_path], cwd, runs)
+    print(f"{name}: {len(class_hierarchy_graph)} classes, check {wall_seconds:.3f} s wall, best of {runs}")
+    print_profile_report(get_profile_report(repo_path, "check_inheritance_consistency.py", [graph_pickle_dump_path], cwd, name, "check"))
+
+def time_linearization_order(class_hierarchy_graph):
+    """
+    Times the linearization order of class_hierarchy_graph in this repository \\
+    with a DFS from each class with its own visited set, as before the shared DFS of get_c3_linearizations, \\
+    and with one DFS over the whole graph with a shared visited set
+    """
+
+    compact_class_hierarchy_graph = CompactClassHierarchyGraph(class_hierarchy_graph)
+    num_classes = compact_class_hierarchy_graph.num_classes
+
+    start_time = time.perf_counter()
+    num_visits = 0
+    for class_id in range(num_classes):
+        linearization_order = array(CLASS_ID_TYPECODE)
+        get_linearization_order(compact_class_hierarchy_graph, class_id, bytearray(num_classes), linearization_order)
+        num_visits += len(linearization_order)
+    per_class_seconds = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    visited = bytearray(num_classes)
+    linearization_order = array(CLASS_ID_TYPECODE)
+    for class_id in range(num_classes):
+        get_linearization_order(compact_class_hierarchy_graph, class_id, visited, linearization_order)
+    shared_seconds = time.perf_counter() - start_time
+
+    print(f"linearization order: DFS from each class {per_class_seconds:.3f} s, {num_visits} visits, "
+          f"shared DFS {shared_seconds:.3f} s, {len(linearization_order)} visits")
+
+def time_c3_linearizations(class_hierarchy_graph, runs):
+    """
+    Times the c3 linearizations of class_hierarchy_graph in this repository, best of runs, \\
+    and with the reference merge before the head indices and tail occurrence counts, see get_reference_c3_linearizations, in one run \\
+    as its runs take minutes on the widest diamonds
+    """
+
+    compact_class_hierarchy_graph = CompactClassHierarchyGraph(class_hierarchy_graph)
+
+    best_seconds = None
+    for _ in range(runs):
+        start_time = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            c3_linearizations, linearization_nodes = get_c3_linearizations(compact_class_hierarchy_graph, set(), None, None)
+        seconds = time.perf_counter() - start_time
+        if best_seconds == None or seconds < best_seconds:
+            best_seconds = seconds
+
+    start_time = time.perf_counter()
+    reference_c3_linearizations, _ = get_reference_c3_linearizations(compact_class_hierarchy_graph)
+    reference_seconds = time.perf_counter() - start_time
+
+    c3_linearizations = [linearization if isinstance(linearization, LinearizationStatus) else linearization_nodes.get_class_ids(linearization)
+                         for linearization in c3_linearizations]
+    print(f"c3 linearizations: {best_seconds * 1000:.1f} ms, best of {runs}, reference merge: {reference_seconds * 1000:.1f} ms, "
+          f"{'identical' if c3_linearizations == reference_c3_linearizations else 'different'} linearizations")
+
+def usage_info():
+    """
+    Outputs the proper usage of this script
+    """
+
+    print("Usage:")
+    print(f"python benchmarks/bench_check.py [{'|'.join(WORKLOADS)}] [options]")
+    print()
+    print("Workloads, synthetic class hierarchy graphs generated by this script:")
+    print(f"{LAYERED_WORKLOAD}: {DEFAULT_NUM_CLASSES[LAYERED_WORKLOAD]} classes in 200 layers, also times the linearization order with a DFS from each class against one shared DFS")
+    print(f"{WIDE_WORKLOAD}: {DEFAULT_NUM_CLASSES[WIDE_WORKLOAD]} classes in 25 layers with external bases, for the time and peak memory of the whole check")
+    print(f"{DIAMONDS_WORKLOAD}: stacked diamonds of width {', '.join(str(width) for width, _ in DIAMONDS)}, where the C3 merges of many parent linearizations dominate")
+    print()
+    print("Options:")
+    print(f"{CLASSES_OPTION} N: number of classes of the {LAYERED_WORKLOAD} and {WIDE_WORKLOAD} workloads")
+    print(f"{RUNS_OPTION} N: number of runs of each timed check, the best is reported, {DEFAULT_RUNS} by default")
+    print(f"{REPO_OPTION} PATH: time check_inheritance_consistency.py of the checkout at PATH, e. g. a git worktree of an earlier commit, instead of this repository")
+    print()
+    print("The in-process times of the linearization order and the c3 linearizations are always of this repository,")
+    print("the c3 linearizations are also timed with the reference merge of benchmarks/reference_c3_merge.py.")
+
+if __name__ == "__main__":
+    """
+    Times the checker on synthetic class hierarchy graphs
+    """
+
+    if len(sys.argv) <= WORKLOAD_ARGUMENT_INDEX or sys.argv[WORKLOAD_ARGUMENT_INDEX] not in WORKLOADS:
+        usage_info()
+        exit(1)
+
+    workload = sys.argv[WORKLOAD_ARGUMENT_INDEX]
+    repo_path = get_repo_path()
+    runs = get_runs()
+
+    with tempfile.TemporaryDirectory() as cwd:
+        if workload == LAYERED_WORKLOAD:
+            class_hierarchy_graph = get_layered_graph(int(get_option_value(CLASSES_OPTION, DEFAULT_NUM_CLASSES[LAYERED_WORKLOAD])))
+            time_linearization_order(class_hierarchy_graph)
+            time_check(repo_path, class_hierarchy_graph, cwd, workload, runs)
+        elif workload == WIDE_WORKLOAD:
+            class_hierarchy_graph = get_wide_graph(int(get_option_value(CLASSES_OPTION, DEFAULT_NUM_CLASSES[WIDE_WORKLOAD])))
+            time_check(repo_path, class_hierarchy_graph, cwd, workload, runs)
+        elif workload == DIAMONDS_WORKLOAD:
+            for width, num_diamonds in DIAMONDS:
+                print(f"width {width}, {num_diamonds} stacked diamonds")
+                class_hierarchy_graph = get_diamonds_graph(width, num_diamonds)
+                time_c3_linearizations(class_hierarchy_graph, runs)
+                time_check(repo_path, class_hierarchy_graph, cwd, f"{workload}_{width}_{num_diamonds}", runs)
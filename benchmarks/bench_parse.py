@@ -0,0 +1,186 @@
+import ast
+import os
+import random
+import sys
+import tempfile
+import time
+
+from benchmark_runs import *
+
+from get_class_hierarchy_graph import *
+
+GENERATE_IMPORTS_OPTION = "--generate-imports"
+GRAPH_OPTIONS_OPTION = "--graph-options"
+
+SOURCE_CODE_PATH_ARGUMENT_INDEX = 1 # 0-indexed
+
+# import-heavy tree of GENERATE_IMPORTS_OPTION: packages p0..p5, each with subpackages q0..q4, each with subpackages r0..r2,
+# and modules with IMPORTS_PER_MODULE import statements and CLASSES_PER_MODULE classes that inherit from imported classes
+NUM_MODULES = 3000
+IMPORTS_PER_MODULE = 40
+CLASSES_PER_MODULE = 3
+
+SEED = 0
+
+def generate_import_heavy_tree(path):
+    """
+    Writes the import-heavy tree to the folder path, about NUM_MODULES modules and NUM_MODULES * IMPORTS_PER_MODULE import aliases \\
+    Imports are absolute imports of a module or of a class of a module, \\
+    and relative imports of a class of a module in the same package or in the parent package
+    """
+
+    rng = random.Random(SEED)
+
+    packages = []
+    for p in range(6):
+        packages.append((f"p{p}",))
+        for q in range(5):
+            packages.append((f"p{p}", f"q{q}"))
+            for r in range(3):
+                packages.append((f"p{p}", f"q{q}", f"r{r}"))
+
+    os.makedirs(path)
+    open(os.path.join(path, "__init__.py"), "w").close()
+    for package in packages:
+        os.makedirs(os.path.join(path, *package))
+        open(os.path.join(path, *package, "__init__.py"), "w").close()
+
+    module_packages = [rng.choice(packages) for _ in range(NUM_MODULES)]
+    package_modules = dict()    # key: package, value: modules in the package
+    for m, package in enumerate(module_packages):
+        package_modules.setdefault(package, []).append(m)
+
+    for m, package in enumerate(module_packages):
+        lines = []
+        class_aliases = []
+        for i in range(IMPORTS_PER_MODULE):
+            k = rng.randrange(NUM_MODULES)
+            k_module_path = ".".join(module_packages[k]) + f".m{k}"
+            import_type = rng.randrange(4)
+            if import_type == 0:
+                lines.append(f"from {k_module_path} import C{rng.randrange(CLASSES_PER_MODULE)} as A{i}")
+                class_aliases.append(f"A{i}")
+            elif import_type == 1:
+                lines.append(f"import {k_module_path}")
+            elif import_type == 2:
+                lines.append(f"from {'.'.join(module_packages[k])} import m{k}")
+            else:
+                relative_package = package if len(package) == 1 or rng.random() < 0.5 else package[:-1]
+                dots = "." if relative_package == package else ".."
+                lines.append(f"from {dots}m{rng.choice(package_modules[relative_package])} import C{rng.randrange(CLASSES_PER_MODULE)} as B{i}")
+                class_aliases.append(f"B{i}")
+
+        for c in range(CLASSES_PER_MODULE):
+            lines.append("")
+            lines.append(f"class C{c}({rng.choice(class_aliases) if len(class_aliases) > 0 else 'object'}):")
+            lines.append("    pass")
+
+        with open(os.path.join(path, *package, f"m{m}.py"), "w") as f:
+            f.write("\n".join(lines) + "\n")
+        f.close()
+
+def time_graph_builds(repo_path, source_code_path, graph_options, runs):
+    """
+    Times get_class_hierarchy_graph.py of the checkout at repo_path on source_code_path with graph_options, best of runs, \\
+    without the parse cache and with a warm parse cache, then prints the peak memory of one more run with --profile
+    """
+
+    name = get_name_directory_or_file(source_code_path)
+    with tempfile.TemporaryDirectory() as cwd:
+        no_cache_seconds = get_best_wall_seconds(repo_path, "get_class_hierarchy_graph.py", [source_code_path, "--no-cache"] + graph_options, cwd, runs)
+        print(f"graph without the parse cache: {no_cache_seconds:.3f} s wall, best of {runs}")
+
+        run_script(repo_path, "get_class_hierarchy_graph.py", [source_code_path] + graph_options, cwd)
+        cache_seconds = get_best_wall_seconds(repo_path, "get_class_hierarchy_graph.py", [source_code_path] + graph_options, cwd, runs)
+        print(f"graph with a warm parse cache: {cache_seconds:.3f} s wall, best of {runs}")
+
+        print_profile_report(get_profile_report(repo_path, "get_class_hierarchy_graph.py", [source_code_path, "--no-cache"] + graph_options, cwd, name, "graph"))
+
+def time_import_resolution(source_code_path, runs):
+    """
+    Times get_path_of_node_module of this repository on each import alias of the top-level statements of source_code_path, best of runs, \\
+    with the package module paths of the module path index and with the string scan of paths that it replaced
+    """
+
+    codebase_parent_path = get_parent_path(source_code_path)
+    module_path_index = ModulePathIndex()
+    python_script_tasks = get_roots_python_script_tasks(get_root_paths(codebase_parent_path, source_code_path), None, module_path_index)
+
+    import_aliases = []  # list of (node, source code path, alias name, package module paths)
+    for task_source_code_path, _, _, package_module_paths in python_script_tasks:
+        try:
+            with open(task_source_code_path, "rb") as f:
+                module_parse = ast.parse(f.read())
+            f.close()
+        except (SyntaxError, ValueError):
+            continue
+
+        for node in module_parse.body:
+            if isinstance(node, ast.Import) or isinstance(node, ast.ImportFrom):
+                for alias in node.names:
+                    import_aliases.append((node, task_source_code_path, alias.name, package_module_paths))
+
+    def resolve(use_module_path_index):
+        best_seconds = None
+        for _ in range(runs):
+            start_time = time.perf_counter()
+            paths = [get_path_of_node_module(node, task_source_code_path, codebase_parent_path, source_code_path, alias_name,
+                                             None, package_module_paths if use_module_path_index else None)
+                     for node, task_source_code_path, alias_name, package_module_paths in import_aliases]
+            seconds = time.perf_counter() - start_time
+            if best_seconds == None or seconds < best_seconds:
+                best_seconds = seconds
+        return best_seconds, paths
+
+    string_seconds, string_paths = resolve(False)
+    index_seconds, index_paths = resolve(True)
+
+    print(f"import resolution: {len(import_aliases)} aliases in {len(python_script_tasks)} files, "
+          f"{'identical' if string_paths == index_paths else 'different'} paths, best of {runs}")
+    print(f"    string scan of paths: {string_seconds * 1000:.0f} ms, module path index: {index_seconds * 1000:.0f} ms")
+
+def usage_info():
+    """
+    Outputs the proper usage of this script
+    """
+
+    print("Usage:")
+    print("python benchmarks/bench_parse.py [path to Python source code] [options]")
+    print(f"python benchmarks/bench_parse.py {GENERATE_IMPORTS_OPTION} PATH")
+    print()
+    print("The corpus is any Python source code, e. g. the folders of pip, libcst, or IPython in site-packages for real packages,")
+    print(f"or the import-heavy tree written by {GENERATE_IMPORTS_OPTION}")
+    print()
+    print("Options:")
+    print(f"{GENERATE_IMPORTS_OPTION} PATH: write the import-heavy tree, {NUM_MODULES} modules with {IMPORTS_PER_MODULE} imports each, to the new folder PATH and exit")
+    print(f"{GRAPH_OPTIONS_OPTION} \"OPTIONS\": options of get_class_hierarchy_graph.py for the timed graph builds, e. g. \"{JOBS_OPTION} 2\"")
+    print(f"{RUNS_OPTION} N: number of runs of each timed graph build, the best is reported, {DEFAULT_RUNS} by default")
+    print(f"{REPO_OPTION} PATH: time get_class_hierarchy_graph.py of the checkout at PATH, e. g. a git worktree of an earlier commit, instead of this repository")
+    print()
+    print("The in-process time of the import resolution is always of this repository.")
+
+if __name__ == "__main__":
+    """
+    Times the class hierarchy graph builds and the import resolution on Python source code
+    """
+
+    generate_imports_path = get_option_value(GENERATE_IMPORTS_OPTION)
+    if generate_imports_path != None:
+        if os.path.exists(generate_imports_path):
+            print(f"Error: {generate_imports_path} already exists")
+            exit(1)
+        generate_import_heavy_tree(generate_imports_path)
+        print(f"import-heavy tree written to {generate_imports_path}")
+        exit(0)
+
+    source_code_path = get_path(SOURCE_CODE_PATH_ARGUMENT_INDEX, usage_info)
+    if source_code_path == None:
+        exit(1)
+
+    repo_path = get_repo_path()
+    runs = get_runs()
+    graph_options = get_option_value(GRAPH_OPTIONS_OPTION, "").split()
+
+    print(f"{source_code_path} with {repo_path}")
+    time_graph_builds(repo_path, source_code_path, graph_options, runs)
+    time_import_resolution(source_code_path, runs)
@@ -0,0 +1,95 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# the benchmarks import the helper modules of the repository
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from util import *
+
+REPO_OPTION = "--repo"
+RUNS_OPTION = "--runs"
+
+DEFAULT_RUNS = 3
+
+def get_repo_path():
+    """
+    Returns the path of the checkout whose scripts are timed, REPO_OPTION or this repository \\
+    A checkout of an earlier commit, e. g. with git worktree add, gives the times before a change
+    """
+
+    return os.path.realpath(get_option_value(REPO_OPTION, REPO_ROOT))
+
+def get_runs():
+    """
+    Returns the number of runs of each timed command, RUNS_OPTION or DEFAULT_RUNS
+    """
+
+    return int(get_option_value(RUNS_OPTION, DEFAULT_RUNS))
+
+def run_script(repo_path, script, args, cwd):
+    """
+    Runs script of the checkout at repo_path with args in cwd, where it writes its output folders, without its output \\
+    Returns the wall seconds of the run, exits if the script fails
+    """
+
+    start_time = time.perf_counter()
+    completed_process = subprocess.run([sys.executable, os.path.join(repo_path, script)] + args,
+                                       cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    wall_seconds = time.perf_counter() - start_time
+
+    if completed_process.returncode != 0:
+        print(f"Error: {script} {' '.join(args)} failed")
+        print(completed_process.stderr)
+        exit(1)
+
+    return wall_seconds
+
+def get_best_wall_seconds(repo_path, script, args, cwd, runs):
+    """
+    Returns the best wall seconds of runs runs of script, see run_script
+    """
+
+    return min(run_script(repo_path, script, args, cwd) for _ in range(runs))
+
+def has_profile_option(repo_path):
+    """
+    Returns whether the checkout at repo_path records the phases of a run with --profile
+    """
+
+    return os.path.exists(os.path.join(repo_path, "run_profiler.py"))
+
+def get_profile_report(repo_path, script, args, cwd, name, run_type):
+    """
+    Runs script of the checkout at repo_path once more with --profile \\
+    Returns the profile report of the run, see RunProfiler, or None if the checkout does not have --profile
+    """
+
+    if not has_profile_option(repo_path):
+        return None
+
+    run_script(repo_path, script, args + ["--profile"], cwd)
+    with open(os.path.join(cwd, "profiles", name + "_" + run_type + "_profile.json")) as f:
+        profile_report = json.load(f)
+    f.close()
+
+    return profile_report
+
+def print_profile_report(profile_report):
+    """
+    Prints the peak memory of each phase of profile_report \\
+    Its times are not printed, as the memory trace of --profile slows the run down, the times are those of run_script
+    """
+
+    if profile_report == None:
+        print("    no --profile in this checkout, the peak memory of the phases is not recorded")
+        return
+
+    for phase_info in profile_report["phases"]:
+        print(f"    {phase_info['phase']}: {phase_info['peak_memory_bytes'] / (1024 * 1024):.1f} MB peak memory")
+    print(f"    run: {profile_report['peak_memory_bytes'] / (1024 * 1024):.1f} MB peak memory")
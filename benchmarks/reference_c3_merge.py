@@ -0,0 +1,110 @@
+from array import array
+
+from check_inheritance_consistency import *
+
+def get_reference_c3_linearization(class_id, merge_lists, inherited_class_ids):
+    """
+    Merge of get_c3_linearization before the head indices and tail occurrence counts, the reference for its results and times \\
+    On each step, the heads and the tail positions of merge_lists, lists of class ids that are modified, are rebuilt \\
+    and the selected class is removed from each list with list.remove \\
+    inherited_class_ids is the last list in merge_lists if it is not empty, so it is modified with it
+
+    returns the linearization as a list of class ids, or None if it could not be computed, linearization status, source logical inconsistent information
+    """
+
+    res = [class_id]
+
+    num_lists = len(merge_lists)
+    empty = num_lists == 0
+
+    while not empty:
+        in_head = []
+        in_tail = dict()     # key: tail element, value: list of corresponding sublist indices and index in sublist
+
+        for lst_index, lst in enumerate(merge_lists):
+            if len(lst) == 0:
+                return (None, LinearizationStatus.error, None)
+            for index, name in enumerate(lst):
+                if index == 0:
+                    in_head.append(name)
+                if index > 0:
+                    if name in in_tail:
+                        in_tail[name].append((lst_index, index))
+                    else:
+                        in_tail[name] = [(lst_index, index)]
+
+        selected_class = None
+        for chosen_class in in_head:
+            if not chosen_class in in_tail:
+                selected_class = chosen_class
+                break
+
+        # class id 0 is a class, so the selected class is compared with None
+        if selected_class == None:
+            x, y, inherited_class_with_differing_precedence = get_precedence_order_mismatch(merge_lists, num_lists, in_tail, inherited_class_ids)
+            return (None, LinearizationStatus.source_logical_inconsistent, (x, y, inherited_class_with_differing_precedence))
+
+        # removes selected_class from lists in merge_lists
+        for lst in merge_lists:
+            try:
+                lst.remove(selected_class)
+            except: # selected_class not in lst
+                continue
+
+        merge_lists = [lst for lst in merge_lists if len(lst) > 0]
+
+        res.append(selected_class)
+
+        num_lists = len(merge_lists)
+        empty = num_lists == 0
+
+    return (res, LinearizationStatus.success, None)
+
+def get_reference_c3_linearizations(compact_class_hierarchy_graph):
+    """
+    Returns the c3 linearizations of the classes of compact_class_hierarchy_graph, which must not have cycles, \\
+    merged with get_reference_c3_linearization from copies of the linearizations of the parent classes, as before the shared linearization nodes \\
+    Each c3 linearization, indexed by class id, is a list of class ids or the LinearizationStatus if it could not be computed \\
+    Also returns the source logical inconsistent information of each source logical inconsistent class, key: class id
+    """
+
+    num_classes = compact_class_hierarchy_graph.num_classes
+    c3_linearizations = [None] * num_classes
+    precedence_order_mismatch_infos = dict()
+
+    visited = bytearray(num_classes)
+    linearization_order = array(CLASS_ID_TYPECODE)
+    for class_id in range(num_classes):
+        get_linearization_order(compact_class_hierarchy_graph, class_id, visited, linearization_order)
+
+    for class_id in linearization_order:
+        inherited_class_ids = list(compact_class_hierarchy_graph.get_inherited_class_ids(class_id))
+
+        merge_lists = []
+        status = None
+        for inherited_class_id in inherited_class_ids:
+            if not compact_class_hierarchy_graph.is_in_graph(inherited_class_id):
+                continue
+
+            inherited_class_linearization = c3_linearizations[inherited_class_id]
+            if inherited_class_linearization == LinearizationStatus.error:
+                status = LinearizationStatus.error
+                break
+            elif isinstance(inherited_class_linearization, LinearizationStatus):
+                status = LinearizationStatus.inherited_logical_inconsistent
+                break
+            merge_lists.append(inherited_class_linearization.copy())
+
+        if status != None:
+            c3_linearizations[class_id] = status
+            continue
+
+        if len(inherited_class_ids) > 0:
+            merge_lists.append(inherited_class_ids)
+
+        res, status, precedence_order_mismatch_info = get_reference_c3_linearization(class_id, merge_lists, inherited_class_ids)
+        c3_linearizations[class_id] = res if status == LinearizationStatus.success else status
+        if status == LinearizationStatus.source_logical_inconsistent:
+            precedence_order_mismatch_infos[class_id] = precedence_order_mismatch_info
+
+    return c3_linearizations, precedence_order_mismatch_infos
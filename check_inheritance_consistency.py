@@ -1,10 +1,32 @@
-import enum
+import contextlib
+import io
+import json
 import pickle
-
+from array import array
+
+from class_index import *
+from class_linearizations import *
+from compact_class_hierarchy_graph import *
+from report_sink import *
+from result_writer import *
+from run_profiler import *
 from util import *
 
 GRAPH_PICKLE_DUMP_PATH_ARGUMENT_INDEX = 1 # 0-indexed
 
+WRITE_BINARY_GRAPH_OPTION = "--write-binary-graph"
+EXPORT_CLASS_INDEX_OPTION = "--export-class-index"
+SAVE_LINEARIZATIONS_OPTION = "--save-linearizations"
+FLUSH_REPORTS_OPTION = "--flush-reports"
+OUTPUT_FORMAT_OPTION = "--output-format"
+PREVIOUS_RESULTS_OPTION = "--previous-results"
+CHANGED_CLASSES_OPTION = "--changed-classes"
+CHANGED_CLASSES_FILE_OPTION = "--changed-classes-file"
+
+# phases of a check recorded with PROFILE_OPTION, see RunProfiler
+CHECK_PROFILE_RUN_TYPE = "check"
+CHECK_PROFILE_PHASES = ("load", "write_binary_graph", "incremental_check", "cycle_check", "logical_check", "save_linearizations", "export_class_index")
+
 # two types of output: console log (LOG_<identifier>) and dump to file (DUMP_<identifier>)
 LOG_GRAPH_INFO = False
 LOG_LINEARIZATION_ORDER = False
@@ -21,137 +43,190 @@ SOURCE_LOGICAL_INCONSISTENT_INFO_FOLDER_NAME = "source_logical_inconsistent_info
 DUMP_CYCLE_INCONSISTENT = True
 CYCLE_INCONSISTENT_INFO_FOLDER_NAME = "cycle_inconsistent_info"
 
+# folder of the JSON Lines and SARIF output formats
+INCONSISTENCY_RESULTS_FOLDER_NAME = "inconsistency_results"
+
+# suffix of the JSON Lines delta report of an incremental check, in INCONSISTENCY_RESULTS_FOLDER_NAME
+INCONSISTENCY_DELTA_DUMP_SUFFIX = "_delta"
+INTRODUCED_DELTA_TYPE = "introduced"
+RESOLVED_DELTA_TYPE = "resolved"
+CHANGED_DELTA_TYPE = "changed"
+
 LOG_INHERITED_LOGICAL_INCONSISTENT = False
 
-class LinearizationStatus(enum.Enum):
-    success = 0
-    error = success + 1
-    cycle_inconsistent = error + 1
-    source_logical_inconsistent = cycle_inconsistent + 1
-    inherited_logical_inconsistent = source_logical_inconsistent + 1
+def load_class_hierarchy_graph(graph_pickle_dump_path):
+    """
+    Loads the class hierarchy graph from the pickle dump file or binary graph file at graph_pickle_dump_path, given as argument \\
+    Returns the compact class hierarchy graph, the path of the file, and whether it is a binary graph file
+    """
 
-def load_class_hierarchy_graph():
-    graph_pickle_dump_path = get_path(GRAPH_PICKLE_DUMP_PATH_ARGUMENT_INDEX, usage_info)
-    if graph_pickle_dump_path == None:
-        exit(1)
+    # binary graph files are mapped into memory instead of being read and unpickled
+    if is_binary_graph_file(graph_pickle_dump_path):
+        compact_class_hierarchy_graph = load_binary_graph(graph_pickle_dump_path)
+        if compact_class_hierarchy_graph == None:
+            exit(1)
+        return compact_class_hierarchy_graph, graph_pickle_dump_path, True
 
     class_hierarchy_graph = None
     with open(graph_pickle_dump_path, "rb") as f:
         class_hierarchy_graph = pickle.load(f)
     f.close()
 
-    return class_hierarchy_graph, graph_pickle_dump_path
+    return CompactClassHierarchyGraph(class_hierarchy_graph), graph_pickle_dump_path, False
 
-def cycle_inconsistency_check(class_hierarchy_graph):
+def cycle_inconsistency_check(compact_class_hierarchy_graph, cycle_inconsistent_report_sink, result_writer):
     """
     Searches for classes that are in cycles in the class hierarchy graph \\
-    Those classes are considered cycle inconsistent
+    Those classes are considered cycle inconsistent \\
+    Information on each cycle is written to cycle_inconsistent_report_sink and result_writer if they are not None
 
-    Returns the names of classes that are in cycle, the number of classes that are cycle inconsistent, \\
-    and information on the cycles
+    Returns the ids of classes that are in cycle and the number of classes that are cycle inconsistent
     """
 
     classes_in_cycle = set()
 
-    cycles_info = ""
-    sccs = find_sccs(class_hierarchy_graph)
+    sccs = find_sccs(compact_class_hierarchy_graph)
     for scc in sccs:
         # if the scc consists of one node and does not have edge to itself
         # that scc is not a cycle
         if len(scc) == 1:
-            class_identifier = scc[0]
-            inherited_class_identifiers = class_hierarchy_graph[class_identifier][0]
-            if class_identifier not in inherited_class_identifiers:
+            class_id = scc[0]
+            inherited_class_ids = compact_class_hierarchy_graph.get_inherited_class_ids(class_id)
+            if class_id not in inherited_class_ids:
                 continue
 
-        cycles_info += f"cycle: {scc}\n"
-        for class_identifier in scc:
-            classes_in_cycle.add(class_identifier)
-            cycles_info += f"class {class_identifier} from {class_hierarchy_graph[class_identifier][1]}\n"
-        cycles_info += "\n"
+        classes_in_cycle.update(scc)
+
+        if cycle_inconsistent_report_sink != None:
+            cycle_info = [f"cycle: {compact_class_hierarchy_graph.get_class_identifiers(scc)}\n"]
+            for class_id in scc:
+                cycle_info.append(f"class {compact_class_hierarchy_graph.get_class_identifier(class_id)} from {compact_class_hierarchy_graph.get_source_path(class_id)}\n")
+            cycle_info.append("\n")
+            cycle_inconsistent_report_sink.write("".join(cycle_info))
+
+        if result_writer != None:
+            result_writer.write_cycle(scc)
 
     num_classes_cycle_inconsistent = len(classes_in_cycle)
     if num_classes_cycle_inconsistent > 0 and LOG_CYCLE_INCONSISTENT:
-        classes_in_cycle_lst = sorted(list(classes_in_cycle))
+        classes_in_cycle_lst = sorted(compact_class_hierarchy_graph.get_class_identifiers(classes_in_cycle))
 
         for class_identifier in classes_in_cycle_lst:
             print(f"Class {class_identifier} is in cycle inheritance. Class {class_identifier} is cycle inconsistent.")
 
-    return classes_in_cycle, num_classes_cycle_inconsistent, cycles_info
+    return classes_in_cycle, num_classes_cycle_inconsistent
 
-def find_sccs(class_hierarchy_graph):
+def find_sccs(compact_class_hierarchy_graph):
     """
     Uses Tarjan's algorithm for finding strongly connected components to find each \\
     strongly connected component in the class hierarchy graph
 
-    Returns a list of each strongly connected component from the graph
+    Returns a list of each strongly connected component from the graph, as lists of class ids
     """
 
     sccs = []
 
-    # index and lowlink initialized to None, onStack initialized to False
-    node_info = dict()  # key: class_identifier, value: [index, lowlink, onStack]
-    class_identifiers = class_hierarchy_graph.keys()
-    for class_identifier in class_identifiers:
-        node_info[class_identifier] = [None, None, False]
+    num_classes = compact_class_hierarchy_graph.num_classes
+    parent_offsets = compact_class_hierarchy_graph.parent_offsets
+    parent_ids = compact_class_hierarchy_graph.parent_ids
+
+    # index initialized to -1
+    indices = array(CLASS_ID_TYPECODE, [-1]) * num_classes
+    lowlinks = array(CLASS_ID_TYPECODE, [0]) * num_classes
+    on_stack = bytearray(num_classes)
 
     def strongconnect(v, index):
-        node_info[v][0] = index
-        node_info[v][1] = index
+        # iterative with an explicit stack of class ids and positions of their next edge in parent_ids in place of recursion
+        # so that deep inheritance chains do not exceed the recursion limit
+        indices[v] = index
+        lowlinks[v] = index
         index += 1
         stack.append(v)
-        node_info[v][2] = True
-
-        neighbors = class_hierarchy_graph[v][0]
-        for w in neighbors:
-            # neighbor may not be in the graph as it may refer to a parent class that was not parsed
-            # i. e. does not account for parent classes in external modules
-            # only considers parent classes in code base
-            if w not in class_hierarchy_graph:
+        on_stack[v] = True
+
+        call_stack = [v]
+        edge_positions = [parent_offsets[v]]
+        while call_stack:
+            u = call_stack[-1]
+            edge_position = edge_positions[-1]
+            edge_end = parent_offsets[u + 1]
+
+            recurse = False
+            while edge_position < edge_end:
+                w = parent_ids[edge_position]
+                edge_position += 1
+
+                # neighbor may not be in the graph as it may refer to a parent class that was not parsed
+                # i. e. does not account for parent classes in external modules
+                # only considers parent classes in code base
+                if w >= num_classes:
+                    continue
+
+                if indices[w] == -1:
+                    edge_positions[-1] = edge_position
+
+                    indices[w] = index
+                    lowlinks[w] = index
+                    index += 1
+                    stack.append(w)
+                    on_stack[w] = True
+
+                    call_stack.append(w)
+                    edge_positions.append(parent_offsets[w])
+                    recurse = True
+                    break
+                elif on_stack[w]:
+                    # neighbor w is in stack and in current scc
+                    lowlinks[u] = min(lowlinks[u], indices[w])
+
+            # continues with neighbor w before the remaining neighbors of u
+            if recurse:
                 continue
 
-            if node_info[w][0] == None:
-                index = strongconnect(w, index)
-                node_info[v][1] = min(node_info[v][1], node_info[w][1])
-            elif node_info[w][2]:
-                # neighbor w is in stack and in current scc
-                node_info[v][1] = min(node_info[v][1], node_info[w][0])
-
-        if node_info[v][1] == node_info[v][0]:
-            scc = []
-            w = None
-            while w != v:
-                w = stack.pop()
-                node_info[w][2] = False
-                scc.append(w)
-            sccs.append(scc)
+            call_stack.pop()
+            edge_positions.pop()
+
+            if lowlinks[u] == indices[u]:
+                scc = []
+                w = None
+                while w != u:
+                    w = stack.pop()
+                    on_stack[w] = False
+                    scc.append(w)
+                sccs.append(scc)
+
+            if call_stack:
+                caller = call_stack[-1]
+                lowlinks[caller] = min(lowlinks[caller], lowlinks[u])
 
         return index
 
     index = 0
     stack = []
-    for class_identifier in class_identifiers:
-        if node_info[class_identifier][0] == None:
-            index = strongconnect(class_identifier, index)
+    for class_id in range(num_classes):
+        if indices[class_id] == -1:
+            index = strongconnect(class_id, index)
 
     return sccs
 
-def logical_inconsistency_check(class_hierarchy_graph, classes_in_cycle):
+def logical_inconsistency_check(compact_class_hierarchy_graph, classes_in_cycle, source_logical_inconsistent_report_sink, result_writer):
     """
     Attempts to compute the c3 linearization of classes to check for logical inconsistency \\
+    Information on each source logical inconsistent class is written to source_logical_inconsistent_report_sink if it is not None \\
+    and on each source or inherited logical inconsistent class to result_writer if it is not None \\
     Returns the number of classes that are source logical inconsistent, inherited logical inconsistent, logical inconsistent, \\
-    and source logical inconsistent information
+    and the c3 linearizations with their linearization nodes
     """
 
     print()
     print("get c3 linearizations")
 
-    c3_linearizations, source_logical_inconsistent_info = get_c3_linearizations(class_hierarchy_graph, classes_in_cycle)
+    c3_linearizations, linearization_nodes = get_c3_linearizations(compact_class_hierarchy_graph, classes_in_cycle, source_logical_inconsistent_report_sink, result_writer)
 
     num_classes_source_logical_inconsistent = 0
     num_classes_inherited_logical_inconsistent = 0
     num_classes_logical_inconsistent = 0
-    for linearization in c3_linearizations.values():
+    for linearization in c3_linearizations:
         if linearization == LinearizationStatus.source_logical_inconsistent:
             num_classes_source_logical_inconsistent += 1
         elif linearization == LinearizationStatus.inherited_logical_inconsistent:
@@ -160,85 +235,112 @@ def logical_inconsistency_check(class_hierarchy_graph, classes_in_cycle):
     num_classes_logical_inconsistent = num_classes_source_logical_inconsistent + num_classes_inherited_logical_inconsistent
 
     return num_classes_source_logical_inconsistent, num_classes_inherited_logical_inconsistent, num_classes_logical_inconsistent, \
-        source_logical_inconsistent_info
+        c3_linearizations, linearization_nodes
 
-def get_c3_linearizations(class_hierarchy_graph, classes_in_cycle):
+def get_c3_linearizations(compact_class_hierarchy_graph, classes_in_cycle, source_logical_inconsistent_report_sink, result_writer):
     """
-    Returns the c3 linearizations and the source logical inconsistent information
+    Returns the c3 linearizations, indexed by class id, and the linearization nodes \\
+    Each c3 linearization is the first node of the linearization in the linearization nodes \\
+    or the LinearizationStatus if it could not be computed
     """
 
-    c3_linearizations = dict()
-    source_logical_inconsistent_info = ""
+    c3_linearizations = [None] * compact_class_hierarchy_graph.num_classes
+    linearization_nodes = LinearizationNodes()
 
-    for class_identifier in class_hierarchy_graph.keys():
-        if class_identifier in c3_linearizations:
-            pass
+    # one DFS over the whole graph with a shared visited set so that each class is ordered, and linearized, once
+    # the order is the same as the concatenation of the orders from each class, without classes already in the order
+    visited = bytearray(compact_class_hierarchy_graph.num_classes)
+    linearization_order = array(CLASS_ID_TYPECODE)
+    for class_id in range(compact_class_hierarchy_graph.num_classes):
+        get_linearization_order(compact_class_hierarchy_graph, class_id, visited, linearization_order)
 
-        visited = set()
-        linearization_order = []
+    if LOG_LINEARIZATION_ORDER:
+        print(f"linearization order: {compact_class_hierarchy_graph.get_class_identifiers(linearization_order)}")
 
-        get_linearization_order(class_hierarchy_graph, class_identifier, visited, linearization_order)
+    get_c3_linearizations_helper(compact_class_hierarchy_graph, classes_in_cycle, linearization_order, c3_linearizations, linearization_nodes, source_logical_inconsistent_report_sink, result_writer)
 
-        if LOG_LINEARIZATION_ORDER:
-            print(f"linearization order from class {class_identifier}: {linearization_order}")
+    return c3_linearizations, linearization_nodes
 
-        source_logical_inconsistent_info += get_c3_linearizations_helper(class_hierarchy_graph, classes_in_cycle, linearization_order, c3_linearizations)
-
-    return c3_linearizations, source_logical_inconsistent_info
-
-def get_linearization_order(class_hierarchy_graph, class_identifier, visited, linearization_order):
+def get_linearization_order(compact_class_hierarchy_graph, class_id, visited, linearization_order):
     """
-    Uses recursive DFS to compute the order to linearize classes in inheritance hierarchy from class_identifier \\
+    Uses iterative DFS to compute the order to linearize classes in inheritance hierarchy from class_id \\
     Order is such that for class u, v in layer
         - If class v inherits from class u, class u before class v.
         - If no inheritance relationship between class u, v, class u before class v. \n
     For cycles, the ordering is undefined.
     """
 
-    if class_identifier in visited or \
-        class_identifier not in class_hierarchy_graph:    # class is not in local directory
+    if not compact_class_hierarchy_graph.is_in_graph(class_id) or \
+        visited[class_id]:    # class is not in local directory
         return
 
-    visited.add(class_identifier)
-
-    inherited_class_identifiers = class_hierarchy_graph[class_identifier][0]
-    for inherited_class_identifier in inherited_class_identifiers:
-        get_linearization_order(class_hierarchy_graph, inherited_class_identifier, visited, linearization_order)
+    num_classes = compact_class_hierarchy_graph.num_classes
+    parent_offsets = compact_class_hierarchy_graph.parent_offsets
+    parent_ids = compact_class_hierarchy_graph.parent_ids
+
+    visited[class_id] = True
+
+    # stacks of class ids and positions of their next edge in parent_ids in place of recursion
+    stack = [class_id]
+    edge_positions = [parent_offsets[class_id]]
+    while stack:
+        current_class_id = stack[-1]
+        edge_position = edge_positions[-1]
+        edge_end = parent_offsets[current_class_id + 1]
+
+        while edge_position < edge_end:
+            inherited_class_id = parent_ids[edge_position]
+            edge_position += 1
+            if inherited_class_id >= num_classes or \
+                visited[inherited_class_id]:
+                continue
 
-    linearization_order.append(class_identifier)
+            edge_positions[-1] = edge_position
+            visited[inherited_class_id] = True
+            stack.append(inherited_class_id)
+            edge_positions.append(parent_offsets[inherited_class_id])
+            break
+        else:   # all inherited classes are in linearization_order
+            stack.pop()
+            edge_positions.pop()
+            linearization_order.append(current_class_id)
 
-def get_c3_linearizations_helper(class_hierarchy_graph, classes_in_cycle, linearization_order, c3_linearizations):
+def get_c3_linearizations_helper(compact_class_hierarchy_graph, classes_in_cycle, linearization_order, c3_linearizations, linearization_nodes, source_logical_inconsistent_report_sink, result_writer):
     """
     Computes the c3 linearization of classes in the order given by linearization_order \\
-    Returns source logical inconsistent information found from the linearization computation
+    Writes source logical inconsistent information found from the linearization computation to source_logical_inconsistent_report_sink if it is not None \\
+    and source and inherited logical inconsistent classes to result_writer if it is not None
     """
 
-    source_logical_inconsistent_info = ""
-    for class_identifier in linearization_order:
-        if not class_identifier in class_hierarchy_graph:
+    for class_id in linearization_order:
+        if not compact_class_hierarchy_graph.is_in_graph(class_id):
             continue
-        if class_identifier in c3_linearizations:
+        if c3_linearizations[class_id] != None:
             continue
-        if class_identifier in classes_in_cycle:
+
+        class_identifier = compact_class_hierarchy_graph.get_class_identifier(class_id)
+        if class_id in classes_in_cycle:
             if LOG_CYCLE_INCONSISTENT:
                 print(f"Linearization of class {class_identifier} could not be computed since class {class_identifier} is in cycle inheritance.")
 
-            c3_linearizations[class_identifier] = LinearizationStatus.cycle_inconsistent
+            c3_linearizations[class_id] = LinearizationStatus.cycle_inconsistent
             continue
 
-        inherited_class_identifiers = class_hierarchy_graph[class_identifier][0].copy()
+        # merge lists are the first nodes of the linearizations of parent classes, which are shared and not modified
+        inherited_class_ids = compact_class_hierarchy_graph.get_inherited_class_ids(class_id)
 
         # m = number of sublists, number of classes inherited + 1
         # n = length of sublist, length of linearization of parent class, number of classes inherited (for last sublist)
-        # to get linearization of a class is O(mn * mn)
+        # to get linearization of a class is O(mn * m)
 
         merge_lists = []
         can_compute = True
-        for inherited_class_identifier in inherited_class_identifiers:
-            if not inherited_class_identifier in class_hierarchy_graph:
+        for inherited_class_id in inherited_class_ids:
+            if not compact_class_hierarchy_graph.is_in_graph(inherited_class_id):
                 continue
 
-            inherited_class_linearization = c3_linearizations[inherited_class_identifier]
+            inherited_class_identifier = compact_class_hierarchy_graph.get_class_identifier(inherited_class_id)
+            inherited_class_linearization = c3_linearizations[inherited_class_id]
 
             # could not compute linearization of parent class
             if inherited_class_linearization == LinearizationStatus.error:
@@ -248,7 +350,7 @@ def get_c3_linearizations_helper(class_hierarchy_graph, classes_in_cycle, linear
                     print(output_str)
 
                 can_compute = False
-                c3_linearizations[class_identifier] = LinearizationStatus.error
+                c3_linearizations[class_id] = LinearizationStatus.error
                 break
             elif inherited_class_linearization == LinearizationStatus.cycle_inconsistent:
                 if LOG_INHERITED_LOGICAL_INCONSISTENT:
@@ -256,8 +358,11 @@ def get_c3_linearizations_helper(class_hierarchy_graph, classes_in_cycle, linear
                     output_str += f" Class {class_identifier} is inherited logical inconsistent."
                     print(output_str)
 
+                if result_writer != None:
+                    result_writer.write_inherited_logical_inconsistent(class_id, inherited_class_id, inherited_class_linearization)
+
                 can_compute = False
-                c3_linearizations[class_identifier] = LinearizationStatus.inherited_logical_inconsistent
+                c3_linearizations[class_id] = LinearizationStatus.inherited_logical_inconsistent
                 break
             elif inherited_class_linearization == LinearizationStatus.source_logical_inconsistent or \
                 inherited_class_linearization == LinearizationStatus.inherited_logical_inconsistent:
@@ -273,47 +378,53 @@ def get_c3_linearizations_helper(class_hierarchy_graph, classes_in_cycle, linear
                     output_str += f" Class {class_identifier} is inherited logical inconsistent."
                     print(output_str)
 
+                if result_writer != None:
+                    result_writer.write_inherited_logical_inconsistent(class_id, inherited_class_id, inherited_class_linearization)
+
                 can_compute = False
-                c3_linearizations[class_identifier] = LinearizationStatus.inherited_logical_inconsistent
+                c3_linearizations[class_id] = LinearizationStatus.inherited_logical_inconsistent
                 break
             else:   # could compute linearization of parent class
-                merge_lists.append(c3_linearizations[inherited_class_identifier].copy())
+                merge_lists.append(inherited_class_linearization)
 
         if not can_compute:
             continue
 
-        if len(inherited_class_identifiers) > 0:
-            merge_lists.append(inherited_class_identifiers)
+        if len(inherited_class_ids) > 0:
+            merge_lists.append(inherited_class_ids)
 
-        res, status, precedence_order_mismatch_info = get_c3_linearization(class_identifier, merge_lists, inherited_class_identifiers)
+        res, status, precedence_order_mismatch_info = get_c3_linearization(compact_class_hierarchy_graph, linearization_nodes, class_id, merge_lists, inherited_class_ids)
         if status == LinearizationStatus.error:
             if LOG_ERROR_LINEARIZATION:
                 print(f"Linearization could not be computed for class {class_identifier} due to error in linearization computation.")
-            c3_linearizations[class_identifier] = status
+            c3_linearizations[class_id] = status
         elif status == LinearizationStatus.source_logical_inconsistent:
             x, y, inherited_class_with_differing_precedence = precedence_order_mismatch_info
-            source_logical_inconsistent_info += source_logical_inconsistent_info_from_class(class_identifier, x, y, inherited_class_with_differing_precedence, class_hierarchy_graph, c3_linearizations)
+            if source_logical_inconsistent_report_sink != None:
+                source_logical_inconsistent_report_sink.write(source_logical_inconsistent_info_from_class(class_id, x, y, inherited_class_with_differing_precedence, compact_class_hierarchy_graph, c3_linearizations, linearization_nodes))
+            if result_writer != None:
+                result_writer.write_source_logical_inconsistent(class_id, x, y, inherited_class_with_differing_precedence)
 
             if LOG_SOURCE_LOGICAL_INCONSISTENT:
                 output_str = f"Linearization could not be computed for class {class_identifier} due to logical inconsistency in linearization computation."
                 output_str += f" Class {class_identifier} is source logical inconsistent."
                 print(output_str)
 
-            c3_linearizations[class_identifier] = status
+            c3_linearizations[class_id] = status
         else:
             if LOG_LINEARIZATION:
-                print(f"{class_identifier} c3 linearization: {res}")
+                res_class_ids = linearization_nodes.get_class_ids(res)
+                print(f"{class_identifier} c3 linearization: {compact_class_hierarchy_graph.get_class_identifiers(res_class_ids)}")
                 if LOG_LINEARIZATION_VERBOSE:
-                    for name in res:
-                        if name in class_hierarchy_graph:
-                            print(f"class {name} from {class_hierarchy_graph[name][1]}")
+                    for linearization_class_id in res_class_ids:
+                        name = compact_class_hierarchy_graph.get_class_identifier(linearization_class_id)
+                        if compact_class_hierarchy_graph.is_in_graph(linearization_class_id):
+                            print(f"class {name} from {compact_class_hierarchy_graph.get_source_path(linearization_class_id)}")
                         else:
                             print(f"class {name} from external")
-            c3_linearizations[class_identifier] = res
-
-    return source_logical_inconsistent_info
+            c3_linearizations[class_id] = res
 
-def get_c3_linearization(class_identifier, merge_lists, inherited_class_identifiers):
+def get_c3_linearization(compact_class_hierarchy_graph, linearization_nodes, class_id, merge_lists, inherited_class_ids):
     """
     computes the c3 linearization from merge_lists with following algorithm: \\
     res = [] \\
@@ -330,60 +441,101 @@ def get_c3_linearization(class_identifier, merge_lists, inherited_class_identifi
             source logical inconsistency, linearization could not be computed \\
             gets source logical inconsistent information
 
-    returns linearization, stored in res, or None if it could not be computed, linearization status, source logical inconsistent information
+    merge_lists has the first nodes of the linearizations of the parent classes in linearization_nodes, \\
+    followed by inherited_class_ids if it is not empty \\
+    Lists in merge_lists are not modified: an element is removed from a list by advancing the head of the list to the next node \\
+    and the number of occurrences of each element in the tails of the lists is updated as heads advance, \\
+    so each step takes O(number of lists) \\
+    Once one linearization of a parent class is left, the rest of it is the end of res, and its nodes are shared with res
+
+    returns the first node of the linearization, stored in res, or None if it could not be computed, linearization status, source logical inconsistent information
     """
 
-    res = [class_identifier]
+    # with one inherited class, merge_lists is the linearization of the inherited class and a list of the inherited class,
+    # which is the head of the linearization, so the merge is that linearization
+    if len(inherited_class_ids) == 1 and compact_class_hierarchy_graph.is_in_graph(inherited_class_ids[0]):
+        return (linearization_nodes.add_node(class_id, merge_lists[0]), LinearizationStatus.success, None)
 
-    num_lists = len(merge_lists)
-    empty = num_lists == 0
+    node_class_ids = linearization_nodes.class_ids
+    next_nodes = linearization_nodes.next_nodes
 
-    while not empty:
-        in_head = []
-        in_tail = dict()     # key: tail element, value: list of corresponding sublist indices and index in sublist
+    # inherited_class_ids is added as temporary nodes, removed after the merge
+    num_nodes = linearization_nodes.get_num_nodes()
 
-        for lst_index, lst in enumerate(merge_lists):
-            if len(lst) == 0:
-                if LOG_ERROR_LINEARIZATION:
-                    print("Error: empty list in merge_lists")
-                return (None, LinearizationStatus.error, None)
-            for index, name in enumerate(lst):
-                if index == 0:
-                    in_head.append(name)
-                if index > 0:
+    heads = list(merge_lists)   # head node of each list in merge_lists
+    if len(inherited_class_ids) > 0:
+        heads[-1] = linearization_nodes.add_nodes(inherited_class_ids)
+
+    tail_counts = dict()    # key: tail element, value: number of occurrences in tails of lists in merge_lists
+    for head in heads:
+        if head == NO_NODE:
+            if LOG_ERROR_LINEARIZATION:
+                print("Error: empty list in merge_lists")
+            linearization_nodes.truncate(num_nodes)
+            return (None, LinearizationStatus.error, None)
+
+        node = next_nodes[head]
+        while node != NO_NODE:
+            name = node_class_ids[node]
+            tail_counts[name] = tail_counts.get(name, 0) + 1
+            node = next_nodes[node]
+
+    res = array(CLASS_ID_TYPECODE, [class_id])
+    shared_tail = NO_NODE
+
+    num_lists = len(heads)
+    while num_lists > 0:
+        if num_lists == 1:
+            remaining_head = next(head for head in heads if head != NO_NODE)
+            if remaining_head < num_nodes:  # rest of the linearization of a parent class
+                shared_tail = remaining_head
+                break
+
+        selected_class = None
+        for head in heads:
+            if head != NO_NODE and tail_counts.get(node_class_ids[head], 0) == 0:
+                selected_class = node_class_ids[head]
+                break
+
+        if selected_class == None:
+            if LOG_SOURCE_LOGICAL_INCONSISTENT:
+                print(f"Error: no suitable next class for linearization of class {compact_class_hierarchy_graph.get_class_identifier(class_id)}")
+
+            # remaining parts of the lists, without the removed elements and the empty lists
+            remaining_merge_lists = [linearization_nodes.get_class_ids(head) for head in heads if head != NO_NODE]
+            in_tail = dict()     # key: tail element, value: list of corresponding sublist indices and index in sublist
+            for lst_index, lst in enumerate(remaining_merge_lists):
+                for index in range(1, len(lst)):
+                    name = lst[index]
                     if name in in_tail:
                         in_tail[name].append((lst_index, index))
                     else:
                         in_tail[name] = [(lst_index, index)]
 
-        selected_class = None
-        for chosen_class in in_head:
-            if not chosen_class in in_tail:
-                selected_class = chosen_class
-                break
+            # inherited_class_ids is the last list in merge_lists, without the classes removed so far
+            remaining_inherited_class_ids = linearization_nodes.get_class_ids(heads[-1])
 
-        if not selected_class:
-            if LOG_SOURCE_LOGICAL_INCONSISTENT:
-                print(f"Error: no suitable next class for linearization of class {class_identifier}")
+            linearization_nodes.truncate(num_nodes)
 
-            x, y, inherited_class_with_differing_precedence = get_precedence_order_mismatch(merge_lists, num_lists, in_tail, inherited_class_identifiers)
+            x, y, inherited_class_with_differing_precedence = get_precedence_order_mismatch(remaining_merge_lists, num_lists, in_tail, remaining_inherited_class_ids)
             return (None, LinearizationStatus.source_logical_inconsistent, (x, y, inherited_class_with_differing_precedence))
 
         # removes selected_class from lists in merge_lists
-        for lst in merge_lists:
-            try:
-                lst.remove(selected_class)
-            except: # selected_class not in lst
-                continue
-
-        merge_lists = [lst for lst in merge_lists if len(lst) > 0]
+        # selected_class is not in the tail of any list so it can only be at the head of a list
+        for lst_index, head in enumerate(heads):
+            if head != NO_NODE and node_class_ids[head] == selected_class:
+                head = next_nodes[head]
+                heads[lst_index] = head
+                if head != NO_NODE:
+                    tail_counts[node_class_ids[head]] -= 1
+                else:
+                    num_lists -= 1
 
         res.append(selected_class)
 
-        num_lists = len(merge_lists)
-        empty = num_lists == 0
+    linearization_nodes.truncate(num_nodes)
 
-    return (res, LinearizationStatus.success, None)
+    return (linearization_nodes.add_nodes(res, shared_tail), LinearizationStatus.success, None)
 
 def get_precedence_order_mismatch(merge_lists, num_lists, in_tail, inherited_class_identifiers):
     """
@@ -407,59 +559,355 @@ def get_precedence_order_mismatch(merge_lists, num_lists, in_tail, inherited_cla
                 y = before_x_element
                 inherited_class_with_differing_precedence = inherited_class_identifiers[lst_index]
                 break
-        if y:
+        if y != None:
             break
 
     return x, y, inherited_class_with_differing_precedence
 
-def source_logical_inconsistent_info_from_class(class_identifier, x, y, inherited_class_with_differing_precedence, class_hierarchy_graph, c3_linearizations):
+def source_logical_inconsistent_info_from_class(class_id, x, y, inherited_class_with_differing_precedence, compact_class_hierarchy_graph, c3_linearizations, linearization_nodes):
     """
     Creates dump string source logical inconsistent information \\
-    x and y are the identifiers of the classes in local precedence order of class with identifier class_identifier.
+    x and y are the ids of the classes in local precedence order of class with id class_id.
     """
 
+    class_identifier = compact_class_hierarchy_graph.get_class_identifier(class_id)
+    x_identifier = compact_class_hierarchy_graph.get_class_identifier(x)
+    y_identifier = compact_class_hierarchy_graph.get_class_identifier(y)
+    inherited_class_identifier = compact_class_hierarchy_graph.get_class_identifier(inherited_class_with_differing_precedence)
+
     source_logical_inconsistent_info = f"Linearization of class {class_identifier} cannot be computed.\n"
-    source_logical_inconsistent_info += f"class {x} before class {y} in local precedence order of class {class_identifier},\n"
-    source_logical_inconsistent_info += f"class {y} before class {x} in precedence order of class {inherited_class_with_differing_precedence}.\n"
-    source_logical_inconsistent_info += f"class {class_identifier} from {class_hierarchy_graph[class_identifier][1]}\n"
+    source_logical_inconsistent_info += f"class {x_identifier} before class {y_identifier} in local precedence order of class {class_identifier},\n"
+    source_logical_inconsistent_info += f"class {y_identifier} before class {x_identifier} in precedence order of class {inherited_class_identifier}.\n"
+    source_logical_inconsistent_info += f"class {class_identifier} from {compact_class_hierarchy_graph.get_source_path(class_id)}\n"
 
-    x_location = class_hierarchy_graph[x][1] if x in class_hierarchy_graph else "external"
-    y_location = class_hierarchy_graph[y][1] if y in class_hierarchy_graph else "external"
-    source_logical_inconsistent_info += f"class {x} from {x_location}, linearization: {c3_linearizations[x]}\n"
-    source_logical_inconsistent_info += f"class {y} from {y_location}, linearization: {c3_linearizations[y]}\n\n"
+    x_location = compact_class_hierarchy_graph.get_source_path(x) if compact_class_hierarchy_graph.is_in_graph(x) else "external"
+    y_location = compact_class_hierarchy_graph.get_source_path(y) if compact_class_hierarchy_graph.is_in_graph(y) else "external"
+    source_logical_inconsistent_info += f"class {x_identifier} from {x_location}, linearization: {get_linearization_str(compact_class_hierarchy_graph, linearization_nodes, c3_linearizations[x])}\n"
+    source_logical_inconsistent_info += f"class {y_identifier} from {y_location}, linearization: {get_linearization_str(compact_class_hierarchy_graph, linearization_nodes, c3_linearizations[y])}\n\n"
 
     return source_logical_inconsistent_info
 
-def get_info_dump_path(info_folder_name):
+def get_linearization_str(compact_class_hierarchy_graph, linearization_nodes, linearization):
+    """
+    Returns the string of the linearization, as a list of class identifiers, or of the LinearizationStatus \\
+    The list of the linearization is only built here, for the output
+    """
+
+    if isinstance(linearization, LinearizationStatus):
+        return str(linearization)
+    return str(compact_class_hierarchy_graph.get_class_identifiers(linearization_nodes.get_class_ids(linearization)))
+
+def get_info_dump_path(info_folder_name, extension=".txt"):
     graph_pickle_dump_path = get_path(GRAPH_PICKLE_DUMP_PATH_ARGUMENT_INDEX, usage_info)
     name = get_name_directory_or_file(graph_pickle_dump_path)
     name = name[:name.find(CLASS_HIERARCHY_GRAPH_DUMP_SUFFIX)]
-    cycle_inconsistent_info_dump_path = os.path.join(info_folder_name, name + ".txt")
+    cycle_inconsistent_info_dump_path = os.path.join(info_folder_name, name + extension)
     return cycle_inconsistent_info_dump_path
 
-def dump_info(output, info_folder_name, info_dump_path, info_identifier):
-    try:
-        if not os.path.exists(info_folder_name):
-            os.mkdir(info_folder_name)
+def get_report_sink(dump, info_folder_name, info_identifier):
+    """
+    Returns the ReportSink that streams info_identifier information to the info dump path in info_folder_name \\
+    or None if the information is not dumped
+    """
+
+    if not dump:
+        return None
+
+    info_dump_path = get_info_dump_path(info_folder_name)
+    return ReportSink(info_folder_name, info_dump_path, info_identifier, has_option(FLUSH_REPORTS_OPTION))
+
+def get_output_format_option():
+    """
+    Gets the value of the output format option, e. g. --output-format sarif \\
+    Returns OUTPUT_FORMAT_TEXT if the option is not provided, the value if it is an output format \\
+    Otherwise, returns None
+    """
+
+    output_format = get_option_value(OUTPUT_FORMAT_OPTION, OUTPUT_FORMAT_TEXT)
+    if output_format in OUTPUT_FORMATS:
+        return output_format
+
+    print(f"Error: {OUTPUT_FORMAT_OPTION} expects one of {', '.join(OUTPUT_FORMATS)}, got {output_format}")
+    usage_info()
+    return None
+
+def get_num_resolved_bases(compact_class_hierarchy_graph):
+    return compact_class_hierarchy_graph.get_num_edges()
+
+def get_class_linearizations(compact_class_hierarchy_graph):
+    """
+    Runs the cycle and logical inconsistency checks without output \\
+    Returns the c3 linearizations, indexed by class id, and the linearization nodes, see get_c3_linearizations
+    """
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        classes_in_cycle, _ = cycle_inconsistency_check(compact_class_hierarchy_graph, None, None)
+        return get_c3_linearizations(compact_class_hierarchy_graph, classes_in_cycle, None, None)
+
+def get_class_statuses(compact_class_hierarchy_graph, c3_linearizations=None):
+    """
+    Returns dict with key: class identifier, value: LinearizationStatus of the class, \\
+    LinearizationStatus.success if its c3 linearization could be computed \\
+    The c3 linearizations are computed with get_class_linearizations if they are not provided
+    """
+
+    if c3_linearizations == None:
+        c3_linearizations, _ = get_class_linearizations(compact_class_hierarchy_graph)
+
+    class_statuses = dict()
+    for class_id, linearization in enumerate(c3_linearizations):
+        if not isinstance(linearization, LinearizationStatus):
+            linearization = LinearizationStatus.success
+        class_statuses[compact_class_hierarchy_graph.get_class_identifier(class_id)] = linearization
+
+    return class_statuses
+
+def get_changed_class_identifiers(previous_class_hierarchy_graph, class_hierarchy_graph):
+    """
+    Returns the identifiers of the classes that were added to or deleted from previous_class_hierarchy_graph \\
+    or whose inherited classes or source path changed
+    """
+
+    changed_class_identifiers = set()
+    for class_identifier, entry in class_hierarchy_graph.items():
+        if previous_class_hierarchy_graph.get(class_identifier) != entry:
+            changed_class_identifiers.add(class_identifier)
+
+    for class_identifier in previous_class_hierarchy_graph:
+        if class_identifier not in class_hierarchy_graph:
+            changed_class_identifiers.add(class_identifier)
+
+    return changed_class_identifiers
+
+def get_affected_class_identifiers(compact_class_hierarchy_graph, changed_class_identifiers):
+    """
+    Returns the identifiers of the changed classes in compact_class_hierarchy_graph and of their descendants, see get_affected_class_ids \\
+    The cycle inconsistency and c3 linearization of a class only depend on its ancestors, so they do not change for other classes
+    """
+
+    return set(compact_class_hierarchy_graph.get_class_identifiers(get_affected_class_ids(compact_class_hierarchy_graph, changed_class_identifiers)))
 
-        if os.path.exists(info_dump_path):
-            os.remove(info_dump_path)
+def get_affected_class_statuses(compact_class_hierarchy_graph, affected_class_identifiers):
+    """
+    Returns dict with key: class identifier, value: LinearizationStatus of each class in affected_class_identifiers, \\
+    classes in compact_class_hierarchy_graph, see get_affected_class_id_statuses
+    """
+
+    affected_class_ids = set()
+    for class_identifier in affected_class_identifiers:
+        affected_class_ids.add(compact_class_hierarchy_graph.find_class_id(class_identifier))
+
+    return get_affected_class_id_statuses(compact_class_hierarchy_graph, affected_class_ids)
+
+def get_affected_class_ids(compact_class_hierarchy_graph, changed_class_identifiers):
+    """
+    Returns the set of ids of the changed classes in compact_class_hierarchy_graph and of their descendants, \\
+    found through the reverse-edge index, see CompactClassHierarchyGraph.get_descendant_class_ids \\
+    A deleted class that is still inherited is an external class of the graph, so its descendants are included
+    """
+
+    changed_class_ids = []
+    for class_identifier in changed_class_identifiers:
+        class_id = compact_class_hierarchy_graph.find_class_id(class_identifier)
+        if class_id != None:
+            changed_class_ids.append(class_id)
+
+    affected_class_ids = compact_class_hierarchy_graph.get_descendant_class_ids(changed_class_ids)
+    for class_id in changed_class_ids:
+        if compact_class_hierarchy_graph.is_in_graph(class_id):
+            affected_class_ids.add(class_id)
+
+    return affected_class_ids
+
+def get_affected_class_id_statuses(compact_class_hierarchy_graph, affected_class_ids):
+    """
+    Returns dict with key: class identifier, value: LinearizationStatus of each class with one of affected_class_ids, see get_class_statuses \\
+    Only the affected classes and their ancestors are checked: \\
+    the cycles and c3 linearizations of the classes of a graph that is closed under inheritance are the same as in the whole graph
+    """
+
+    checked_class_ids = compact_class_hierarchy_graph.get_ancestor_class_ids(affected_class_ids) | affected_class_ids
+
+    # the subgraph keeps the order of the class ids so that classes are checked in the same order as in the whole graph
+    affected_class_hierarchy_graph = dict()
+    for class_id in sorted(checked_class_ids):
+        if compact_class_hierarchy_graph.is_in_graph(class_id):
+            affected_class_hierarchy_graph[compact_class_hierarchy_graph.get_class_identifier(class_id)] = \
+                (compact_class_hierarchy_graph.get_class_identifiers(compact_class_hierarchy_graph.get_inherited_class_ids(class_id)),
+                 compact_class_hierarchy_graph.get_source_path(class_id))
+
+    class_statuses = get_class_statuses(CompactClassHierarchyGraph(affected_class_hierarchy_graph))
+
+    affected_class_statuses = dict()
+    for class_id in affected_class_ids:
+        class_identifier = compact_class_hierarchy_graph.get_class_identifier(class_id)
+        affected_class_statuses[class_identifier] = class_statuses[class_identifier]
+
+    return affected_class_statuses
+
+def get_status_changes(previous_class_statuses, class_statuses, class_identifiers):
+    """
+    Returns the class identifier, previous LinearizationStatus, and LinearizationStatus of the classes in class_identifiers \\
+    whose status changed, sorted by class identifier \\
+    The status of a class that is not in the respective class statuses is None
+    """
+
+    status_changes = []
+    for class_identifier in sorted(class_identifiers):
+        previous_status = previous_class_statuses.get(class_identifier)
+        status = class_statuses.get(class_identifier)
+        if previous_status != status:
+            status_changes.append((class_identifier, previous_status, status))
+
+    return status_changes
+
+def get_status_str(status):
+    if status == None:
+        return "deleted"
+    if status == LinearizationStatus.success:
+        return "consistent"
+    return status.name.replace("_", " ")
 
-        with open(info_dump_path, "w") as file:
-            file.write(output)
-        file.close()
+def get_status_change_type(previous_status, status):
+    """
+    Returns INTRODUCED_DELTA_TYPE if a class became inconsistent, RESOLVED_DELTA_TYPE if it became consistent or was deleted, \\
+    CHANGED_DELTA_TYPE if it is inconsistent in another way, or None if it stayed consistent
+    """
 
-        print(f"Dumped {info_identifier} information to {info_dump_path}")
-    except:
-        print(f"Could not dump {info_identifier} information")
+    is_consistent = status == None or status == LinearizationStatus.success
+    was_consistent = previous_status == None or previous_status == LinearizationStatus.success
+    if was_consistent and not is_consistent:
+        return INTRODUCED_DELTA_TYPE
+    elif not was_consistent and is_consistent:
+        return RESOLVED_DELTA_TYPE
+    elif not was_consistent and not is_consistent:
+        return CHANGED_DELTA_TYPE
+    return None
+
+def print_status_changes(status_changes):
+    """
+    Outputs the inconsistencies that were introduced (+) or resolved (-) by a change
+    """
 
-def get_num_resolved_bases(class_hierarchy_graph):
-    num_resolved_bases = 0
-    for class_identifier in class_hierarchy_graph:
-        num_resolved_bases += len(class_hierarchy_graph[class_identifier][0])
-    return num_resolved_bases
+    for class_identifier, previous_status, status in status_changes:
+        status_change_type = get_status_change_type(previous_status, status)
+        if status_change_type == INTRODUCED_DELTA_TYPE:
+            print(f"+ class {class_identifier} is {get_status_str(status)}")
+        elif status_change_type == RESOLVED_DELTA_TYPE:
+            print(f"- class {class_identifier} is {get_status_str(status)}, was {get_status_str(previous_status)}")
+        elif status_change_type == CHANGED_DELTA_TYPE:
+            print(f"~ class {class_identifier} is {get_status_str(status)}, was {get_status_str(previous_status)}")
 
-def check_inconsistency(class_hierarchy_graph):
+def load_previous_class_statuses(previous_results_path):
+    """
+    Loads the statuses of the classes from a class linearizations file of --save-linearizations, \\
+    whose statuses are read when they are looked up, or the statuses of the inconsistent classes from a JSON Lines results file \\
+    of --output-format jsonl, in which classes that are not in the results file were consistent \\
+    Returns the ClassLinearizations or dict with key: class identifier, value: LinearizationStatus of the class, \\
+    None if the file could not be loaded
+    """
+
+    if is_class_linearizations_file(previous_results_path):
+        return load_class_linearizations(previous_results_path)
+
+    previous_class_statuses = dict()
+    with open(previous_results_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip() == "":
+                continue
+            record = json.loads(line)
+            if record["type"] == CYCLE_INCONSISTENT_RECORD_TYPE:
+                for class_record in record["classes"]:
+                    previous_class_statuses[class_record["class"]] = LinearizationStatus.cycle_inconsistent
+            else:
+                previous_class_statuses[record["class"]] = LinearizationStatus[record["type"]]
+    f.close()
+
+    return previous_class_statuses
+
+def get_changed_classes_option():
+    """
+    Gets the changed class identifiers of --changed-classes, separated by commas, and of --changed-classes-file, one per line \\
+    Returns the set of changed class identifiers or None if neither option is provided
+    """
+
+    changed_classes = get_option_value(CHANGED_CLASSES_OPTION)
+    changed_classes_path = get_option_value(CHANGED_CLASSES_FILE_OPTION)
+    if changed_classes == None and changed_classes_path == None:
+        return None
+
+    changed_class_identifiers = set()
+    if changed_classes != None:
+        changed_class_identifiers.update(class_identifier.strip() for class_identifier in changed_classes.split(","))
+    if changed_classes_path != None:
+        with open(changed_classes_path, "r", encoding="utf-8") as f:
+            changed_class_identifiers.update(line.strip() for line in f)
+        f.close()
+    changed_class_identifiers.discard("")
+
+    return changed_class_identifiers
+
+def incremental_check_inconsistency(compact_class_hierarchy_graph, previous_class_statuses, changed_class_identifiers):
+    """
+    Checks only the changed classes and their descendants, found through the reverse-edge index of the class hierarchy graph \\
+    The statuses of the other classes cannot change, see get_affected_class_id_statuses \\
+    Outputs the inconsistencies that were introduced or resolved compared to previous_class_statuses \\
+    and writes them to a JSON Lines delta report in INCONSISTENCY_RESULTS_FOLDER_NAME \\
+    Returns the status changes, see get_status_changes
+    """
+
+    affected_class_ids = get_affected_class_ids(compact_class_hierarchy_graph, changed_class_identifiers)
+    print(f"number of changed classes: {len(changed_class_identifiers)}")
+    print(f"number of changed classes and descendants to check: {len(affected_class_ids)}")
+
+    affected_class_statuses = get_affected_class_id_statuses(compact_class_hierarchy_graph, affected_class_ids)
+
+    # classes that are not in previous_class_statuses were consistent or not in the class hierarchy graph
+    previous_affected_class_statuses = dict()
+    for class_identifier in affected_class_statuses:
+        previous_affected_class_statuses[class_identifier] = previous_class_statuses.get(class_identifier, LinearizationStatus.success)
+    for class_identifier in changed_class_identifiers:
+        class_id = compact_class_hierarchy_graph.find_class_id(class_identifier)
+        if class_id == None or not compact_class_hierarchy_graph.is_in_graph(class_id):
+            previous_affected_class_statuses[class_identifier] = previous_class_statuses.get(class_identifier)
+
+    status_changes = get_status_changes(previous_affected_class_statuses, affected_class_statuses, previous_affected_class_statuses)
+
+    print()
+    print("inconsistency delta")
+    print_status_changes(status_changes)
+
+    delta_dump_path = get_info_dump_path(INCONSISTENCY_RESULTS_FOLDER_NAME, INCONSISTENCY_DELTA_DUMP_SUFFIX + OUTPUT_FORMAT_EXTENSIONS[OUTPUT_FORMAT_JSONL])
+    delta_report_sink = ReportSink(INCONSISTENCY_RESULTS_FOLDER_NAME, delta_dump_path, "inconsistency delta", has_option(FLUSH_REPORTS_OPTION), write_empty=True)
+    class_line_numbers = ClassLineNumbers(compact_class_hierarchy_graph)
+
+    num_status_changes = dict()
+    for class_identifier, previous_status, status in status_changes:
+        status_change_type = get_status_change_type(previous_status, status)
+        if status_change_type == None:
+            continue
+        num_status_changes[status_change_type] = num_status_changes.get(status_change_type, 0) + 1
+
+        class_id = compact_class_hierarchy_graph.find_class_id(class_identifier)
+        is_in_graph = class_id != None and compact_class_hierarchy_graph.is_in_graph(class_id)
+        delta_report_sink.write(json.dumps({
+            "type": status_change_type,
+            "class": class_identifier,
+            "source_path": compact_class_hierarchy_graph.get_source_path(class_id) if is_in_graph else None,
+            "line": class_line_numbers.get_line_number(class_id) if is_in_graph else None,
+            "previous_status": previous_status.name if previous_status != None else None,
+            "status": status.name if status != None else None
+        }) + "\n")
+
+    print()
+    print(f"number of introduced inconsistencies: {num_status_changes.get(INTRODUCED_DELTA_TYPE, 0)}")
+    print(f"number of resolved inconsistencies: {num_status_changes.get(RESOLVED_DELTA_TYPE, 0)}")
+    print(f"number of changed inconsistencies: {num_status_changes.get(CHANGED_DELTA_TYPE, 0)}")
+    delta_report_sink.close()
+
+    return status_changes
+
+def check_inconsistency(compact_class_hierarchy_graph, output_format=OUTPUT_FORMAT_TEXT, run_profiler=None):
     """
     Static check for following type of inconsistency:
         - cycle inconsistency:
@@ -470,39 +918,60 @@ def check_inconsistency(class_hierarchy_graph):
             - Class k inherits from a class with cyclic or logical inconsistency
         - logical inconsistency: either source or inherited logical inconsistency
 
-    Outputs relevant information
+    Outputs relevant information, to text info dump files or as JSON Lines or SARIF depending on output_format \\
+    Returns the c3 linearizations and their linearization nodes \\
+    If run_profiler is provided, the cycle and logical inconsistency checks are recorded as its phases
     """
 
+    # information on inconsistencies is streamed to the info dump files as it is found
+    cycle_inconsistent_report_sink = None
+    source_logical_inconsistent_report_sink = None
+    result_writer = None
+    if output_format == OUTPUT_FORMAT_TEXT:
+        cycle_inconsistent_report_sink = get_report_sink(DUMP_CYCLE_INCONSISTENT, CYCLE_INCONSISTENT_INFO_FOLDER_NAME, "cycle inconsistent")
+        source_logical_inconsistent_report_sink = get_report_sink(DUMP_SOURCE_LOGICAL_INCONSISTENT, SOURCE_LOGICAL_INCONSISTENT_INFO_FOLDER_NAME, "source logical inconsistent")
+    else:
+        # the results file is written even if there are no inconsistencies so that it does not keep the results of a previous run
+        results_dump_path = get_info_dump_path(INCONSISTENCY_RESULTS_FOLDER_NAME, OUTPUT_FORMAT_EXTENSIONS[output_format])
+        results_report_sink = ReportSink(INCONSISTENCY_RESULTS_FOLDER_NAME, results_dump_path, f"{output_format} inconsistency", has_option(FLUSH_REPORTS_OPTION), write_empty=True)
+        result_writer = get_result_writer(output_format, compact_class_hierarchy_graph, results_report_sink)
+
     print()
     print("cycle inconsistency check")
-    classes_in_cycle, num_classes_cycle_inconsistent, cycles_info = cycle_inconsistency_check(class_hierarchy_graph)
+    with profile_phase(run_profiler, "cycle_check"):
+        classes_in_cycle, num_classes_cycle_inconsistent = cycle_inconsistency_check(compact_class_hierarchy_graph, cycle_inconsistent_report_sink, result_writer)
 
     print()
     print("logical inconsistency check")
-    num_classes_source_logical_inconsistent, num_classes_inherited_logical_inconsistent, \
-    num_classes_logical_inconsistent, source_logical_inconsistent_info = logical_inconsistency_check(class_hierarchy_graph, classes_in_cycle)
+    with profile_phase(run_profiler, "logical_check"):
+        num_classes_source_logical_inconsistent, num_classes_inherited_logical_inconsistent, \
+        num_classes_logical_inconsistent, c3_linearizations, linearization_nodes = \
+            logical_inconsistency_check(compact_class_hierarchy_graph, classes_in_cycle, source_logical_inconsistent_report_sink, result_writer)
 
     print()
     print(f"number of classes that are cycle inconsistent: {num_classes_cycle_inconsistent}")
 
-    if num_classes_cycle_inconsistent > 0 and DUMP_CYCLE_INCONSISTENT:
-        cycle_inconsistent_info_dump_path = get_info_dump_path(CYCLE_INCONSISTENT_INFO_FOLDER_NAME)
-        dump_info(cycles_info, CYCLE_INCONSISTENT_INFO_FOLDER_NAME, cycle_inconsistent_info_dump_path, "cycle inconsistent")
+    if cycle_inconsistent_report_sink != None:
+        cycle_inconsistent_report_sink.close()
 
     print(f"number of classes that are source logical inconsistent: {num_classes_source_logical_inconsistent}")
 
-    if num_classes_source_logical_inconsistent > 0 and DUMP_SOURCE_LOGICAL_INCONSISTENT:
-        source_logical_inconsistent_info_dump_path = get_info_dump_path(SOURCE_LOGICAL_INCONSISTENT_INFO_FOLDER_NAME)
-        dump_info(source_logical_inconsistent_info, SOURCE_LOGICAL_INCONSISTENT_INFO_FOLDER_NAME, source_logical_inconsistent_info_dump_path, "source logical inconsistent")
+    if source_logical_inconsistent_report_sink != None:
+        source_logical_inconsistent_report_sink.close()
 
     print(f"number of classes that are inherited logical inconsistent: {num_classes_inherited_logical_inconsistent}")
     print(f"number of classes that are logical inconsistent (either source or inherited logical inconsistent): {num_classes_logical_inconsistent}")
 
+    if result_writer != None:
+        result_writer.close()
+
     print()
 
-    num_resolved_bases = get_num_resolved_bases(class_hierarchy_graph)
+    num_resolved_bases = get_num_resolved_bases(compact_class_hierarchy_graph)
     print(f"number of resolved bases from ClassDef: {num_resolved_bases}")
-    print(f"number of classes in class hierarchy graph: {len(class_hierarchy_graph.keys())}")
+    print(f"number of classes in class hierarchy graph: {compact_class_hierarchy_graph.num_classes}")
+
+    return c3_linearizations, linearization_nodes
 
 def usage_info():
     """
@@ -510,13 +979,26 @@ def usage_info():
     """
 
     print("Usage:")
-    print("python check_inheritance_consistency.py [path to class hierarchy graph pickle dump file]")
+    print("python check_inheritance_consistency.py [path to class hierarchy graph pickle dump file or binary graph file] [options]")
     print("can use python get_class_hierarchy_graph.py [path to Python source code] to generate the pickle dump file")
     print()
+    print("Options:")
+    print(f"{WRITE_BINARY_GRAPH_OPTION}: also write the class hierarchy graph of a pickle dump file to a binary graph file ({BINARY_GRAPH_EXTENSION}) next to it")
+    print(f"{FLUSH_REPORTS_OPTION}: flush each record of the inconsistency information to its dump file as soon as it is found")
+    print(f"{OUTPUT_FORMAT_OPTION} {'|'.join(OUTPUT_FORMATS)}: output format of the inconsistency information, {OUTPUT_FORMAT_TEXT} by default. {OUTPUT_FORMAT_JSONL} and {OUTPUT_FORMAT_SARIF} write {INCONSISTENCY_RESULTS_FOLDER_NAME}/<name>.jsonl or .sarif instead of the text info dump files")
+    print(f"{PREVIOUS_RESULTS_OPTION} PATH: check only the changed classes and their descendants against PATH, a results file of {OUTPUT_FORMAT_OPTION} {OUTPUT_FORMAT_JSONL} or a class linearizations file of {SAVE_LINEARIZATIONS_OPTION} of a previous check, and write the introduced and resolved inconsistencies to {INCONSISTENCY_RESULTS_FOLDER_NAME}/<name>{INCONSISTENCY_DELTA_DUMP_SUFFIX}.jsonl")
+    print(f"{CHANGED_CLASSES_OPTION} A,B: identifiers of the classes that were added, deleted, or whose bases changed, separated by commas, for {PREVIOUS_RESULTS_OPTION}")
+    print(f"{CHANGED_CLASSES_FILE_OPTION} PATH: file with the identifiers of the changed classes, one per line, for {PREVIOUS_RESULTS_OPTION}")
+    print(f"{SAVE_LINEARIZATIONS_OPTION}: also save the c3 linearizations and linearization statuses to a class linearizations file ({CLASS_LINEARIZATIONS_EXTENSION}) in {FOLDER_WITH_CLASS_HIERARCHY_GRAPHS}, queried with class_linearizations.py")
+    print(f"{EXPORT_CLASS_INDEX_OPTION}: also export the class hierarchy graph, c3 linearizations, and linearization statuses to a SQLite class index in {FOLDER_WITH_CLASS_HIERARCHY_GRAPHS}, queried with class_index.py")
+    print(f"{PROFILE_OPTION}: write the wall time, CPU time, and peak memory of each phase and the calls of get_c3_linearization to {FOLDER_WITH_PROFILES}/<name>_{CHECK_PROFILE_RUN_TYPE}{PROFILE_DUMP_SUFFIX}.json, phases: {', '.join(CHECK_PROFILE_PHASES)}")
+    print(f"{CPROFILE_PHASE_OPTION} <phase>: also profile the phase with cProfile and write its pstats next to the {PROFILE_OPTION} report")
+    print()
     print("Example:")
     print(f"python check_inheritance_consistency.py sample_script_class_hierarchy_graph.pkl (sample_script_class_hierarchy_graph.pkl is relative to {sys.argv[0]})")
     print("python check_inheritance_consistency.py <relative path to sample_script_class_hierarchy_graph.pkl>")
     print("python check_inheritance_consistency.py \"<full path to sample_script_class_hierarchy_graph.pkl>\"")
+    print(f"python check_inheritance_consistency.py sample_script_class_hierarchy_graph{BINARY_GRAPH_EXTENSION}")
 
 if __name__ == "__main__":
     """
@@ -524,15 +1006,80 @@ if __name__ == "__main__":
     Uses c3 linearization for search of logical inconsistency
     """
 
-    class_hierarchy_graph, graph_pickle_dump_path = load_class_hierarchy_graph()
+    output_format = get_output_format_option()
+    if output_format == None:
+        exit(1)
+
+    graph_pickle_dump_path = get_path(GRAPH_PICKLE_DUMP_PATH_ARGUMENT_INDEX, usage_info)
+    if graph_pickle_dump_path == None:
+        exit(1)
+
+    # the phases of the check are recorded with PROFILE_OPTION, in a report named after the source code of the graph
+    profile_name = get_name_directory_or_file(graph_pickle_dump_path)
+    if CLASS_HIERARCHY_GRAPH_DUMP_SUFFIX in profile_name:
+        profile_name = profile_name[:profile_name.find(CLASS_HIERARCHY_GRAPH_DUMP_SUFFIX)]
+    run_profiler = get_run_profiler(graph_pickle_dump_path, profile_name, CHECK_PROFILE_RUN_TYPE, CHECK_PROFILE_PHASES)
+    if run_profiler != None:
+        run_profiler.count_calls(sys.modules[__name__], "get_c3_linearization")
+
+    # the checks run on class ids, class identifiers are only used for output
+    with profile_phase(run_profiler, "load"):
+        compact_class_hierarchy_graph, graph_pickle_dump_path, is_binary_graph = load_class_hierarchy_graph(graph_pickle_dump_path)
 
     if LOG_GRAPH_INFO:
         print()
         print("class hierarchy graph information")
-        print_class_hierarchy_graph_info(class_hierarchy_graph)
+        print_class_hierarchy_graph_info(compact_class_hierarchy_graph.get_class_hierarchy_graph())
         print()
 
+    if has_option(WRITE_BINARY_GRAPH_OPTION) and not is_binary_graph:
+        name = get_name_directory_or_file(graph_pickle_dump_path)
+        binary_graph_dump_path = os.path.join(os.path.dirname(graph_pickle_dump_path), name + BINARY_GRAPH_EXTENSION)
+        print(f"dump binary class hierarchy graph to {binary_graph_dump_path}")
+        with profile_phase(run_profiler, "write_binary_graph"):
+            dump_binary_graph(compact_class_hierarchy_graph, binary_graph_dump_path)
+
+    previous_results_path = get_option_value(PREVIOUS_RESULTS_OPTION)
+    if previous_results_path != None:
+        changed_class_identifiers = get_changed_classes_option()
+        if changed_class_identifiers == None:
+            print(f"Error: {PREVIOUS_RESULTS_OPTION} expects {CHANGED_CLASSES_OPTION} or {CHANGED_CLASSES_FILE_OPTION}")
+            usage_info()
+            exit(1)
+
+        print(f"incremental check for cycle and logical inconsistency in class hierarchy graph from {graph_pickle_dump_path} against {previous_results_path}")
+        previous_class_statuses = load_previous_class_statuses(previous_results_path)
+        if previous_class_statuses == None:
+            exit(1)
+        with profile_phase(run_profiler, "incremental_check"):
+            incremental_check_inconsistency(compact_class_hierarchy_graph, previous_class_statuses, changed_class_identifiers)
+
+        if run_profiler != None:
+            run_profiler.close()
+            print()
+            run_profiler.print_info()
+        exit(0)
+
     print(f"static check for cycle and logical inconsistency in class hierarchy graph from {graph_pickle_dump_path}")
 
     # within provided codebase, __main__.<class> classes, no check for classes from external modules
-    check_inconsistency(class_hierarchy_graph)
\ No newline at end of file
+    c3_linearizations, linearization_nodes = check_inconsistency(compact_class_hierarchy_graph, output_format, run_profiler)
+
+    if has_option(SAVE_LINEARIZATIONS_OPTION):
+        class_linearizations_dump_path = os.path.join(FOLDER_WITH_CLASS_HIERARCHY_GRAPHS, get_class_linearizations_dump_filename(graph_pickle_dump_path))
+        print()
+        print(f"save class linearizations to {class_linearizations_dump_path}")
+        with profile_phase(run_profiler, "save_linearizations"):
+            dump_class_linearizations(compact_class_hierarchy_graph, c3_linearizations, linearization_nodes, class_linearizations_dump_path)
+
+    if has_option(EXPORT_CLASS_INDEX_OPTION):
+        class_index_dump_path = os.path.join(FOLDER_WITH_CLASS_HIERARCHY_GRAPHS, get_class_index_dump_filename(graph_pickle_dump_path))
+        print()
+        print(f"export class index to {class_index_dump_path}")
+        with profile_phase(run_profiler, "export_class_index"):
+            export_class_index(compact_class_hierarchy_graph, c3_linearizations, linearization_nodes, class_index_dump_path)
+
+    if run_profiler != None:
+        run_profiler.close()
+        print()
+        run_profiler.print_info()
\ No newline at end of file
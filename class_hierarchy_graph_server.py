@@ -0,0 +1,573 @@
+import concurrent.futures
+import json
+import os
+import pickle
+import socketserver
+import sys
+import threading
+import time
+
+from class_linearizations import load_class_linearizations
+from check_inheritance_consistency import LinearizationStatus, get_class_linearizations, get_class_statuses, \
+    get_changed_class_identifiers, get_affected_class_identifiers, get_affected_class_statuses, get_status_changes
+from compact_class_hierarchy_graph import *
+from get_class_hierarchy_graph import build_class_hierarchy_graph, get_positive_int_option
+from util import *
+
+SOCKET_OPTION = "--socket"
+WORKERS_OPTION = "--workers"
+DEFAULT_WORKERS = 4
+
+JSON_RPC_VERSION = "2.0"
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+
+# upper bounds of the buckets of the request latency histogram, the last bucket has no upper bound
+LATENCY_HISTOGRAM_BUCKETS_MS = [0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+# the checks redirect their output, which is not thread safe, so one check runs at a time
+check_lock = threading.Lock()
+
+class RequestError(Exception):
+    """
+    Error of a request that is returned as a JSON-RPC error
+    """
+
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+class GraphSnapshot:
+    """
+    Class hierarchy graph of a GraphSession at one point in time \\
+    Requests use the snapshot of the session when they start, so a rebuild does not change the graph under a request \\
+    The c3 linearizations are read from class_linearizations, a class linearizations file of the graph, \\
+    or computed the first time they are needed
+    """
+
+    def __init__(self, compact_class_hierarchy_graph, class_statuses=None, class_linearizations=None):
+        self.compact_class_hierarchy_graph = compact_class_hierarchy_graph
+        self.class_statuses = class_statuses
+        self.class_linearizations = class_linearizations
+
+        self.lock = threading.Lock()
+        self.c3_linearizations = None
+        self.linearization_nodes = None
+
+    def get_c3_linearizations(self):
+        with self.lock:
+            if self.c3_linearizations == None:
+                with check_lock:
+                    self.c3_linearizations, self.linearization_nodes = get_class_linearizations(self.compact_class_hierarchy_graph)
+        return self.c3_linearizations, self.linearization_nodes
+
+    def get_class_statuses(self):
+        if self.class_statuses == None and self.class_linearizations != None:
+            self.class_statuses = self.class_linearizations.get_class_statuses()
+        elif self.class_statuses == None:
+            c3_linearizations, _ = self.get_c3_linearizations()
+            self.class_statuses = get_class_statuses(self.compact_class_hierarchy_graph, c3_linearizations)
+        return self.class_statuses
+
+    def get_class_id(self, class_identifier):
+        class_id = self.compact_class_hierarchy_graph.find_class_id(class_identifier)
+        if class_id == None:
+            raise RequestError(SERVER_ERROR, f"class {class_identifier} is not in the class hierarchy graph")
+        return class_id
+
+    def get_mro(self, class_identifier):
+        """
+        Returns the class identifiers of the c3 linearization of the class or the LinearizationStatus if it could not be computed
+        """
+
+        class_id = self.get_class_id(class_identifier)
+        if not self.compact_class_hierarchy_graph.is_in_graph(class_id):
+            raise RequestError(SERVER_ERROR, f"class {class_identifier} is an external class")
+
+        if self.class_linearizations != None:
+            class_linearizations_class_id = self.class_linearizations.find_class_id(class_identifier)
+            mro = self.class_linearizations.get_mro(class_linearizations_class_id)
+            return mro if mro != None else self.class_linearizations.get_status(class_linearizations_class_id)
+
+        c3_linearizations, linearization_nodes = self.get_c3_linearizations()
+        linearization = c3_linearizations[class_id]
+        if isinstance(linearization, LinearizationStatus):
+            return linearization
+        return self.compact_class_hierarchy_graph.get_class_identifiers(linearization_nodes.get_class_ids(linearization))
+
+    def get_ancestors(self, class_identifier):
+        """
+        Returns the sorted identifiers of the classes that the class inherits from, directly or transitively
+        """
+
+        class_id = self.get_class_id(class_identifier)
+        ancestor_class_ids = self.compact_class_hierarchy_graph.get_ancestor_class_ids([class_id])
+        return sorted(self.compact_class_hierarchy_graph.get_class_identifiers(ancestor_class_ids))
+
+    def get_descendants(self, class_identifier):
+        """
+        Returns the sorted identifiers of the classes that inherit from the class, directly or transitively
+        """
+
+        class_id = self.get_class_id(class_identifier)
+        # the reverse-edge index is built once for the snapshot
+        with self.lock:
+            self.compact_class_hierarchy_graph.get_subclass_index()
+        descendant_class_ids = self.compact_class_hierarchy_graph.get_descendant_class_ids([class_id])
+        return sorted(self.compact_class_hierarchy_graph.get_class_identifiers(descendant_class_ids))
+
+class GraphSession:
+    """
+    Class hierarchy graph held in memory by the server \\
+    A session opened from source code keeps the graph state of get_class_hierarchy_graph.py --incremental \\
+    so that it can be rebuilt from changed paths, a session opened from a class hierarchy graph file is reloaded from the file, \\
+    along with its class linearizations file of check_inheritance_consistency.py --save-linearizations if provided
+    """
+
+    def __init__(self, name, source_code_path=None, graph_path=None, class_linearizations_path=None):
+        self.name = name
+        self.source_code_path = source_code_path
+        self.graph_path = graph_path
+        self.class_linearizations_path = class_linearizations_path
+
+        # reentrant, as rebuild reloads a graph file with load while it holds the lock
+        self.rebuild_lock = threading.RLock()
+        self.class_hierarchy_graph = None
+        self.import_dependency_index = None
+        self.graph_state = None
+        self.snapshot = None
+
+    def load(self):
+        """
+        Builds the class hierarchy graph from the source code or loads it from the class hierarchy graph file
+        """
+
+        with self.rebuild_lock:
+            if self.source_code_path != None:
+                self.class_hierarchy_graph, self.import_dependency_index, self.graph_state = \
+                    build_class_hierarchy_graph(self.source_code_path, get_parent_path(self.source_code_path), self.source_code_path,
+                                                True, None, 1, None, True)
+                self.snapshot = GraphSnapshot(CompactClassHierarchyGraph(self.class_hierarchy_graph))
+                return
+
+            if is_binary_graph_file(self.graph_path):
+                compact_class_hierarchy_graph = load_binary_graph(self.graph_path)
+                if compact_class_hierarchy_graph == None:
+                    raise RequestError(SERVER_ERROR, f"could not load binary graph file {self.graph_path}")
+            else:
+                with open(self.graph_path, "rb") as f:
+                    class_hierarchy_graph = pickle.load(f)
+                f.close()
+                compact_class_hierarchy_graph = CompactClassHierarchyGraph(class_hierarchy_graph)
+
+            class_linearizations = None
+            if self.class_linearizations_path != None:
+                class_linearizations = load_class_linearizations(self.class_linearizations_path)
+                if class_linearizations == None:
+                    raise RequestError(SERVER_ERROR, f"could not load class linearizations file {self.class_linearizations_path}")
+                # the class linearizations file has the class ids of the graph it was saved from
+                if class_linearizations.num_classes != compact_class_hierarchy_graph.num_classes or \
+                    len(class_linearizations.class_identifiers) != len(compact_class_hierarchy_graph.class_identifiers):
+                    raise RequestError(SERVER_ERROR, f"class linearizations file {self.class_linearizations_path} is not of graph file {self.graph_path}")
+
+            self.snapshot = GraphSnapshot(compact_class_hierarchy_graph, class_linearizations=class_linearizations)
+
+    def rebuild(self, changed_paths):
+        """
+        Updates the class hierarchy graph of a session opened from source code with changed_paths \\
+        and checks only the changed classes and their descendants, see watch_class_hierarchy_graph.py \\
+        Returns the number of changed classes, the number of checked classes, and the status changes
+        """
+
+        with self.rebuild_lock:
+            if self.source_code_path == None:
+                previous_class_statuses = self.snapshot.get_class_statuses()
+                self.load()
+                class_statuses = self.snapshot.get_class_statuses()
+                class_identifiers = set(previous_class_statuses) | set(class_statuses)
+                return len(class_identifiers), len(class_statuses), get_status_changes(previous_class_statuses, class_statuses, class_identifiers)
+
+            previous_snapshot = self.snapshot
+            previous_class_statuses = previous_snapshot.get_class_statuses()
+            previous_class_hierarchy_graph = self.class_hierarchy_graph
+
+            class_hierarchy_graph, import_dependency_index, graph_state = \
+                build_class_hierarchy_graph(self.source_code_path, get_parent_path(self.source_code_path), self.source_code_path,
+                                            True, None, 1, None, True,
+                                            self.graph_state, previous_class_hierarchy_graph, self.import_dependency_index, changed_paths)
+
+            compact_class_hierarchy_graph = CompactClassHierarchyGraph(class_hierarchy_graph)
+            changed_class_identifiers = get_changed_class_identifiers(previous_class_hierarchy_graph, class_hierarchy_graph)
+            affected_class_identifiers = get_affected_class_identifiers(compact_class_hierarchy_graph, changed_class_identifiers)
+            with check_lock:
+                affected_class_statuses = get_affected_class_statuses(compact_class_hierarchy_graph, affected_class_identifiers)
+
+            class_statuses = dict()
+            for class_identifier in class_hierarchy_graph:
+                class_statuses[class_identifier] = affected_class_statuses.get(class_identifier, previous_class_statuses.get(class_identifier))
+
+            self.class_hierarchy_graph, self.import_dependency_index, self.graph_state = class_hierarchy_graph, import_dependency_index, graph_state
+            self.snapshot = GraphSnapshot(compact_class_hierarchy_graph, class_statuses)
+
+            status_changes = get_status_changes(previous_class_statuses, class_statuses, changed_class_identifiers | affected_class_identifiers)
+            return len(changed_class_identifiers), len(affected_class_identifiers), status_changes
+
+class LatencyStats:
+    """
+    Number of requests, errors, and histogram of the latency of requests for each method
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.start_time = time.time()
+
+        # key: method, value: number of requests, number of errors, total latency in ms, max latency in ms, bucket counts
+        self.method_stats = dict()
+
+    def record(self, method, latency_ms, is_error):
+        with self.lock:
+            if method not in self.method_stats:
+                self.method_stats[method] = [0, 0, 0.0, 0.0, [0] * (len(LATENCY_HISTOGRAM_BUCKETS_MS) + 1)]
+            stats = self.method_stats[method]
+            stats[0] += 1
+            stats[1] += is_error
+            stats[2] += latency_ms
+            stats[3] = max(stats[3], latency_ms)
+
+            bucket = len(LATENCY_HISTOGRAM_BUCKETS_MS)
+            for i in range(len(LATENCY_HISTOGRAM_BUCKETS_MS)):
+                if latency_ms <= LATENCY_HISTOGRAM_BUCKETS_MS[i]:
+                    bucket = i
+                    break
+            stats[4][bucket] += 1
+
+    def get_stats(self):
+        with self.lock:
+            methods = dict()
+            for method, (num_requests, num_errors, total_latency_ms, max_latency_ms, bucket_counts) in self.method_stats.items():
+                histogram = []
+                for i in range(len(bucket_counts)):
+                    le_ms = LATENCY_HISTOGRAM_BUCKETS_MS[i] if i < len(LATENCY_HISTOGRAM_BUCKETS_MS) else None
+                    histogram.append({ "le_ms": le_ms, "count": bucket_counts[i] })
+                methods[method] = {
+                    "count": num_requests,
+                    "errors": num_errors,
+                    "mean_ms": total_latency_ms / num_requests,
+                    "max_ms": max_latency_ms,
+                    "histogram": histogram
+                }
+            return { "uptime_s": time.time() - self.start_time, "methods": methods }
+
+def get_status_name(status):
+    return status.name if status != None else None
+
+class ClassHierarchyGraphServer:
+    """
+    Answers JSON-RPC 2.0 requests on the class hierarchy graphs held in memory, see usage_info for the methods
+    """
+
+    def __init__(self):
+        self.sessions_lock = threading.Lock()
+        # key: name of the graph, value: GraphSession
+        self.sessions = dict()
+        self.latency_stats = LatencyStats()
+
+        self.methods = {
+            "open": self.open,
+            "close": self.close,
+            "graphs": self.graphs,
+            "check": self.check,
+            "mro": self.mro,
+            "ancestors": self.ancestors,
+            "descendants": self.descendants,
+            "rebuild": self.rebuild,
+            "stats": self.stats
+        }
+
+    def get_session(self, params):
+        """
+        Returns the session of the graph param, which can be left out if one graph is open
+        """
+
+        with self.sessions_lock:
+            name = params.get("graph")
+            if name == None and len(self.sessions) == 1:
+                return next(iter(self.sessions.values()))
+            if name not in self.sessions:
+                raise RequestError(INVALID_PARAMS, f"graph {name} is not open" if name != None else "expected graph")
+            return self.sessions[name]
+
+    def get_class_param(self, params):
+        class_identifier = params.get("class")
+        if not isinstance(class_identifier, str):
+            raise RequestError(INVALID_PARAMS, "expected class")
+        return class_identifier
+
+    def open(self, params):
+        source_code_path = params.get("source_path")
+        graph_path = params.get("graph_path")
+        class_linearizations_path = params.get("linearizations_path")
+        if (source_code_path == None) == (graph_path == None):
+            raise RequestError(INVALID_PARAMS, "expected one of source_path and graph_path")
+        if class_linearizations_path != None and graph_path == None:
+            raise RequestError(INVALID_PARAMS, "expected linearizations_path with graph_path")
+        if class_linearizations_path != None:
+            class_linearizations_path = os.path.realpath(class_linearizations_path)
+            if not os.path.isfile(class_linearizations_path):
+                raise RequestError(INVALID_PARAMS, f"{class_linearizations_path} does not refer to an existing file")
+
+        path = os.path.realpath(source_code_path if source_code_path != None else graph_path)
+        if not os.path.exists(path):
+            raise RequestError(INVALID_PARAMS, f"{path} does not refer to an existing file or directory")
+
+        name = params.get("name", path)
+        if source_code_path != None:
+            session = GraphSession(name, source_code_path=path)
+        else:
+            session = GraphSession(name, graph_path=path, class_linearizations_path=class_linearizations_path)
+        session.load()
+
+        with self.sessions_lock:
+            self.sessions[name] = session
+        return { "graph": name, "num_classes": session.snapshot.compact_class_hierarchy_graph.num_classes }
+
+    def close(self, params):
+        session = self.get_session(params)
+        with self.sessions_lock:
+            del self.sessions[session.name]
+        return { "graph": session.name }
+
+    def graphs(self, params):
+        with self.sessions_lock:
+            sessions = list(self.sessions.values())
+        return [{
+            "graph": session.name,
+            "source_path": session.source_code_path,
+            "graph_path": session.graph_path,
+            "linearizations_path": session.class_linearizations_path,
+            "num_classes": session.snapshot.compact_class_hierarchy_graph.num_classes
+        } for session in sessions]
+
+    def check(self, params):
+        snapshot = self.get_session(params).snapshot
+        class_statuses = snapshot.get_class_statuses()
+
+        num_classes = dict()
+        inconsistent_classes = dict()
+        for status in [LinearizationStatus.cycle_inconsistent, LinearizationStatus.source_logical_inconsistent, LinearizationStatus.inherited_logical_inconsistent]:
+            num_classes[status.name] = 0
+            inconsistent_classes[status.name] = []
+        for class_identifier, status in class_statuses.items():
+            if status.name in num_classes:
+                num_classes[status.name] += 1
+                inconsistent_classes[status.name].append(class_identifier)
+
+        result = { "num_classes": len(class_statuses), "num_inconsistent_classes": num_classes }
+        if params.get("classes", False):
+            for class_identifiers in inconsistent_classes.values():
+                class_identifiers.sort()
+            result["inconsistent_classes"] = inconsistent_classes
+        return result
+
+    def mro(self, params):
+        class_identifier = self.get_class_param(params)
+        mro = self.get_session(params).snapshot.get_mro(class_identifier)
+        if isinstance(mro, LinearizationStatus):
+            return { "class": class_identifier, "mro": None, "status": mro.name }
+        return { "class": class_identifier, "mro": mro, "status": LinearizationStatus.success.name }
+
+    def ancestors(self, params):
+        class_identifier = self.get_class_param(params)
+        return { "class": class_identifier, "ancestors": self.get_session(params).snapshot.get_ancestors(class_identifier) }
+
+    def descendants(self, params):
+        class_identifier = self.get_class_param(params)
+        return { "class": class_identifier, "descendants": self.get_session(params).snapshot.get_descendants(class_identifier) }
+
+    def rebuild(self, params):
+        session = self.get_session(params)
+        paths = params.get("paths", [])
+        if not isinstance(paths, list):
+            raise RequestError(INVALID_PARAMS, "expected paths to be a list")
+
+        num_changed_classes, num_checked_classes, status_changes = session.rebuild(set(os.path.realpath(path) for path in paths))
+        return {
+            "graph": session.name,
+            "num_classes": session.snapshot.compact_class_hierarchy_graph.num_classes,
+            "num_changed_classes": num_changed_classes,
+            "num_checked_classes": num_checked_classes,
+            "status_changes": [{ "class": class_identifier, "previous_status": get_status_name(previous_status), "status": get_status_name(status) }
+                            for class_identifier, previous_status, status in status_changes]
+        }
+
+    def stats(self, params):
+        return self.latency_stats.get_stats()
+
+    def handle_request(self, request):
+        """
+        Returns the JSON-RPC response to request, a parsed request object, or None for a notification
+        """
+
+        request_id = None
+        method = None
+        start_time = time.perf_counter()
+        is_error = False
+        try:
+            if not isinstance(request, dict) or request.get("jsonrpc") != JSON_RPC_VERSION or not isinstance(request.get("method"), str):
+                raise RequestError(INVALID_REQUEST, "invalid request")
+            request_id = request.get("id")
+            method = request["method"]
+
+            if method not in self.methods:
+                raise RequestError(METHOD_NOT_FOUND, f"method {method} not found")
+
+            params = request.get("params", {})
+            if not isinstance(params, dict):
+                raise RequestError(INVALID_PARAMS, "expected params to be an object")
+
+            response = { "jsonrpc": JSON_RPC_VERSION, "result": self.methods[method](params), "id": request_id }
+        except RequestError as e:
+            is_error = True
+            response = { "jsonrpc": JSON_RPC_VERSION, "error": { "code": e.code, "message": e.message }, "id": request_id }
+        except Exception as e:
+            is_error = True
+            response = { "jsonrpc": JSON_RPC_VERSION, "error": { "code": SERVER_ERROR, "message": f"{type(e).__name__}: {e}" }, "id": request_id }
+
+        if method in self.methods:
+            self.latency_stats.record(method, (time.perf_counter() - start_time) * 1000, is_error)
+
+        if isinstance(request, dict) and "id" not in request and not is_error:
+            return None
+        return response
+
+    def handle_message(self, message):
+        """
+        Returns the JSON-RPC response to message, a line with a request or a batch of requests, or None if there is no response
+        """
+
+        try:
+            request = json.loads(message)
+        except ValueError as e:
+            return { "jsonrpc": JSON_RPC_VERSION, "error": { "code": PARSE_ERROR, "message": f"parse error: {e}" }, "id": None }
+
+        if isinstance(request, list):
+            if len(request) == 0:
+                return { "jsonrpc": JSON_RPC_VERSION, "error": { "code": INVALID_REQUEST, "message": "empty batch" }, "id": None }
+            responses = [response for response in map(self.handle_request, request) if response != None]
+            return responses if len(responses) > 0 else None
+
+        return self.handle_request(request)
+
+    def serve_stream(self, input_file, output_file, executor):
+        """
+        Reads one JSON-RPC message per line from input_file until it is closed \\
+        and writes one response per line to output_file \\
+        Messages are handled concurrently by executor, so responses can be written in a different order than the requests
+        """
+
+        write_lock = threading.Lock()
+
+        def handle_and_write(message):
+            response = self.handle_message(message)
+            if response == None:
+                return
+            response_bytes = json.dumps(response).encode() + b"\n"
+            with write_lock:
+                output_file.write(response_bytes)
+                output_file.flush()
+
+        futures = []
+        for line in input_file:
+            if line.strip() == b"":
+                continue
+            futures.append(executor.submit(handle_and_write, line))
+            futures = [future for future in futures if not future.done()]
+        concurrent.futures.wait(futures)
+
+def serve_unix_socket(server, socket_path, executor):
+    """
+    Serves the JSON-RPC requests of each connection to the Unix socket at socket_path \\
+    The socket is created with mode 0600, so that only the user of the server can connect to it, \\
+    as requests can load pickle dump files, see usage_info
+    """
+
+    class RequestHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            server.serve_stream(self.rfile, self.wfile, executor)
+
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+
+    # the mode of the socket is set when it is bound, before any connection can be accepted
+    umask = os.umask(0o177)
+    try:
+        unix_stream_server = socketserver.ThreadingUnixStreamServer(socket_path, RequestHandler)
+    finally:
+        os.umask(umask)
+
+    with unix_stream_server:
+        unix_stream_server.daemon_threads = True
+        print(f"serving on {socket_path}")
+        try:
+            unix_stream_server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    os.remove(socket_path)
+
+def usage_info():
+    """
+    Outputs the proper usage of this script
+    """
+
+    print("Usage:")
+    print("python class_hierarchy_graph_server.py [options]")
+    print("Serves JSON-RPC 2.0 requests, one per line, on stdin and stdout or on a Unix socket")
+    print()
+    print("Options:")
+    print(f"{SOCKET_OPTION} PATH: serve on the Unix socket at PATH instead of stdin and stdout")
+    print(f"{WORKERS_OPTION} N: number of threads that handle requests, {DEFAULT_WORKERS} by default")
+    print()
+    print("Methods (params):")
+    print("open (source_path or graph_path, name): build the class hierarchy graph of source code, or load a class hierarchy graph file, and hold it")
+    print("    linearizations_path: class linearizations file of the graph file, from check_inheritance_consistency.py --save-linearizations, to read linearizations from")
+    print("close (graph), graphs (): stop holding a graph, list the held graphs")
+    print("check (graph, classes): number of inconsistent classes and, if classes is true, the inconsistent classes")
+    print("mro (graph, class), ancestors (graph, class), descendants (graph, class)")
+    print("rebuild (graph, paths): update the graph with the changed paths, or reload a class hierarchy graph file, and return the status changes")
+    print("stats (): number of requests, errors, and latency histogram of each method")
+    print("graph can be left out if one graph is held")
+    print("graph_path is loaded with pickle if it is not a binary graph file, so only open class hierarchy graph files that you trust")
+    print(f"the socket of {SOCKET_OPTION} can only be connected to by the user that runs the server")
+    print()
+    print("Example:")
+    print("echo '{\"jsonrpc\": \"2.0\", \"method\": \"open\", \"params\": {\"source_path\": \"sample_inconsistent_codebase\"}, \"id\": 1}' | python class_hierarchy_graph_server.py")
+
+if __name__ == "__main__":
+    """
+    Holds class hierarchy graphs and their linearizations in memory and answers JSON-RPC requests on them
+    """
+
+    if has_option("--help"):
+        usage_info()
+        exit(0)
+
+    workers = get_positive_int_option(WORKERS_OPTION, DEFAULT_WORKERS)
+    if workers == None:
+        exit(1)
+
+    server = ClassHierarchyGraphServer()
+    with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+        socket_path = get_option_value(SOCKET_OPTION)
+        if socket_path != None:
+            serve_unix_socket(server, socket_path, executor)
+        else:
+            # stdout carries the responses, output of the graph builds goes to stderr
+            output_file = sys.stdout.buffer
+            sys.stdout = sys.stderr
+            server.serve_stream(sys.stdin.buffer, output_file, executor)
@@ -0,0 +1,269 @@
+import os
+import sqlite3
+import time
+
+from util import *
+
+CLASS_INDEX_DUMP_SUFFIX = "_class_index"
+CLASS_INDEX_EXTENSION = ".db"
+
+# the schema of the database changes with the version
+CLASS_INDEX_VERSION = 1
+
+CLASS_INDEX_PATH_ARGUMENT_INDEX = 1 # 0-indexed
+QUERY_ARGUMENT_INDEX = 2 # 0-indexed
+QUERY_CLASS_IDENTIFIER_ARGUMENT_INDEX = 3 # 0-indexed
+
+# classes: each class of the graph (in_graph = 1) and each external parent class (in_graph = 0), by class id
+#   status is the name of the LinearizationStatus of the class and linearization_node the first node of its linearization
+# edges: the inherited classes of each class, in order
+# linearization_nodes: the linearizations as linked lists of class ids that share their tails, NULL next_node at the end
+CLASS_INDEX_SCHEMA = """
+CREATE TABLE metadata (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE source_paths (id INTEGER PRIMARY KEY, path TEXT NOT NULL);
+CREATE TABLE classes (id INTEGER PRIMARY KEY, identifier TEXT NOT NULL, in_graph INTEGER NOT NULL,
+                        source_path_id INTEGER, status TEXT, linearization_node INTEGER);
+CREATE TABLE edges (class_id INTEGER NOT NULL, position INTEGER NOT NULL, parent_id INTEGER NOT NULL,
+                        PRIMARY KEY (class_id, position)) WITHOUT ROWID;
+CREATE TABLE linearization_nodes (node INTEGER PRIMARY KEY, class_id INTEGER NOT NULL, next_node INTEGER);
+"""
+
+# created after the rows are inserted
+CLASS_INDEX_INDEXES = """
+CREATE UNIQUE INDEX classes_identifier ON classes (identifier);
+CREATE INDEX edges_parent_id ON edges (parent_id, class_id);
+"""
+
+QUERIES = ["parents", "children", "ancestors", "descendants", "mro", "status"]
+
+def get_class_index_dump_filename(graph_dump_path):
+    """
+    Returns the filename of the class index of the class hierarchy graph file at graph_dump_path
+    """
+
+    name = get_name_directory_or_file(graph_dump_path)
+    if CLASS_HIERARCHY_GRAPH_DUMP_SUFFIX in name:
+        name = name[:name.find(CLASS_HIERARCHY_GRAPH_DUMP_SUFFIX)]
+    return name + CLASS_INDEX_DUMP_SUFFIX + CLASS_INDEX_EXTENSION
+
+def export_class_index(compact_class_hierarchy_graph, c3_linearizations, linearization_nodes, class_index_dump_path):
+    """
+    Writes the classes, edges, and source paths of the compact class hierarchy graph \\
+    and the c3 linearizations and their statuses to a new SQLite database at class_index_dump_path
+    """
+
+    create_dump_folder(os.path.dirname(class_index_dump_path))
+
+    if os.path.exists(class_index_dump_path):
+        os.remove(class_index_dump_path)
+
+    connection = sqlite3.connect(class_index_dump_path)
+
+    # the database is written once, so it is not journaled
+    connection.execute("PRAGMA journal_mode = OFF")
+    connection.execute("PRAGMA synchronous = OFF")
+    connection.executescript(CLASS_INDEX_SCHEMA)
+
+    num_classes = compact_class_hierarchy_graph.num_classes
+    class_identifiers = compact_class_hierarchy_graph.class_identifiers
+    parent_offsets = compact_class_hierarchy_graph.parent_offsets
+    parent_ids = compact_class_hierarchy_graph.parent_ids
+
+    def get_class_rows():
+        for class_id in range(len(class_identifiers)):
+            if class_id >= num_classes:
+                yield (class_id, class_identifiers[class_id], 0, None, None, None)
+                continue
+
+            linearization = c3_linearizations[class_id]
+            if isinstance(linearization, int):
+                yield (class_id, class_identifiers[class_id], 1, compact_class_hierarchy_graph.source_path_ids[class_id], "success", linearization)
+            else:   # LinearizationStatus
+                yield (class_id, class_identifiers[class_id], 1, compact_class_hierarchy_graph.source_path_ids[class_id], linearization.name, None)
+
+    def get_edge_rows():
+        for class_id in range(num_classes):
+            for position, edge_position in enumerate(range(parent_offsets[class_id], parent_offsets[class_id + 1])):
+                yield (class_id, position, parent_ids[edge_position])
+
+    def get_linearization_node_rows():
+        next_nodes = linearization_nodes.next_nodes
+        for node, class_id in enumerate(linearization_nodes.class_ids):
+            next_node = next_nodes[node]
+            yield (node, class_id, next_node if next_node >= 0 else None)
+
+    with connection:
+        connection.executemany("INSERT INTO metadata VALUES (?, ?)", [("version", str(CLASS_INDEX_VERSION)), ("num_classes", str(num_classes))])
+        connection.executemany("INSERT INTO source_paths VALUES (?, ?)", enumerate(compact_class_hierarchy_graph.source_paths))
+        connection.executemany("INSERT INTO classes VALUES (?, ?, ?, ?, ?, ?)", get_class_rows())
+        connection.executemany("INSERT INTO edges VALUES (?, ?, ?)", get_edge_rows())
+        connection.executemany("INSERT INTO linearization_nodes VALUES (?, ?, ?)", get_linearization_node_rows())
+        connection.executescript(CLASS_INDEX_INDEXES)
+
+    connection.execute("ANALYZE")
+    connection.close()
+
+def connect_class_index(class_index_path):
+    """
+    Opens the class index at class_index_path read-only \\
+    Returns the connection or None if the class index is not of CLASS_INDEX_VERSION
+    """
+
+    connection = sqlite3.connect(f"file:{class_index_path}?mode=ro", uri=True)
+    try:
+        version = connection.execute("SELECT value FROM metadata WHERE key = 'version'").fetchone()
+    except sqlite3.DatabaseError as e:
+        print(f"Error: {class_index_path} is not a class index: {e}")
+        connection.close()
+        return None
+
+    if version == None or version[0] != str(CLASS_INDEX_VERSION):
+        print(f"Error: class index version {version[0] if version != None else None} is not supported, expected version {CLASS_INDEX_VERSION}")
+        connection.close()
+        return None
+
+    return connection
+
+def get_class_id(connection, class_identifier):
+    """
+    Returns the class id of class_identifier in the class index or None if it is not in the class index
+    """
+
+    row = connection.execute("SELECT id FROM classes WHERE identifier = ?", (class_identifier,)).fetchone()
+    return row[0] if row != None else None
+
+def get_parents(connection, class_id):
+    """
+    Returns the identifiers of the inherited classes of the class with class_id, in order
+    """
+
+    rows = connection.execute("""
+        SELECT classes.identifier FROM edges JOIN classes ON classes.id = edges.parent_id
+        WHERE edges.class_id = ? ORDER BY edges.position""", (class_id,))
+    return [row[0] for row in rows]
+
+def get_children(connection, class_id):
+    """
+    Returns the identifiers of the classes that directly inherit from the class with class_id
+    """
+
+    rows = connection.execute("""
+        SELECT DISTINCT classes.identifier FROM edges JOIN classes ON classes.id = edges.class_id
+        WHERE edges.parent_id = ? ORDER BY classes.identifier""", (class_id,))
+    return [row[0] for row in rows]
+
+def get_ancestors(connection, class_id):
+    """
+    Returns the identifiers of the classes that the class with class_id inherits from, directly or transitively
+    """
+
+    rows = connection.execute("""
+        WITH RECURSIVE ancestors(id) AS (
+            SELECT parent_id FROM edges WHERE class_id = ?
+            UNION
+            SELECT edges.parent_id FROM edges JOIN ancestors ON edges.class_id = ancestors.id
+        )
+        SELECT classes.identifier FROM ancestors JOIN classes ON classes.id = ancestors.id ORDER BY classes.identifier""", (class_id,))
+    return [row[0] for row in rows]
+
+def get_descendants(connection, class_id):
+    """
+    Returns the identifiers of the classes that inherit from the class with class_id, directly or transitively
+    """
+
+    rows = connection.execute("""
+        WITH RECURSIVE descendants(id) AS (
+            SELECT class_id FROM edges WHERE parent_id = ?
+            UNION
+            SELECT edges.class_id FROM edges JOIN descendants ON edges.parent_id = descendants.id
+        )
+        SELECT classes.identifier FROM descendants JOIN classes ON classes.id = descendants.id ORDER BY classes.identifier""", (class_id,))
+    return [row[0] for row in rows]
+
+def get_status(connection, class_id):
+    """
+    Returns the name of the LinearizationStatus of the class with class_id, None for an external class
+    """
+
+    return connection.execute("SELECT status FROM classes WHERE id = ?", (class_id,)).fetchone()[0]
+
+def get_mro(connection, class_id):
+    """
+    Returns the identifiers of the classes in the stored c3 linearization of the class with class_id, in order \\
+    Returns None if the linearization could not be computed
+    """
+
+    rows = connection.execute("""
+        WITH RECURSIVE mro(node, position) AS (
+            SELECT linearization_node, 0 FROM classes WHERE id = ? AND linearization_node IS NOT NULL
+            UNION ALL
+            SELECT linearization_nodes.next_node, mro.position + 1 FROM linearization_nodes JOIN mro ON linearization_nodes.node = mro.node
+            WHERE linearization_nodes.next_node IS NOT NULL
+        )
+        SELECT classes.identifier FROM mro
+        JOIN linearization_nodes ON linearization_nodes.node = mro.node
+        JOIN classes ON classes.id = linearization_nodes.class_id
+        ORDER BY mro.position""", (class_id,))
+    mro = [row[0] for row in rows]
+    return mro if len(mro) > 0 else None
+
+def usage_info():
+    """
+    Outputs the proper usage of this script
+    """
+
+    print("Usage:")
+    print(f"python class_index.py [path to class index] [{'|'.join(QUERIES)}] [class identifier]")
+    print("can use python check_inheritance_consistency.py [path to class hierarchy graph file] --export-class-index to generate the class index")
+    print()
+    print("Example:")
+    print("python class_index.py class_hierarchy_graphs/sample_inconsistent_codebase_class_index.db mro sample_inconsistent_codebase.c.C")
+
+if __name__ == "__main__":
+    """
+    Outputs the parents, children, ancestors, descendants, mro, or linearization status of the given class from the class index
+    """
+
+    class_index_path = get_path(CLASS_INDEX_PATH_ARGUMENT_INDEX, usage_info)
+    if class_index_path == None:
+        exit(1)
+
+    if len(sys.argv) < QUERY_CLASS_IDENTIFIER_ARGUMENT_INDEX + 1 or sys.argv[QUERY_ARGUMENT_INDEX] not in QUERIES:
+        print("Error: expected query and class identifier")
+        usage_info()
+        exit(1)
+
+    query = sys.argv[QUERY_ARGUMENT_INDEX]
+    class_identifier = sys.argv[QUERY_CLASS_IDENTIFIER_ARGUMENT_INDEX]
+
+    connection = connect_class_index(class_index_path)
+    if connection == None:
+        exit(1)
+
+    start_time = time.perf_counter()
+
+    class_id = get_class_id(connection, class_identifier)
+    if class_id == None:
+        print(f"Error: class {class_identifier} is not in the class index")
+        exit(1)
+
+    if query == "parents":
+        print(f"parents of class {class_identifier}: {get_parents(connection, class_id)}")
+    elif query == "children":
+        print(f"children of class {class_identifier}: {get_children(connection, class_id)}")
+    elif query == "ancestors":
+        print(f"ancestors of class {class_identifier}: {get_ancestors(connection, class_id)}")
+    elif query == "descendants":
+        print(f"descendants of class {class_identifier}: {get_descendants(connection, class_id)}")
+    elif query == "mro":
+        mro = get_mro(connection, class_id)
+        if mro == None:
+            print(f"linearization of class {class_identifier} could not be computed, status: {get_status(connection, class_id)}")
+        else:
+            print(f"mro of class {class_identifier}: {mro}")
+    elif query == "status":
+        print(f"linearization status of class {class_identifier}: {get_status(connection, class_id)}")
+
+    print(f"query time: {(time.perf_counter() - start_time) * 1000:.2f} ms")
+
+    connection.close()
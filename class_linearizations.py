@@ -0,0 +1,249 @@
+import bisect
+import os
+import struct
+import time
+
+from compact_class_hierarchy_graph import *
+from util import *
+
+CLASS_LINEARIZATIONS_DUMP_SUFFIX = "_linearizations"
+CLASS_LINEARIZATIONS_EXTENSION = ".chl"
+
+# a class linearizations file starts with a header of CLASS_LINEARIZATIONS_HEADER_FORMAT (little-endian):
+#   magic, version, size of a class id, number of classes, number of class identifiers, number of linearization nodes
+# followed by sections aligned to BINARY_GRAPH_ALIGNMENT, see dump_class_linearizations
+CLASS_LINEARIZATIONS_MAGIC = b"CHLINEAR"
+CLASS_LINEARIZATIONS_VERSION = 1
+CLASS_LINEARIZATIONS_HEADER_FORMAT = "<8sIIQQQ"
+
+CLASS_LINEARIZATIONS_PATH_ARGUMENT_INDEX = 1 # 0-indexed
+QUERY_ARGUMENT_INDEX = 2 # 0-indexed
+QUERY_CLASS_IDENTIFIER_ARGUMENT_INDEX = 3 # 0-indexed
+
+QUERIES = ["mro", "status"]
+
+def get_class_linearizations_dump_filename(graph_dump_path):
+    """
+    Returns the filename of the class linearizations file of the class hierarchy graph file at graph_dump_path
+    """
+
+    name = get_name_directory_or_file(graph_dump_path)
+    if CLASS_HIERARCHY_GRAPH_DUMP_SUFFIX in name:
+        name = name[:name.find(CLASS_HIERARCHY_GRAPH_DUMP_SUFFIX)]
+    return name + CLASS_LINEARIZATIONS_DUMP_SUFFIX + CLASS_LINEARIZATIONS_EXTENSION
+
+def get_linearization_entry(linearization):
+    """
+    Returns the entry of a c3 linearization in a class linearizations file: \\
+    the first node of the linearization, which is not negative, or -1 - value of the LinearizationStatus if it could not be computed
+    """
+
+    if isinstance(linearization, LinearizationStatus):
+        return -1 - linearization.value
+    return linearization
+
+def dump_class_linearizations(compact_class_hierarchy_graph, c3_linearizations, linearization_nodes, class_linearizations_dump_path):
+    """
+    Writes the c3 linearizations and their statuses to a class linearizations file at class_linearizations_dump_path, with sections:
+        - string table of the class identifiers of the class ids, see StringTable
+        - class ids sorted by class identifier, to look up the class id of a class identifier without reading all of them
+        - linearization entry of each class in the graph, see get_linearization_entry
+        - class id and next node of each linearization node \\
+    The linearizations are stored as the linearization nodes, so a linearization that ends with the linearization \\
+    of a parent class only stores the class ids before it
+    """
+
+    class_identifiers = compact_class_hierarchy_graph.class_identifiers
+    class_identifier_offsets, class_identifier_bytes = get_string_table_sections(class_identifiers)
+    sorted_class_ids = array(CLASS_ID_TYPECODE, sorted(range(len(class_identifiers)), key=class_identifiers.__getitem__))
+
+    linearization_entries = array(CLASS_ID_TYPECODE)
+    for class_id in range(compact_class_hierarchy_graph.num_classes):
+        linearization_entries.append(get_linearization_entry(c3_linearizations[class_id]))
+
+    sections = [class_identifier_offsets, class_identifier_bytes, sorted_class_ids, linearization_entries,
+                array(CLASS_ID_TYPECODE, linearization_nodes.class_ids), array(CLASS_ID_TYPECODE, linearization_nodes.next_nodes)]
+
+    header = struct.pack(CLASS_LINEARIZATIONS_HEADER_FORMAT, CLASS_LINEARIZATIONS_MAGIC, CLASS_LINEARIZATIONS_VERSION, array(CLASS_ID_TYPECODE).itemsize,
+                        compact_class_hierarchy_graph.num_classes, len(class_identifiers), linearization_nodes.get_num_nodes())
+
+    dump_sections(class_linearizations_dump_path, header, sections)
+
+def is_class_linearizations_file(dump_path):
+    """
+    Returns whether the file at dump_path is a class linearizations file
+    """
+
+    with open(dump_path, "rb") as f:
+        magic = f.read(len(CLASS_LINEARIZATIONS_MAGIC))
+    f.close()
+
+    return magic == CLASS_LINEARIZATIONS_MAGIC
+
+class ClassLinearizations:
+    """
+    C3 linearizations and statuses of a class linearizations file mapped into memory \\
+    Only the parts of the file of the classes that are looked up are read
+    """
+
+    def __init__(self, num_classes, class_identifiers, sorted_class_ids, linearization_entries, linearization_nodes, mapped_file):
+        self.num_classes = num_classes
+        self.class_identifiers = class_identifiers
+        self.sorted_class_ids = sorted_class_ids
+        self.linearization_entries = linearization_entries
+        self.linearization_nodes = linearization_nodes
+
+        # keeps the mapped file open while the linearizations are in use
+        self.mapped_file = mapped_file
+
+    def find_class_id(self, class_identifier):
+        """
+        Returns the class id of class_identifier or None if it is not a class or external class of the file \\
+        The class id is searched for in the class ids sorted by class identifier \\
+        utf-8 preserves the order of code points, so the class identifiers are compared as bytes
+        """
+
+        class_identifier_bytes = class_identifier.encode("utf-8")
+        sorted_class_ids = self.sorted_class_ids
+        get_bytes = self.class_identifiers.get_bytes
+
+        i = bisect.bisect_left(range(len(sorted_class_ids)), class_identifier_bytes, key=lambda i: get_bytes(sorted_class_ids[i]))
+        if i < len(sorted_class_ids) and get_bytes(sorted_class_ids[i]) == class_identifier_bytes:
+            return sorted_class_ids[i]
+        return None
+
+    def get_status(self, class_id):
+        """
+        Returns the LinearizationStatus of the class with class_id or None for an external class
+        """
+
+        if class_id >= self.num_classes:
+            return None
+
+        linearization_entry = self.linearization_entries[class_id]
+        if linearization_entry >= 0:
+            return LinearizationStatus.success
+        return LinearizationStatus(-1 - linearization_entry)
+
+    def get_mro(self, class_id):
+        """
+        Returns the class identifiers of the c3 linearization of the class with class_id, in order, \\
+        or None if it is an external class or its linearization could not be computed
+        """
+
+        if class_id >= self.num_classes or self.linearization_entries[class_id] < 0:
+            return None
+
+        class_ids = self.linearization_nodes.get_class_ids(self.linearization_entries[class_id])
+        return [self.class_identifiers[linearization_class_id] for linearization_class_id in class_ids]
+
+    def get(self, class_identifier, default=None):
+        """
+        Returns the LinearizationStatus of the class with class_identifier or default if it is not a class of the file, like dict.get
+        """
+
+        class_id = self.find_class_id(class_identifier)
+        status = self.get_status(class_id) if class_id != None else None
+        return status if status != None else default
+
+    def get_class_statuses(self):
+        """
+        Returns dict with key: class identifier, value: LinearizationStatus of each class of the file
+        """
+
+        class_statuses = dict()
+        for class_id in range(self.num_classes):
+            class_statuses[self.class_identifiers[class_id]] = self.get_status(class_id)
+        return class_statuses
+
+def load_class_linearizations(class_linearizations_dump_path):
+    """
+    Maps the class linearizations file at class_linearizations_dump_path into memory \\
+    Returns the ClassLinearizations or None if the file is not a class linearizations file of CLASS_LINEARIZATIONS_VERSION or is truncated
+    """
+
+    header_size = struct.calcsize(CLASS_LINEARIZATIONS_HEADER_FORMAT)
+    if os.path.getsize(class_linearizations_dump_path) < header_size:
+        print(f"Error: {class_linearizations_dump_path} is not a class linearizations file")
+        return None
+
+    mapped_file = map_file(class_linearizations_dump_path)
+
+    if mapped_file[:len(CLASS_LINEARIZATIONS_MAGIC)] != CLASS_LINEARIZATIONS_MAGIC:
+        print(f"Error: {class_linearizations_dump_path} is not a class linearizations file")
+        return None
+
+    _, version, class_id_size, num_classes, num_class_identifiers, num_nodes = struct.unpack_from(CLASS_LINEARIZATIONS_HEADER_FORMAT, mapped_file)
+    if version != CLASS_LINEARIZATIONS_VERSION or class_id_size != array(CLASS_ID_TYPECODE).itemsize:
+        print(f"Error: class linearizations file version {version} with class id size {class_id_size} is not supported, "
+              f"expected version {CLASS_LINEARIZATIONS_VERSION} with class id size {array(CLASS_ID_TYPECODE).itemsize}")
+        return None
+
+    # each section is checked against the size of the file, so that a truncated file is not read past its end
+    mapped_sections = MappedSections(mapped_file, header_size)
+    class_identifiers = mapped_sections.get_string_table(num_class_identifiers)
+    sorted_class_ids = mapped_sections.get_section(CLASS_ID_TYPECODE, num_class_identifiers)
+    linearization_entries = mapped_sections.get_section(CLASS_ID_TYPECODE, num_classes)
+
+    linearization_nodes = LinearizationNodes()
+    linearization_nodes.class_ids = mapped_sections.get_section(CLASS_ID_TYPECODE, num_nodes)
+    linearization_nodes.next_nodes = mapped_sections.get_section(CLASS_ID_TYPECODE, num_nodes)
+
+    sections = [class_identifiers, sorted_class_ids, linearization_entries, linearization_nodes.class_ids, linearization_nodes.next_nodes]
+    if any(section == None for section in sections) or num_classes > num_class_identifiers:
+        print(f"Error: {class_linearizations_dump_path} is truncated or is not a valid class linearizations file")
+        return None
+
+    return ClassLinearizations(num_classes, class_identifiers, sorted_class_ids, linearization_entries, linearization_nodes, mapped_file)
+
+def usage_info():
+    """
+    Outputs the proper usage of this script
+    """
+
+    print("Usage:")
+    print(f"python class_linearizations.py [path to class linearizations file] [{'|'.join(QUERIES)}] [class identifier]")
+    print("can use python check_inheritance_consistency.py [path to class hierarchy graph file] --save-linearizations to generate the class linearizations file")
+    print()
+    print("Example:")
+    print(f"python class_linearizations.py class_hierarchy_graphs/sample_inconsistent_codebase{CLASS_LINEARIZATIONS_DUMP_SUFFIX}{CLASS_LINEARIZATIONS_EXTENSION} mro sample_inconsistent_codebase.c.C")
+
+if __name__ == "__main__":
+    """
+    Outputs the mro or linearization status of the given class from the class linearizations file
+    """
+
+    class_linearizations_path = get_path(CLASS_LINEARIZATIONS_PATH_ARGUMENT_INDEX, usage_info)
+    if class_linearizations_path == None:
+        exit(1)
+
+    if len(sys.argv) < QUERY_CLASS_IDENTIFIER_ARGUMENT_INDEX + 1 or sys.argv[QUERY_ARGUMENT_INDEX] not in QUERIES:
+        print("Error: expected query and class identifier")
+        usage_info()
+        exit(1)
+
+    query = sys.argv[QUERY_ARGUMENT_INDEX]
+    class_identifier = sys.argv[QUERY_CLASS_IDENTIFIER_ARGUMENT_INDEX]
+
+    start_time = time.perf_counter()
+
+    class_linearizations = load_class_linearizations(class_linearizations_path)
+    if class_linearizations == None:
+        exit(1)
+
+    class_id = class_linearizations.find_class_id(class_identifier)
+    if class_id == None:
+        print(f"Error: class {class_identifier} is not in the class linearizations file")
+        exit(1)
+
+    status = class_linearizations.get_status(class_id)
+    if query == "mro":
+        mro = class_linearizations.get_mro(class_id)
+        if mro == None:
+            print(f"linearization of class {class_identifier} could not be computed, status: {status.name if status != None else None}")
+        else:
+            print(f"mro of class {class_identifier}: {mro}")
+    elif query == "status":
+        print(f"linearization status of class {class_identifier}: {status.name if status != None else None}")
+
+    print(f"query time: {(time.perf_counter() - start_time) * 1000:.2f} ms")
@@ -0,0 +1,499 @@
+import enum
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from util import *
+
+# typecode of the arrays of class ids
+CLASS_ID_TYPECODE = "i"
+
+# binary class hierarchy graph file, little-endian, sections 8-byte aligned:
+#   header: magic, version, size of a class id in bytes, number of classes, number of class identifiers (classes and external classes),
+#           number of edges (inherited classes), number of source paths
+#   class identifier string table: number of class identifiers + 1 int64 offsets into the utf-8 bytes of the class identifiers
+#   source path string table: number of source paths + 1 int64 offsets into the utf-8 bytes of the source paths
+#   parent offsets: number of classes + 1 int32
+#   parent ids: number of edges int32
+#   source path ids: number of classes int32
+BINARY_GRAPH_EXTENSION = ".chg"
+BINARY_GRAPH_MAGIC = b"CHGRAPH\0"
+BINARY_GRAPH_VERSION = 1
+BINARY_GRAPH_HEADER_FORMAT = "<8sIIQQQQ"
+BINARY_GRAPH_ALIGNMENT = 8
+STRING_TABLE_OFFSET_TYPECODE = "q"
+
+# values of the graph format option
+GRAPH_FORMAT_PICKLE = "pickle"
+GRAPH_FORMAT_BINARY = "binary"
+GRAPH_FORMATS = [GRAPH_FORMAT_PICKLE, GRAPH_FORMAT_BINARY]
+
+class CompactClassHierarchyGraph:
+    """
+    Compact form of a class hierarchy graph for the checker \\
+    Each class identifier is interned as an integer class id: the classes in the graph get ids 0 to num_classes - 1, \\
+    in the order of the graph keys, and parent classes that are not in the graph (external) get the following ids \\
+    The inherited class ids of class id i are parent_ids[parent_offsets[i]:parent_offsets[i + 1]] (CSR adjacency) \\
+    and the source path of class id i is source_paths[source_path_ids[i]] \\
+    A graph loaded with load_binary_graph has memoryviews of the mapped file in place of the arrays and lists
+    """
+
+    def __init__(self, class_hierarchy_graph=None):
+        if class_hierarchy_graph == None:
+            class_hierarchy_graph = dict()
+
+        self.num_classes = len(class_hierarchy_graph)
+
+        # key: class identifier, value: class id
+        self.class_ids = dict()
+        # class identifier of each class id
+        self.class_identifiers = []
+        for class_identifier in class_hierarchy_graph:
+            self.class_ids[class_identifier] = len(self.class_identifiers)
+            self.class_identifiers.append(class_identifier)
+
+        self.parent_offsets = array(CLASS_ID_TYPECODE, [0])
+        self.parent_ids = array(CLASS_ID_TYPECODE)
+
+        # key: source path, value: index in source_paths
+        source_path_indices = dict()
+        self.source_paths = []
+        self.source_path_ids = array(CLASS_ID_TYPECODE)
+
+        for inherited_class_identifiers, source_path in class_hierarchy_graph.values():
+            for inherited_class_identifier in inherited_class_identifiers:
+                self.parent_ids.append(self.get_class_id(inherited_class_identifier))
+            self.parent_offsets.append(len(self.parent_ids))
+
+            if source_path not in source_path_indices:
+                source_path_indices[source_path] = len(self.source_paths)
+                self.source_paths.append(source_path)
+            self.source_path_ids.append(source_path_indices[source_path])
+
+        # reverse CSR adjacency, built the first time it is needed, see get_subclass_index
+        self.subclass_offsets = None
+        self.subclass_ids = None
+
+        # key: module path, value: ids of the classes of the module path, built the first time it is needed, see get_module_path_class_ids
+        self.module_path_class_ids = None
+
+    def get_class_id(self, class_identifier):
+        """
+        Returns the class id of class_identifier, interning it as an external class if it does not have one
+        """
+
+        class_id = self.class_ids.get(class_identifier)
+        if class_id == None:
+            class_id = len(self.class_identifiers)
+            self.class_ids[class_identifier] = class_id
+            self.class_identifiers.append(class_identifier)
+        return class_id
+
+    def find_class_id(self, class_identifier):
+        """
+        Returns the class id of class_identifier or None if it is not a class or external class of the graph \\
+        The class ids of a graph loaded with load_binary_graph are looked up from its class identifiers the first time
+        """
+
+        if self.class_ids == None:
+            self.class_ids = dict()
+            for class_id in range(len(self.class_identifiers)):
+                self.class_ids[self.class_identifiers[class_id]] = class_id
+        return self.class_ids.get(class_identifier)
+
+    def is_in_graph(self, class_id):
+        """
+        Returns whether class_id is the id of a class in the graph, as opposed to an external parent class
+        """
+
+        return class_id < self.num_classes
+
+    def get_inherited_class_ids(self, class_id):
+        """
+        Returns an array of the inherited class ids of the class with class_id, in order
+        """
+
+        return self.parent_ids[self.parent_offsets[class_id]:self.parent_offsets[class_id + 1]]
+
+    def get_class_identifier(self, class_id):
+        """
+        Returns the class identifier of class_id or None if class_id is None
+        """
+
+        return self.class_identifiers[class_id] if class_id != None else None
+
+    def get_class_identifiers(self, class_ids):
+        """
+        Returns the list of class identifiers of class_ids
+        """
+
+        return [self.class_identifiers[class_id] for class_id in class_ids]
+
+    def get_source_path(self, class_id):
+        """
+        Returns the source path of the class with class_id, a class in the graph
+        """
+
+        return self.source_paths[self.source_path_ids[class_id]]
+
+    def get_num_edges(self):
+        """
+        Returns the number of inherited classes over all classes in the graph
+        """
+
+        return len(self.parent_ids)
+
+    def get_subclass_index(self):
+        """
+        Returns the reverse-edge index of the graph as a CSR adjacency: the ids of the classes that directly inherit from \\
+        class id i, a class in the graph or an external class, are subclass_ids[subclass_offsets[i]:subclass_offsets[i + 1]] \\
+        The index is built the first time it is needed
+        """
+
+        if self.subclass_offsets == None:
+            num_class_ids = len(self.class_identifiers)
+
+            subclass_offsets = array(CLASS_ID_TYPECODE, [0]) * (num_class_ids + 1)
+            for parent_id in self.parent_ids:
+                subclass_offsets[parent_id + 1] += 1
+            for class_id in range(num_class_ids):
+                subclass_offsets[class_id + 1] += subclass_offsets[class_id]
+
+            positions = array(CLASS_ID_TYPECODE, subclass_offsets)
+            subclass_ids = array(CLASS_ID_TYPECODE, [0]) * len(self.parent_ids)
+            for class_id in range(self.num_classes):
+                for parent_id in self.get_inherited_class_ids(class_id):
+                    subclass_ids[positions[parent_id]] = class_id
+                    positions[parent_id] += 1
+
+            self.subclass_offsets, self.subclass_ids = subclass_offsets, subclass_ids
+        return self.subclass_offsets, self.subclass_ids
+
+    def get_module_path_class_ids(self, module_path):
+        """
+        Returns the ids of the classes in the graph whose class identifier is in module_path, in dot notation \\
+        The index of the class ids of each module path is built the first time it is needed
+        """
+
+        if self.module_path_class_ids == None:
+            module_path_class_ids = dict()
+            for class_id in range(self.num_classes):
+                class_identifier = self.get_class_identifier(class_id)
+                class_module_path = class_identifier[:class_identifier.rfind(".")]
+                if class_module_path not in module_path_class_ids:
+                    module_path_class_ids[class_module_path] = []
+                module_path_class_ids[class_module_path].append(class_id)
+
+            self.module_path_class_ids = module_path_class_ids
+        return self.module_path_class_ids.get(module_path, [])
+
+    def get_ancestor_class_ids(self, class_ids):
+        """
+        Returns the set of ids of the classes that the classes with class_ids inherit from, directly or transitively \\
+        A class with one of class_ids is only included if it is in a cycle with one of them
+        """
+
+        ancestor_class_ids = set()
+        stack = list(class_ids)
+        while len(stack) > 0:
+            class_id = stack.pop()
+            if not self.is_in_graph(class_id):
+                continue
+            for inherited_class_id in self.get_inherited_class_ids(class_id):
+                if inherited_class_id not in ancestor_class_ids:
+                    ancestor_class_ids.add(inherited_class_id)
+                    stack.append(inherited_class_id)
+
+        return ancestor_class_ids
+
+    def get_descendant_class_ids(self, class_ids):
+        """
+        Returns the set of ids of the classes that inherit from the classes with class_ids, directly or transitively, \\
+        through the reverse-edge index, see get_subclass_index \\
+        A class with one of class_ids is only included if it is in a cycle with one of them
+        """
+
+        subclass_offsets, subclass_ids = self.get_subclass_index()
+
+        descendant_class_ids = set()
+        stack = list(class_ids)
+        while len(stack) > 0:
+            class_id = stack.pop()
+            for subclass_id in subclass_ids[subclass_offsets[class_id]:subclass_offsets[class_id + 1]]:
+                if subclass_id not in descendant_class_ids:
+                    descendant_class_ids.add(subclass_id)
+                    stack.append(subclass_id)
+
+        return descendant_class_ids
+
+    def get_class_hierarchy_graph(self):
+        """
+        Returns the class hierarchy graph of the compact graph \\
+        key: class identifier, value: list of identifiers of inherited classes, module path of class
+        """
+
+        class_hierarchy_graph = dict()
+        for class_id in range(self.num_classes):
+            class_hierarchy_graph[self.class_identifiers[class_id]] = \
+                (self.get_class_identifiers(self.get_inherited_class_ids(class_id)), self.get_source_path(class_id))
+        return class_hierarchy_graph
+
+class StringTable:
+    """
+    Strings of a string table in a binary graph file, decoded when accessed
+    """
+
+    def __init__(self, offsets, string_bytes):
+        self.offsets = offsets
+        self.string_bytes = string_bytes
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        return str(self.string_bytes[self.offsets[index]:self.offsets[index + 1]], "utf-8")
+
+    def get_bytes(self, index):
+        return bytes(self.string_bytes[self.offsets[index]:self.offsets[index + 1]])
+
+def get_aligned_offset(offset):
+    return (offset + BINARY_GRAPH_ALIGNMENT - 1) // BINARY_GRAPH_ALIGNMENT * BINARY_GRAPH_ALIGNMENT
+
+def get_string_table_sections(strings):
+    """
+    Returns the offsets and the utf-8 bytes of a string table of strings, see StringTable
+    """
+
+    offsets = array(STRING_TABLE_OFFSET_TYPECODE, [0])
+    string_bytes = bytearray()
+    for string in strings:
+        string_bytes += string.encode("utf-8")
+        offsets.append(len(string_bytes))
+    return offsets, string_bytes
+
+def dump_sections(dump_path, header, sections):
+    """
+    Writes header and then sections, arrays in little-endian or bytes, each aligned to BINARY_GRAPH_ALIGNMENT, to the file at dump_path \\
+    sections are not modified, the arrays are byteswapped in copies on big-endian hosts
+    """
+
+    create_dump_folder(os.path.dirname(dump_path))
+
+    with open(dump_path, "wb") as f:
+        f.write(header)
+        offset = len(header)
+        for section in sections:
+            if isinstance(section, array) and sys.byteorder == "big":
+                section = array(section.typecode, section)
+                section.byteswap()
+
+            padding = get_aligned_offset(offset) - offset
+            f.write(bytes(padding))
+            f.write(section)
+            offset += padding + len(memoryview(section).cast("B"))
+    f.close()
+
+class MappedSections:
+    """
+    Reads the sections written by dump_sections from a file mapped into memory, in order, without copies
+    """
+
+    def __init__(self, mapped_file, offset):
+        self.view = memoryview(mapped_file)
+        self.offset = offset
+
+    def get_section(self, typecode, length):
+        """
+        Returns the next section, length elements of typecode, or None if the section does not fit in the mapped file
+        """
+
+        self.offset = get_aligned_offset(self.offset)
+        num_bytes = length * array(typecode).itemsize
+        if length < 0 or self.offset + num_bytes > len(self.view):
+            return None
+        section = self.view[self.offset:self.offset + num_bytes]
+        self.offset += num_bytes
+
+        if typecode == "B":
+            return section
+        if sys.byteorder == "big":  # the file is little-endian, so the section is copied
+            section_array = array(typecode, section.tobytes())
+            section_array.byteswap()
+            return section_array
+        return section.cast(typecode)
+
+    def get_string_table(self, num_strings):
+        """
+        Returns the next string table of num_strings strings, or None if it does not fit in the mapped file
+        """
+
+        offsets = self.get_section(STRING_TABLE_OFFSET_TYPECODE, num_strings + 1)
+        if offsets == None:
+            return None
+
+        string_bytes = self.get_section("B", offsets[-1])
+        if string_bytes == None:
+            return None
+
+        return StringTable(offsets, string_bytes)
+
+def map_file(dump_path):
+    """
+    Maps the file at dump_path into memory read-only
+    """
+
+    with open(dump_path, "rb") as f:
+        mapped_file = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    f.close()
+    return mapped_file
+
+def is_binary_graph_file(graph_dump_path):
+    """
+    Returns whether the file at graph_dump_path is a binary graph file, as opposed to a pickle file
+    """
+
+    with open(graph_dump_path, "rb") as f:
+        magic = f.read(len(BINARY_GRAPH_MAGIC))
+    f.close()
+
+    return magic == BINARY_GRAPH_MAGIC
+
+def dump_binary_graph(compact_class_hierarchy_graph, binary_graph_dump_path):
+    """
+    Writes the compact class hierarchy graph to a binary graph file at binary_graph_dump_path, section by section
+    """
+
+    class_identifier_offsets, class_identifier_bytes = get_string_table_sections(compact_class_hierarchy_graph.class_identifiers)
+    source_path_offsets, source_path_bytes = get_string_table_sections(compact_class_hierarchy_graph.source_paths)
+
+    sections = [class_identifier_offsets, class_identifier_bytes, source_path_offsets, source_path_bytes,
+                array(CLASS_ID_TYPECODE, compact_class_hierarchy_graph.parent_offsets),
+                array(CLASS_ID_TYPECODE, compact_class_hierarchy_graph.parent_ids),
+                array(CLASS_ID_TYPECODE, compact_class_hierarchy_graph.source_path_ids)]
+
+    header = struct.pack(BINARY_GRAPH_HEADER_FORMAT, BINARY_GRAPH_MAGIC, BINARY_GRAPH_VERSION, array(CLASS_ID_TYPECODE).itemsize,
+                        compact_class_hierarchy_graph.num_classes, len(compact_class_hierarchy_graph.class_identifiers),
+                        compact_class_hierarchy_graph.get_num_edges(), len(compact_class_hierarchy_graph.source_paths))
+
+    dump_sections(binary_graph_dump_path, header, sections)
+
+def load_binary_graph(binary_graph_dump_path):
+    """
+    Maps the binary graph file at binary_graph_dump_path into memory \\
+    Returns the compact class hierarchy graph, with the edge arrays and string tables accessed in the mapped file without copies, \\
+    or None if the file is not a binary graph file of BINARY_GRAPH_VERSION or is truncated
+    """
+
+    header_size = struct.calcsize(BINARY_GRAPH_HEADER_FORMAT)
+    if os.path.getsize(binary_graph_dump_path) < header_size:
+        print(f"Error: {binary_graph_dump_path} is not a binary class hierarchy graph file")
+        return None
+
+    mapped_file = map_file(binary_graph_dump_path)
+
+    magic, version, class_id_size, num_classes, num_class_identifiers, num_edges, num_source_paths = \
+        struct.unpack_from(BINARY_GRAPH_HEADER_FORMAT, mapped_file)
+    if magic != BINARY_GRAPH_MAGIC:
+        print(f"Error: {binary_graph_dump_path} is not a binary class hierarchy graph file")
+        return None
+    if version != BINARY_GRAPH_VERSION or class_id_size != array(CLASS_ID_TYPECODE).itemsize:
+        print(f"Error: binary class hierarchy graph file version {version} with class id size {class_id_size} is not supported, "
+              f"expected version {BINARY_GRAPH_VERSION} with class id size {array(CLASS_ID_TYPECODE).itemsize}")
+        return None
+
+    # each section is checked against the size of the file, so that a truncated file is not read past its end
+    mapped_sections = MappedSections(mapped_file, header_size)
+    class_identifiers = mapped_sections.get_string_table(num_class_identifiers)
+    source_paths = mapped_sections.get_string_table(num_source_paths)
+    parent_offsets = mapped_sections.get_section(CLASS_ID_TYPECODE, num_classes + 1)
+    parent_ids = mapped_sections.get_section(CLASS_ID_TYPECODE, num_edges)
+    source_path_ids = mapped_sections.get_section(CLASS_ID_TYPECODE, num_classes)
+
+    sections = [class_identifiers, source_paths, parent_offsets, parent_ids, source_path_ids]
+    if any(section == None for section in sections) or num_classes > num_class_identifiers or \
+        parent_offsets[0] != 0 or parent_offsets[num_classes] != num_edges:
+        print(f"Error: {binary_graph_dump_path} is truncated or is not a valid binary class hierarchy graph file")
+        return None
+
+    compact_class_hierarchy_graph = CompactClassHierarchyGraph()
+    compact_class_hierarchy_graph.num_classes = num_classes
+
+    compact_class_hierarchy_graph.class_identifiers = class_identifiers
+    compact_class_hierarchy_graph.source_paths = source_paths
+
+    compact_class_hierarchy_graph.parent_offsets = parent_offsets
+    compact_class_hierarchy_graph.parent_ids = parent_ids
+    compact_class_hierarchy_graph.source_path_ids = source_path_ids
+
+    # class ids are only interned when the graph is built from a class hierarchy graph
+    compact_class_hierarchy_graph.class_ids = None
+
+    # keeps the mapped file open while the graph is in use
+    compact_class_hierarchy_graph.mapped_file = mapped_file
+
+    return compact_class_hierarchy_graph
+
+class LinearizationStatus(enum.Enum):
+    success = 0
+    error = success + 1
+    cycle_inconsistent = error + 1
+    source_logical_inconsistent = cycle_inconsistent + 1
+    inherited_logical_inconsistent = source_logical_inconsistent + 1
+
+# next node of the last node of a linearization
+NO_NODE = -1
+
+class LinearizationNodes:
+    """
+    Linearizations stored as linked lists of class ids that can share their tails \\
+    Node n holds the class id class_ids[n] and the next node next_nodes[n], or NO_NODE at the end of the linearization \\
+    A linearization that ends with the linearization of a parent class links to the nodes of that linearization \\
+    so only the class ids before it are stored
+    """
+
+    def __init__(self):
+        self.class_ids = array(CLASS_ID_TYPECODE)
+        self.next_nodes = array(CLASS_ID_TYPECODE)
+
+    def add_node(self, class_id, next_node):
+        """
+        Returns a new node with class_id followed by next_node
+        """
+
+        self.class_ids.append(class_id)
+        self.next_nodes.append(next_node)
+        return len(self.class_ids) - 1
+
+    def add_nodes(self, class_ids, next_node=NO_NODE):
+        """
+        Returns the first node of new nodes with class_ids, in order, followed by next_node \\
+        Returns next_node if class_ids is empty
+        """
+
+        for class_id in reversed(class_ids):
+            next_node = self.add_node(class_id, next_node)
+        return next_node
+
+    def get_num_nodes(self):
+        return len(self.class_ids)
+
+    def truncate(self, num_nodes):
+        """
+        Removes the nodes added after the first num_nodes nodes
+        """
+
+        del self.class_ids[num_nodes:]
+        del self.next_nodes[num_nodes:]
+
+    def get_class_ids(self, node):
+        """
+        Returns the list of class ids from node to the end of its linearization
+        """
+
+        class_ids = []
+        while node != NO_NODE:
+            class_ids.append(self.class_ids[node])
+            node = self.next_nodes[node]
+        return class_ids
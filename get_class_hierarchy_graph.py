@@ -1,10 +1,19 @@
 import ast
 import enum
+import functools
+import multiprocessing
 import os
 import pickle
 
 from ast_node_visitor.visitor_for_alias_info import VisitorForAliasInfo
 from ast_node_visitor.visitor_for_graph import VisitorForGraph
+from compact_class_hierarchy_graph import *
+from ignore_rules import *
+from import_dependency_index import *
+from module_path_index import *
+from parse_cache import *
+from python_script_reader import *
+from run_profiler import *
 
 from util import *
 
@@ -20,25 +29,35 @@ LOG_GRAPH_INFO = True
 
 PYTHON_SCRIPT_EXTENSION = ".py"
 
+JOBS_OPTION = "--jobs"
+NO_CACHE_OPTION = "--no-cache"
+CACHE_SIZE_OPTION = "--cache-size"
+SAVE_STATE_OPTION = "--save-state"
+INCREMENTAL_OPTION = "--incremental"
+CHANGED_PATHS_OPTION = "--changed-paths"
+CHANGED_PATHS_FILE_OPTION = "--changed-paths-file"
+GRAPH_FORMAT_OPTION = "--graph-format"
+SEARCH_PATH_OPTION = "--search-path"
+NO_PREFILTER_OPTION = "--no-prefilter"
+EXCLUDE_OPTION = "--exclude"
+INCLUDE_OPTION = "--include"
+GITIGNORE_OPTION = "--gitignore"
+READ_AHEAD_OPTION = "--read-ahead"
+
+# phases of a run recorded with PROFILE_OPTION, see RunProfiler
+GRAPH_PROFILE_RUN_TYPE = "graph"
+GRAPH_PROFILE_PHASES = ("parse_cache_load", "previous_graph_load", "scan", "parse", "last_alias_str_info", "graph", "graph_state", "parse_cache_dump", "dump")
+
+GRAPH_STATE_DUMP_SUFFIX = "_graph_state"
+GRAPH_STATE_VERSION = 1
+
+# number of Python files sent to a worker process at a time with --jobs
+PARSE_JOBS_CHUNKSIZE = 8
+
 class GetOp(enum.Enum):
     get_alias_info_op = 0
     get_graph_op = get_alias_info_op + 1
 
-def is_file_Python_script(filepath):
-    """
-    Given a path to a file \\
-    returns whether the file is a Python script
-    """
-
-    if not os.path.isfile(filepath):
-        return False
-
-    index_begin_dot_py = len(filepath) - len(PYTHON_SCRIPT_EXTENSION)
-    if filepath[index_begin_dot_py:] == PYTHON_SCRIPT_EXTENSION:
-        return True
-
-    return False
-
 def create_ast_dump_folder(source_code_path):
     """
     Assumes the source_code_path points to a Python script or directory \\
@@ -56,112 +75,251 @@ def create_ast_dump_folder(source_code_path):
 
     return ast_dump_folder_path
 
-def get_data_from_ast_parse(paths_dct,
-                            data_dct,
-                            dependencies_dct,
-                            get_op,
-                            ast_dump_info = None):
+def get_data_from_module_path_index(module_path_index, root_paths,
+                                    data_dct,
+                                    module_search_index = None):
     """
-    Fills in respective data in data_dct from ast parse of Python files within paths_dct["source_code_path"] \\
-    with corresponding paths from paths_dct and dependencies from dependencies_dct
+    Fills in the alias info data in data_dct from the files and folders of module_path_index, in scan order, \\
+    and the parsed Python scripts of data_dct["parsed_python_scripts"], which are yielded in the same order \\
+    root_paths are the roots of the module paths, see get_root_paths, and module_search_index is provided for a multi-root run
     """
 
-    ast_dump_folder_path = None
-    ast_dump_filename_prefix = None
-    at_root_directory = None
+    path_alias_info = data_dct["path_alias_info"]
+    module_paths = data_dct["module_paths"]
+    path_type = data_dct["path_type"]
+    module_parses = data_dct["module_parses"]
+    parsed_python_scripts = data_dct["parsed_python_scripts"]
+
+    for source_code_path, (name, module_path, source_path_type, package_module_paths) in module_path_index.entries.items():
+        # each file and folder within a folder is an entry in the alias info of the folder
+        if len(package_module_paths) > 0:
+            path_alias_info[package_module_paths[0]].append([(name, name, module_path, "module")])
+
+        if source_path_type == PathType.folder:
+            if LOG_FILE_PARSE:
+                print(f"{GetOp.get_alias_info_op}: Folder: {source_code_path}")
+
+            module_paths.append(module_path)
+            path_type[module_path] = PathType.folder
+            path_alias_info[module_path] = []
+        elif source_path_type == PathType.file:
+            if LOG_FILE_PARSE:
+                print(f"{GetOp.get_alias_info_op}: Python file: {source_code_path}")
+
+            parsed_python_script = next(parsed_python_scripts)
+            if parsed_python_script == None:
+                continue
+
+            module_parse, alias_info = parsed_python_script
+
+            # alias info of a multi-root run depends on the module paths of all roots, so it is not retrieved by worker processes
+            # or kept in the parse cache, see get_alias_info
+            if module_search_index != None:
+                codebase_parent_path, codebase_root_path = get_module_root_paths(root_paths, module_path)
+                alias_info = get_alias_info_from_module_parse(source_code_path, module_path, package_module_paths,
+                                                            codebase_parent_path, codebase_root_path,
+                                                            module_parse, module_search_index)
+
+            module_paths.append(module_path)
+            path_type[module_path] = PathType.file
+            path_alias_info[module_path] = alias_info
+
+            # keeps the parse so that the graph scan does not parse the file again
+            module_parses.append((source_code_path, module_path, module_parse))
+
+def read_and_parse_python_script(source_code_path, get_op, ast_dump_path = None, prefilter = False, python_script_bytes = None):
+    """
+    Reads and parses the Python script at source_code_path \\
+    The contents are read as bytes and decoded with the encoding of the Python script, see decode_python_script, \\
+    or are python_script_bytes if provided, e. g. read ahead by PythonScriptReader \\
+    Writes the ast parse to ast_dump_path if provided \\
+    If prefilter, a Python script without top-level statements kept by get_module_summary, see has_module_summary_statements, \\
+    is not parsed and has an empty ast.Module as its ast parse \\
+    Returns the ast parse or None if the Python script is empty or could not be read or parsed, and whether the parse was avoided
+    """
 
-    if ast_dump_info:
-        ast_dump_folder_path, ast_dump_filename_prefix, at_root_directory = ast_dump_info
+    ast_parse = None
+    is_parse_avoided = False
 
-    source_code_path = paths_dct["source_code_path"]
-    relative_import_path = paths_dct["relative_import_path"]
+    if python_script_bytes == None:
+        python_script_bytes = read_python_script(source_code_path)
 
-    if is_file_Python_script(source_code_path):
+    python_script_contents = None
+    try:
+        python_script_contents = decode_python_script(python_script_bytes)
+    except:
         if LOG_FILE_PARSE:
-            print(f"{get_op}: Python file: {source_code_path}")
-
-        python_script_contents = ""
-        with open(source_code_path) as file:
-            python_script_contents = None
+            print(f"{get_op}: Could not parse Python file {source_code_path}")
+
+    if python_script_contents and prefilter and not has_module_summary_statements(python_script_contents):
+        ast_parse = ast.Module(body=[], type_ignores=[])
+        is_parse_avoided = True
+    elif python_script_contents:
+        try:
+            ast_parse = ast.parse(python_script_contents)
+        except Exception as e:
+            print(f"{get_op}: Error with ast parse of {source_code_path}: {e}")
+
+        if ast_dump_path:
             try:
-                python_script_contents = file.read()
+                write_ast_parse_to_dump_file(ast_parse, ast_dump_path)
             except:
                 if LOG_FILE_PARSE:
-                    print(f"{get_op}: Could not parse Python file {source_code_path}")
+                    print(f"{get_op}: Could not write ast dump of Python file {source_code_path}")
 
-            if python_script_contents:
-                filename = get_name_directory_or_file(source_code_path)
-                ast_parse = None
+    return ast_parse, is_parse_avoided
 
-                try:
-                    ast_parse = ast.parse(python_script_contents)
-                except Exception as e:
-                    print(f"{get_op}: Error with ast parse of {source_code_path}: {e}")
+def get_alias_info_from_python_script(source_code_path, module_path, package_module_paths, codebase_parent_path, codebase_root_path,
+                                    keep_module_summaries,
+                                    ast_dump_path = None, prefilter = False, python_script_bytes = None):
+    """
+    Reads and parses the Python script at source_code_path, or python_script_bytes if provided, and gets its alias info \\
+    Returns the ast parse, or the module summary if keep_module_summaries, and the alias info \\
+    or None if the Python script could not be parsed \\
+    If codebase_root_path is None, the alias info is not retrieved and is returned as None \\
+    Also returns whether the parse was avoided by prefilter, see read_and_parse_python_script
 
-                try:
-                    if ast_parse != None:
-                        module_path = relative_import_path + filename
+    Only takes and returns picklable data so that it can be run in a worker process
+    """
 
-                        if get_op == GetOp.get_alias_info_op:
-                            data_dct["module_paths"].append(module_path)
-                            data_dct["path_type"][module_path] = PathType.file
+    ast_parse, is_parse_avoided = read_and_parse_python_script(source_code_path, GetOp.get_alias_info_op, ast_dump_path, prefilter,
+                                                                python_script_bytes)
+    if ast_parse == None:
+        return None, is_parse_avoided
+
+    module_parse = ast_parse
+    try:
+        if keep_module_summaries:
+            module_parse = get_module_summary(ast_parse)
+    except Exception as e:
+        print(f"{GetOp.get_alias_info_op}: Error with parse ast of {source_code_path}: {e}")
+        return (module_parse, []), is_parse_avoided
+
+    if codebase_root_path == None:
+        return (module_parse, None), is_parse_avoided
+
+    return (module_parse, get_alias_info_from_module_parse(source_code_path, module_path, package_module_paths,
+                                                         codebase_parent_path, codebase_root_path,
+                                                         module_parse)), is_parse_avoided
+
+def get_alias_info_from_module_parse(source_code_path, module_path, package_module_paths,
+                                    codebase_parent_path, codebase_root_path,
+                                    module_parse, module_search_index = None):
+    """
+    Returns the alias info of module_parse, the ast parse or module summary of the Python script at source_code_path \\
+    package_module_paths are the module paths of the folders that the Python script is in, see ModulePathIndex \\
+    If module_search_index is provided, non-relative imports are resolved against the roots of a multi-root run, see get_module_search_index
+    """
 
-                        parse_ast(source_code_path, module_path, paths_dct,
-                                    data_dct,
-                                    dependencies_dct,
-                                    get_op,
-                                    ast_parse)
-                except Exception as e:
-                    print(f"{get_op}: Error with parse ast of {source_code_path}: {e}")
-
-                if ast_dump_info:
-                    ast_dump_path = os.path.join(ast_dump_folder_path, ast_dump_filename_prefix + filename + "_ast_parse.txt")
-                    try:
-                        write_ast_parse_to_dump_file(ast_parse, ast_dump_path)
-                    except:
-                        if LOG_FILE_PARSE:
-                            print(f"{get_op}: Could not write ast dump of Python file {source_code_path}")
-        file.close()
+    paths_dct = {
+        "source_code_path": source_code_path,
+        "relative_import_path": None,
+        "package_module_paths": package_module_paths,
+        "codebase_parent_path": codebase_parent_path,
+        "codebase_root_path": codebase_root_path,
+        "module_search_index": module_search_index
+    }
+    data_dct = {
+        "path_alias_info": dict()
+    }
+    dependencies_dct = {}
 
-    elif os.path.isdir(source_code_path):
-        if LOG_FILE_PARSE:
-            print(f"{get_op}: Folder: {source_code_path}")
+    try:
+        parse_ast(source_code_path, module_path, paths_dct,
+                    data_dct,
+                    dependencies_dct,
+                    GetOp.get_alias_info_op,
+                    module_parse)
+    except Exception as e:
+        print(f"{GetOp.get_alias_info_op}: Error with parse ast of {source_code_path}: {e}")
 
-        directory_files = os.listdir(source_code_path)
+    return data_dct["path_alias_info"][module_path] if module_path in data_dct["path_alias_info"] else []
 
-        ast_dump_filename_prefix_update = ast_dump_filename_prefix
-        if ast_dump_info and not at_root_directory:
-            ast_dump_filename_prefix_update += get_name_directory_or_file(source_code_path) + "%"
-        updated_ast_dump_info = None
-        if ast_dump_info:
-            updated_ast_dump_info = (ast_dump_folder_path, ast_dump_filename_prefix_update, False)
+def get_alias_info_from_python_script_task(codebase_parent_path, codebase_root_path, keep_module_summaries, prefilter,
+                                        python_script_task, python_script_bytes = None):
+    """
+    Worker process entry point for get_alias_info_from_python_script \\
+    python_script_task is a source code path, module path, ast dump path, package module paths from get_python_script_tasks \\
+    python_script_bytes are the contents of the Python script if they were read ahead, see PythonScriptReader.map
+    """
 
-        relative_import_path_update_no_dot_at_end = None
-        if get_op == GetOp.get_alias_info_op:
-            relative_import_path_update_no_dot_at_end = relative_import_path + get_name_directory_or_file(source_code_path)
-            data_dct["module_paths"].append(relative_import_path_update_no_dot_at_end)
-            data_dct["path_type"][relative_import_path_update_no_dot_at_end] = PathType.folder
+    source_code_path, module_path, ast_dump_path, package_module_paths = python_script_task
+    return get_alias_info_from_python_script(source_code_path, module_path, package_module_paths, codebase_parent_path, codebase_root_path,
+                                            keep_module_summaries,
+                                            ast_dump_path, prefilter, python_script_bytes)
 
-            data_dct["path_alias_info"][relative_import_path_update_no_dot_at_end] = []
+def get_python_script_tasks(source_code_path, relative_import_path, ast_dump_info = None,
+                            module_path_index = None, package_module_paths = (),
+                            ignore_rules = None, is_file = None, is_folder = None):
+    """
+    Yields the source code path, module path, ast dump path (or None), and package module paths of each Python script within source_code_path \\
+    in scan order: a folder before its entries, which are in the order of os.scandir \\
+    package module paths are the module paths of the folders that the Python script is in, nearest first
 
-        for file in directory_files:
-            source_code_path_update = os.path.join(source_code_path, file)
-            paths_dct["source_code_path"] = source_code_path_update
+    If module_path_index is provided, each file and folder within source_code_path is added to it in scan order, see ModulePathIndex, \\
+    so that the directories are only listed once
 
-            if relative_import_path_update_no_dot_at_end != None:
-                paths_dct["relative_import_path"] = relative_import_path_update_no_dot_at_end + "."
-            else:
-                paths_dct["relative_import_path"] = relative_import_path + get_name_directory_or_file(source_code_path) + "."
+    If ignore_rules of the folder of source_code_path are provided, see IgnoreRules, the files and folders that they exclude \\
+    and the Python files that they do not include are skipped
 
-            if get_op == GetOp.get_alias_info_op:
-                filename = get_name_directory_or_file(source_code_path_update)
-                data_dct["path_alias_info"][relative_import_path_update_no_dot_at_end].append([(filename, filename, relative_import_path_update_no_dot_at_end + "." + filename, "module")])
+    is_file and is_folder are whether source_code_path is a file and a folder, from the file system if not provided \\
+    The entries of folders are listed with os.scandir, which has them without a stat of each entry on most file systems
+    """
 
-            get_data_from_ast_parse(paths_dct,
-                                    data_dct,
-                                    dependencies_dct,
-                                    get_op,
-                                    updated_ast_dump_info)
+    ast_dump_folder_path = None
+    ast_dump_filename_prefix = None
+    at_root_directory = None
+
+    if ast_dump_info:
+        ast_dump_folder_path, ast_dump_filename_prefix, at_root_directory = ast_dump_info
+
+    if is_file == None:
+        is_file = os.path.isfile(source_code_path)
+    if is_file and source_code_path.endswith(PYTHON_SCRIPT_EXTENSION):
+        filename = get_name_directory_or_file(source_code_path, True)
+        module_path = relative_import_path + filename
+        if module_path_index != None:
+            module_path_index.add(source_code_path, filename, module_path, PathType.file, package_module_paths)
+
+        ast_dump_path = None
+        if ast_dump_info:
+            ast_dump_path = os.path.join(ast_dump_folder_path, ast_dump_filename_prefix + filename + "_ast_parse.txt")
+
+        yield source_code_path, module_path, ast_dump_path, package_module_paths
+    elif not is_file and (is_folder if is_folder != None else os.path.isdir(source_code_path)):
+        folder_name = get_name_directory_or_file(source_code_path, False)
+        module_path = relative_import_path + folder_name
+        if module_path_index != None:
+            module_path_index.add(source_code_path, folder_name, module_path, PathType.folder, package_module_paths)
+
+        updated_ast_dump_info = None
+        if ast_dump_info:
+            ast_dump_filename_prefix_update = ast_dump_filename_prefix
+            if not at_root_directory:
+                ast_dump_filename_prefix_update += folder_name + "%"
+            updated_ast_dump_info = (ast_dump_folder_path, ast_dump_filename_prefix_update, False)
+
+        relative_import_path_update = module_path + "."
+        folder_package_module_paths = (module_path,) + package_module_paths
+        folder_ignore_rules = ignore_rules.get_folder_ignore_rules(source_code_path) if ignore_rules != None else None
+        with os.scandir(source_code_path) as entries:
+            for entry in entries:
+                entry_is_file = entry.is_file()
+                entry_is_folder = not entry_is_file and entry.is_dir()
+
+                if folder_ignore_rules != None:
+                    if folder_ignore_rules.is_excluded(entry.path, entry_is_folder):
+                        continue
+                    if entry_is_file and entry.name.endswith(PYTHON_SCRIPT_EXTENSION) and not folder_ignore_rules.is_included(entry.path):
+                        continue
+
+                yield from get_python_script_tasks(entry.path, relative_import_path_update, updated_ast_dump_info,
+                                                module_path_index, folder_package_module_paths,
+                                                folder_ignore_rules, entry_is_file, entry_is_folder)
+    elif module_path_index != None and len(package_module_paths) > 0:
+        # other files are entries in the alias info of their folder
+        name = get_name_directory_or_file(source_code_path, is_file)
+        module_path_index.add(source_code_path, name, relative_import_path + name, None, package_module_paths)
 
 def parse_ast(source_code_path, module_path, paths_dct,
             data_dct,
@@ -183,7 +341,8 @@ def parse_ast(source_code_path, module_path, paths_dct,
         alias_info = path_alias_info[module_path]
 
         visitor = VisitorForAliasInfo(source_code_path, module_path, codebase_parent_path, codebase_root_path,
-                                    alias_info)
+                                    alias_info,
+                                    paths_dct["module_search_index"], paths_dct["package_module_paths"])
     elif get_op == GetOp.get_graph_op:
         codebase_parent_path = paths_dct["codebase_parent_path"]
         codebase_root_path = paths_dct["codebase_root_path"]
@@ -197,47 +356,302 @@ def parse_ast(source_code_path, module_path, paths_dct,
         visitor = VisitorForGraph(source_code_path, module_path, codebase_parent_path, codebase_root_path,
                                 class_hierarchy_graph, alias_name_path_resolved_path,
                                 path_last_alias_str_info, path_type,
-                                LOG_AST_PARSE_DATA)
+                                LOG_AST_PARSE_DATA,
+                                paths_dct["module_search_index"], paths_dct["package_module_paths"])
 
     visitor.visit(ast_parse)
 
-def get_alias_info(source_code_path, codebase_parent_path, codebase_root_path,
-                path_alias_info, module_paths, path_type):
+def get_root_paths(codebase_parent_path, codebase_root_path, search_paths = None):
     """
-    Populates path_alias_info by ast parse \\
-    Adds to module_paths and path_type
+    Returns dict with key: name of root, value: codebase parent path, codebase root path of root \\
+    of codebase_root_path followed by the roots in search_paths, in search order
+    """
+
+    root_paths = dict()
+    root_paths[get_name_directory_or_file(codebase_root_path)] = (codebase_parent_path, codebase_root_path)
+    if search_paths != None:
+        for search_path in search_paths:
+            root_paths[get_name_directory_or_file(search_path)] = (get_parent_path(search_path), search_path)
+
+    return root_paths
+
+def get_module_root_paths(root_paths, module_path):
+    """
+    Returns the codebase parent path and codebase root path of the root in root_paths that module_path is in
+    """
+
+    if len(root_paths) == 1:
+        return next(iter(root_paths.values()))
+
+    return root_paths[module_path.split(".")[0]]
+
+def get_module_search_index(module_path_index):
+    """
+    Returns the module search index of a multi-root run from module_path_index of its roots, see get_roots_python_script_tasks \\
+    key: module path in dot notation relative to a root, value: name of the first root in search order with the module path
+
+    Non-relative imports are resolved against the root of the longest prefix of the imported module in the index, \\
+    see get_path_of_node_module, so packages that are split across roots resolve to the root of each of their modules
+    """
+
+    module_search_index = dict()
+
+    for _, module_path, path_type, package_module_paths in module_path_index.entries.values():
+        if path_type != PathType.file or len(package_module_paths) == 0:
+            continue
+
+        # module path without the name of the root, and the folders it is in
+        root_name = package_module_paths[-1]
+        relative_module_path = module_path[len(root_name) + 1:]
+        while relative_module_path != "":
+            if relative_module_path not in module_search_index:
+                module_search_index[relative_module_path] = root_name
+
+            dot_index = relative_module_path.rfind(".")
+            relative_module_path = relative_module_path[:dot_index] if dot_index != -1 else ""
+
+    return module_search_index
+
+def get_roots_python_script_tasks(root_paths, ast_dump_info, module_path_index, ignore_rules = None):
+    """
+    Returns the tasks of the Python scripts of the roots in root_paths, from get_root_paths, in search order, see get_python_script_tasks, \\
+    and adds the files and folders of the roots to module_path_index \\
+    ast_dump_info is for the first root, the other roots have their own ast dump folder \\
+    If ignore_rules are provided, their patterns apply to each root, see IgnoreRules
+    """
+
+    python_script_tasks = []
+    for i, (_, codebase_root_path) in enumerate(root_paths.values()):
+        root_ast_dump_info = ast_dump_info
+        if ast_dump_info and i > 0:
+            root_ast_dump_info = (create_ast_dump_folder(codebase_root_path), "", True)
+
+        root_ignore_rules = None
+        if ignore_rules != None and ignore_rules.has_rules():
+            root_ignore_rules = ignore_rules.for_root(codebase_root_path)
+
+        python_script_tasks.extend(get_python_script_tasks(codebase_root_path, "", root_ast_dump_info, module_path_index, (),
+                                                        root_ignore_rules))
+
+    return python_script_tasks
+
+def get_alias_info(root_paths, module_path_index, python_script_tasks,
+                path_alias_info, module_paths, path_type,
+                module_parses, keep_module_summaries,
+                jobs = 1, parse_cache = None,
+                previous_parsed_python_scripts = None, module_search_index = None, prefilter_info = None,
+                python_script_reader = None):
+    """
+    Populates path_alias_info by ast parse of the Python files in python_script_tasks of the roots in root_paths, \\
+    with the files and folders of module_path_index, see get_roots_python_script_tasks \\
+    Adds to module_paths and path_type \\
+    Adds (source code path, module path, ast parse) of each parsed Python file to module_parses \\
+    If keep_module_summaries, the ast parse kept is the module summary from get_module_summary
+
+    If module_search_index of a multi-root run is provided, see get_module_search_index, the alias info of each Python file \\
+    is retrieved from its module summary in this process, so that the parsed Python scripts of worker processes \\
+    and parse_cache do not depend on the module paths of other Python files
+
+    If jobs > 1, Python files are read, parsed, and have their alias info retrieved by a pool of jobs worker processes \\
+    and the results are merged in the same order as a serial scan
+
+    If parse_cache is provided, Python files with a valid entry in parse_cache are not parsed \\
+    and the module summaries of the other Python files are added to parse_cache
+
+    If previous_parsed_python_scripts is provided, Python files in it are not parsed, see get_parsed_python_scripts
+
+    If prefilter_info is provided, Python files without top-level statements kept by get_module_summary are not parsed, \\
+    see has_module_summary_statements, and the numbers of Python files read and of parses avoided are added to prefilter_info
+
+    If python_script_reader is provided, see PythonScriptReader, the Python files are read ahead by its threads \\
+    while this process parses them or looks them up in parse_cache, unless jobs > 1 where the worker processes read them
     """
 
-    paths_dct = {
-        "source_code_path": source_code_path,
-        "relative_import_path": "",
-        "codebase_parent_path": codebase_parent_path,
-        "codebase_root_path": codebase_root_path
-    }
     data_dct = {
         "path_alias_info": path_alias_info,
         "module_paths": module_paths,
-        "path_type": path_type
+        "path_type": path_type,
+        "module_parses": module_parses,
+        "parsed_python_scripts": None
     }
-    dependencies_dct = {}
-    get_data_from_ast_parse(paths_dct,
-                            data_dct,
-                            dependencies_dct,
-                            GetOp.get_alias_info_op)
 
-def get_graph(source_code_path, codebase_parent_path, codebase_root_path,
+    # parse cache entries are module summaries, as are the parses that alias info is retrieved from in a multi-root run
+    keep_module_summaries = keep_module_summaries or parse_cache != None or module_search_index != None
+
+    codebase_parent_path, codebase_root_path = None, None
+    if module_search_index == None:
+        codebase_parent_path, codebase_root_path = next(iter(root_paths.values()))
+    get_alias_info_from_task = functools.partial(get_alias_info_from_python_script_task,
+                                                codebase_parent_path, codebase_root_path, keep_module_summaries, prefilter_info != None)
+
+    # parse cache entries are valid for the same search order of roots
+    parse_cache_root_path = os.pathsep.join(codebase_root_path for _, codebase_root_path in root_paths.values())
+
+    if jobs <= 1:
+        map_function = python_script_reader.map if python_script_reader != None else map
+        data_dct["parsed_python_scripts"] = get_parsed_python_scripts(python_script_tasks, get_alias_info_from_task, map_function,
+                                                                    parse_cache_root_path, parse_cache, previous_parsed_python_scripts,
+                                                                    prefilter_info)
+        get_data_from_module_path_index(module_path_index, root_paths,
+                                        data_dct,
+                                        module_search_index)
+        return
+
+    with multiprocessing.Pool(jobs) as pool:
+        # imap returns results in task order
+        pool_imap = functools.partial(pool.imap, chunksize=PARSE_JOBS_CHUNKSIZE)
+        data_dct["parsed_python_scripts"] = get_parsed_python_scripts(python_script_tasks, get_alias_info_from_task, pool_imap,
+                                                                    parse_cache_root_path, parse_cache, previous_parsed_python_scripts,
+                                                                    prefilter_info)
+        get_data_from_module_path_index(module_path_index, root_paths,
+                                        data_dct,
+                                        module_search_index)
+
+def get_parsed_python_scripts(python_script_tasks, get_alias_info_from_task, map_function,
+                            codebase_root_path, parse_cache, previous_parsed_python_scripts = None, prefilter_info = None):
+    """
+    Yields the parsed Python script, (ast parse, alias info) or None, of each task from python_script_tasks in task order \\
+    Python scripts are parsed with map_function, e. g. map, Pool.imap, or PythonScriptReader.map, which must return results in task order
+
+    If parse_cache is provided, Python scripts with a valid entry are loaded from parse_cache instead of being parsed \\
+    and the other Python scripts are added to parse_cache \\
+    parse_cache entries are kept for codebase_root_path, the root paths separated by os.pathsep for a multi-root run \\
+    Each Python script is read once, by map_function, for its content hash and for its parse if its entry is not valid, \\
+    see get_parsed_python_script_of_lookup_task
+
+    If previous_parsed_python_scripts is provided, Python scripts in it with the same module path are not parsed \\
+    key: source code path, value: module path, parsed Python script
+
+    If prefilter_info is provided, the numbers of Python scripts read and of parses avoided are added to it, see get_alias_info
+    """
+
+    if parse_cache == None and previous_parsed_python_scripts == None:
+        for parsed_python_script, _ in map_python_script_tasks(python_script_tasks, get_alias_info_from_task, map_function, prefilter_info):
+            yield parsed_python_script
+        return
+
+    # task, parsed Python script from previous_parsed_python_scripts or None if the Python script is looked up in parse_cache or parsed
+    # looked up ahead so that only the other Python scripts are sent to map_function
+    python_script_lookups = []
+    for python_script_task in python_script_tasks:
+        source_code_path, module_path, _, _ = python_script_task
+
+        if previous_parsed_python_scripts != None and source_code_path in previous_parsed_python_scripts:
+            previous_module_path, previous_parsed_python_script = previous_parsed_python_scripts[source_code_path]
+            if previous_module_path == module_path:
+                python_script_lookups.append((python_script_task, previous_parsed_python_script))
+                continue
+
+        python_script_lookups.append((python_script_task, None))
+
+    unparsed_python_script_tasks = [python_script_task for python_script_task, previous_parsed_python_script in python_script_lookups
+                                    if previous_parsed_python_script == None]
+
+    if parse_cache == None:
+        parsed_python_scripts = map_python_script_tasks(unparsed_python_script_tasks, get_alias_info_from_task, map_function, prefilter_info)
+        for _, previous_parsed_python_script in python_script_lookups:
+            if previous_parsed_python_script != None:
+                yield previous_parsed_python_script
+                continue
+
+            parsed_python_script, _ = next(parsed_python_scripts)
+            yield parsed_python_script
+        return
+
+    # the content hash of the entry in parse_cache is sent with each task, so that the Python script is parsed only if its contents changed
+    python_script_lookup_tasks = [python_script_task + (parse_cache.get_entry_content_hash(python_script_task[0], python_script_task[1], codebase_root_path),)
+                                  for python_script_task in unparsed_python_script_tasks]
+    get_parsed_python_script_of_lookup = functools.partial(get_parsed_python_script_of_lookup_task, get_alias_info_from_task)
+    parsed_python_script_lookups = map_function(get_parsed_python_script_of_lookup, python_script_lookup_tasks)
+
+    for python_script_task, previous_parsed_python_script in python_script_lookups:
+        source_code_path, module_path, _, _ = python_script_task
+
+        if previous_parsed_python_script != None:
+            yield previous_parsed_python_script
+            continue
+
+        content_hash, parse_info = next(parsed_python_script_lookups)
+        if parse_cache.get(source_code_path, module_path, codebase_root_path, content_hash):
+            yield parse_cache.load_parsed_python_script(source_code_path)
+            continue
+
+        parsed_python_script, is_parse_avoided = parse_info
+        add_prefilter_info(prefilter_info, is_parse_avoided)
+
+        # Python scripts that could not be parsed are not cached so that their errors are output again
+        # and Python scripts that were not parsed are not cached so that a run with --no-prefilter parses them
+        if parsed_python_script != None and not is_parse_avoided:
+            parse_cache.put(source_code_path, module_path, codebase_root_path, content_hash, parsed_python_script)
+        yield parsed_python_script
+
+def get_parsed_python_script_of_lookup_task(get_alias_info_from_task, python_script_lookup_task, python_script_bytes = None):
+    """
+    Worker process entry point of a Python script looked up in the parse cache, see get_parsed_python_scripts \\
+    python_script_lookup_task is a task from get_python_script_tasks followed by the content hash of its entry in the parse cache, or None \\
+    python_script_bytes are the contents of the Python script if they were read ahead, see PythonScriptReader.map, and are read here otherwise
+
+    Returns the content hash of the contents, see get_content_hash, or None if the Python script could not be read, \\
+    and None if the content hash is that of the entry, or the parsed Python script and whether its parse was avoided, see get_alias_info_from_python_script \\
+    The parsed Python script is of the contents of the content hash, so that a Python script changed during the run is not cached with another content hash
+    """
+
+    python_script_task, entry_content_hash = python_script_lookup_task[:-1], python_script_lookup_task[-1]
+
+    if python_script_bytes == None:
+        try:
+            python_script_bytes = read_python_script(python_script_task[0])
+        except OSError:
+            python_script_bytes = None
+
+    content_hash = get_content_hash(python_script_task[0], python_script_bytes) if python_script_bytes != None else None
+    if content_hash != None and content_hash == entry_content_hash:
+        return content_hash, None
+
+    return content_hash, get_alias_info_from_task(python_script_task, python_script_bytes)
+
+def map_python_script_tasks(python_script_tasks, get_alias_info_from_task, map_function, prefilter_info = None):
+    """
+    Yields the parsed Python script of each task from python_script_tasks, parsed with map_function in task order, \\
+    and whether its parse was avoided, see get_alias_info_from_python_script \\
+    If prefilter_info is provided, the numbers of Python scripts read and of parses avoided are added to it
+    """
+
+    for parsed_python_script, is_parse_avoided in map_function(get_alias_info_from_task, python_script_tasks):
+        add_prefilter_info(prefilter_info, is_parse_avoided)
+        yield parsed_python_script, is_parse_avoided
+
+def add_prefilter_info(prefilter_info, is_parse_avoided):
+    """
+    Adds a Python script read, and a parse avoided if is_parse_avoided, to prefilter_info if it is provided
+    """
+
+    if prefilter_info != None:
+        prefilter_info["num_python_scripts_read"] += 1
+        if is_parse_avoided:
+            prefilter_info["num_parses_avoided"] += 1
+
+def get_graph(module_parses, root_paths, module_path_index,
             class_hierarchy_graph, alias_name_path_resolved_path,
             path_last_alias_str_info, path_type,
-            ast_dump_info):
+            previous_class_hierarchy_graph = None, paths_to_resolve = None, module_search_index = None):
     """
-    Populates class_hierarchy_graph from ast parse and dependencies
+    Populates class_hierarchy_graph from the ast parses in module_parses, kept from the alias info scan, and dependencies \\
+    Files are not read or parsed again \\
+    root_paths are the roots of the module paths, see get_root_paths, with files and folders in module_path_index, \\
+    and module_search_index is provided for a multi-root run
+
+    If previous_class_hierarchy_graph is provided, only the bases of classes from module paths in paths_to_resolve are resolved \\
+    and the entries of classes from the other module paths are taken from previous_class_hierarchy_graph
     """
 
     paths_dct = {
-        "source_code_path": source_code_path,
-        "relative_import_path": "",
-        "codebase_parent_path": codebase_parent_path,
-        "codebase_root_path": codebase_root_path
+        "source_code_path": None,
+        "relative_import_path": None,
+        "package_module_paths": None,
+        "codebase_parent_path": None,
+        "codebase_root_path": None,
+        "module_search_index": module_search_index
     }
     data_dct = {
         "class_hierarchy_graph": class_hierarchy_graph,
@@ -247,11 +661,162 @@ def get_graph(source_code_path, codebase_parent_path, codebase_root_path,
         "path_last_alias_str_info": path_last_alias_str_info,
         "path_type": path_type
     }
-    get_data_from_ast_parse(paths_dct,
-                            data_dct,
-                            dependencies_dct,
-                            GetOp.get_graph_op,
-                            ast_dump_info)
+
+    # key: source code path, value: identifiers of classes from source code path in previous_class_hierarchy_graph
+    previous_source_class_identifiers = dict()
+    if previous_class_hierarchy_graph != None:
+        for class_identifier, (_, class_source_code_path) in previous_class_hierarchy_graph.items():
+            if class_source_code_path not in previous_source_class_identifiers:
+                previous_source_class_identifiers[class_source_code_path] = []
+            previous_source_class_identifiers[class_source_code_path].append(class_identifier)
+
+    for source_code_path, module_path, module_parse in module_parses:
+        if previous_class_hierarchy_graph != None and module_path not in paths_to_resolve:
+            if source_code_path in previous_source_class_identifiers:
+                for class_identifier in previous_source_class_identifiers[source_code_path]:
+                    if class_identifier not in class_hierarchy_graph:
+                        class_hierarchy_graph[class_identifier] = previous_class_hierarchy_graph[class_identifier]
+            continue
+
+        if LOG_FILE_PARSE:
+            print(f"{GetOp.get_graph_op}: Python file: {source_code_path}")
+
+        paths_dct["source_code_path"] = source_code_path
+        paths_dct["package_module_paths"] = module_path_index.get_package_module_paths(source_code_path)
+        paths_dct["codebase_parent_path"], paths_dct["codebase_root_path"] = get_module_root_paths(root_paths, module_path)
+        try:
+            parse_ast(source_code_path, module_path, paths_dct,
+                        data_dct,
+                        dependencies_dct,
+                        GetOp.get_graph_op,
+                        module_parse)
+        except Exception as e:
+            print(f"{GetOp.get_graph_op}: Error with parse ast of {source_code_path}: {e}")
+
+def build_class_hierarchy_graph(source_code_path, codebase_parent_path, codebase_root_path,
+                                keep_module_summaries, ast_dump_info, jobs, parse_cache,
+                                save_graph_state,
+                                graph_state = None, previous_class_hierarchy_graph = None, previous_import_dependency_index = None, changed_paths = None,
+                                search_paths = None, prefilter_info = None, ignore_rules = None, python_script_reader = None,
+                                run_profiler = None):
+    """
+    Scans the Python files in source_code_path for alias info and builds the class hierarchy graph from it \\
+    Returns the class hierarchy graph, the import dependency index, and the graph state for --incremental (None unless save_graph_state)
+
+    If search_paths are provided, the Python files in them are also scanned into the same class hierarchy graph, see --search-path, \\
+    and non-relative imports are resolved against source_code_path followed by search_paths like sys.path, see get_module_search_index
+
+    If graph_state is provided, the class hierarchy graph of the run that produced graph_state, previous_class_hierarchy_graph, \\
+    is updated with changed_paths: only the Python files in changed_paths are parsed \\
+    and only the module paths that depend on them are resolved again, see --incremental
+
+    If prefilter_info is provided, Python files without top-level statements kept by get_module_summary are not parsed, \\
+    see get_alias_info
+
+    If ignore_rules are provided, the files and folders that they exclude are not scanned, see IgnoreRules
+
+    If python_script_reader is provided, the Python files are read ahead of their parse, see PythonScriptReader
+
+    If run_profiler is provided, the steps of the build are recorded as its phases, see GRAPH_PROFILE_PHASES
+    """
+
+    incremental = graph_state != None
+
+    root_paths = get_root_paths(codebase_parent_path, codebase_root_path, search_paths)
+
+    with profile_phase(run_profiler, "scan"):
+        # files and folders of the roots, listed once for the alias info scan, the class hierarchy graph, and the resolution of imports
+        module_path_index = ModulePathIndex()
+        python_script_tasks = get_roots_python_script_tasks(root_paths, ast_dump_info, module_path_index, ignore_rules)
+
+        module_search_index = None
+        if search_paths:
+            module_search_index = get_module_search_index(module_path_index)
+
+    # key: module_path, value: list of list of the following entry
+        # alias_str, alias_name, path with alias_name, node
+        # or
+        # "del", alias_str
+    path_alias_info = dict()
+
+    # first scan gets the module paths in dot notation and path_type
+    # since scan is recursive, shorter subsequence paths are before longer ones
+    module_paths = []
+
+    # key: path in dot notation, value: PathType
+    path_type = dict()
+
+    # list of source code path, module path, ast parse (or module summary) of each parsed Python file
+    # in scan order, reused for the class hierarchy graph so that each file is parsed once
+    module_parses = []
+
+    unchanged_parsed_python_scripts = None
+    if incremental:
+        unchanged_parsed_python_scripts = get_unchanged_parsed_python_scripts(graph_state, changed_paths)
+
+    with profile_phase(run_profiler, "parse"):
+        get_alias_info(root_paths, module_path_index, python_script_tasks,
+                    path_alias_info, module_paths, path_type,
+                    module_parses, keep_module_summaries,
+                    jobs, parse_cache,
+                    unchanged_parsed_python_scripts, module_search_index, prefilter_info,
+                    python_script_reader)
+
+    with profile_phase(run_profiler, "last_alias_str_info"):
+        # built before the update of wildcard imports replaces the alias entries of wildcard imports
+        import_dependency_index = ImportDependencyIndex()
+        import_dependency_index.add_path_alias_info(path_alias_info)
+
+        # copy of path_alias_info from before the update of wildcard imports
+        scanned_path_alias_info = None
+        if save_graph_state:
+            scanned_path_alias_info = dict()
+            for path, alias_info in path_alias_info.items():
+                scanned_path_alias_info[path] = list(alias_info)
+
+        path_last_alias_str_info = None
+        paths_to_resolve = None
+        if incremental:
+            changed_module_paths = get_changed_module_paths(changed_paths, root_paths,
+                                                            scanned_path_alias_info, path_type, graph_state)
+
+            # imports from the previous run are kept for paths that no longer import a changed path
+            dependency_index = ImportDependencyIndex()
+            dependency_index.update(import_dependency_index)
+            dependency_index.update(previous_import_dependency_index)
+
+            # last alias str info of a path changes with the paths it imports with wildcard imports
+            # resolved bases of classes in a path change with the last alias str info of paths in its alias chains
+            paths_to_update = dependency_index.get_dependents(changed_module_paths, True)
+            paths_to_resolve = dependency_index.get_dependents(paths_to_update)
+            print(f"number of module paths to update: {len(paths_to_update)}, number of module paths to resolve: {len(paths_to_resolve)}")
+
+            path_last_alias_str_info = get_path_last_alias_str_info(path_alias_info, path_type,
+                                                                    graph_state["path_last_alias_str_info"], paths_to_update)
+        else:
+            # key: module_path, value:
+                # key: alias_str, value: alias_name, path with alias_name, node
+            path_last_alias_str_info = get_path_last_alias_str_info(path_alias_info, path_type)
+
+    # key: class identifier, value: list of identifiers of inherited classes, module path of class
+    class_hierarchy_graph = dict()
+
+    # key: (alias_name, path), value: resolved path of alias_name
+    # for memoization of the resolved path of an alias name in path
+    alias_name_path_resolved_path = dict()
+
+    with profile_phase(run_profiler, "graph"):
+        get_graph(module_parses, root_paths, module_path_index,
+                class_hierarchy_graph, alias_name_path_resolved_path,
+                path_last_alias_str_info, path_type,
+                previous_class_hierarchy_graph, paths_to_resolve, module_search_index)
+
+    graph_state = None
+    if save_graph_state:
+        with profile_phase(run_profiler, "graph_state"):
+            graph_state = get_graph_state(path_type, scanned_path_alias_info, module_parses, path_last_alias_str_info, codebase_root_path, search_paths)
+
+    return class_hierarchy_graph, import_dependency_index, graph_state
 
 def write_ast_parse_to_dump_file(ast_parse, ast_dump_path):
     """
@@ -273,8 +838,7 @@ def dump_graph(class_hierarchy_graph, pickle_dump_folder, pickle_dump_filename):
     Dumps the class hierarchy graph to pickle file at folder_for_dump\\pickle_dump_filename
     """
 
-    if not os.path.exists(pickle_dump_folder):
-        os.mkdir(pickle_dump_folder)
+    create_dump_folder(pickle_dump_folder)
 
     filename_for_pickle_dump = os.path.join(pickle_dump_folder, pickle_dump_filename)
     with open(filename_for_pickle_dump, "wb") as f:
@@ -287,7 +851,27 @@ def usage_info():
     """
 
     print("Usage:")
-    print("python get_class_hierarchy_graph.py [path to Python source code]")
+    print("python get_class_hierarchy_graph.py [path to Python source code] [options]")
+    print()
+    print("Options:")
+    print(f"{JOBS_OPTION} N: read and parse Python files with N worker processes")
+    print(f"{NO_CACHE_OPTION}: do not use or update the parse cache in {FOLDER_WITH_PARSE_CACHES}")
+    print(f"{CACHE_SIZE_OPTION} MB: maximum size of the parse cache, default {DEFAULT_PARSE_CACHE_MAX_SIZE_MB}")
+    print(f"{SAVE_STATE_OPTION}: dump the alias state of the run to {FOLDER_WITH_CLASS_HIERARCHY_GRAPHS} for later {INCREMENTAL_OPTION} runs")
+    print(f"{INCREMENTAL_OPTION}: update the class hierarchy graph of a previous {SAVE_STATE_OPTION} run with the changed paths from")
+    print(f"    {CHANGED_PATHS_OPTION} <path>,<path>,... and/or {CHANGED_PATHS_FILE_OPTION} <file with one path per line, - for stdin>")
+    print(f"{GRAPH_FORMAT_OPTION} {'|'.join(GRAPH_FORMATS)}: format of the class hierarchy graph file, default {GRAPH_FORMAT_PICKLE}")
+    print(f"    {GRAPH_FORMAT_BINARY} writes a versioned binary graph file ({BINARY_GRAPH_EXTENSION}) that the checker maps into memory")
+    print(f"{SEARCH_PATH_OPTION} <folder>{os.pathsep}<folder>{os.pathsep}...: also scan these folders into the same class hierarchy graph")
+    print(f"    and resolve non-relative imports against the folder of the path to Python source code followed by these folders, like sys.path")
+    print(f"{NO_PREFILTER_OPTION}: parse every Python file, also those without top-level import, class, def, del, or assignment statements")
+    print(f"{EXCLUDE_OPTION} <pattern>,<pattern>,...: do not scan the files and folders that match these .gitignore-style patterns")
+    print(f"{INCLUDE_OPTION} <pattern>,<pattern>,...: only scan the Python files that match these .gitignore-style patterns")
+    print(f"{GITIGNORE_OPTION}: do not scan .git folders and the files and folders ignored by the .gitignore files of the scanned folders")
+    print(f"{READ_AHEAD_OPTION} N: maximum number of Python files read ahead of their parse by {READ_AHEAD_THREADS} threads, default {DEFAULT_READ_AHEAD}")
+    print(f"{PROFILE_OPTION}: write the wall time, CPU time, and peak memory of each phase and the calls of the alias resolution functions")
+    print(f"    to {FOLDER_WITH_PROFILES}/<name>_{GRAPH_PROFILE_RUN_TYPE}{PROFILE_DUMP_SUFFIX}.json, phases: {', '.join(GRAPH_PROFILE_PHASES)}")
+    print(f"{CPROFILE_PHASE_OPTION} <phase>: also profile the phase with cProfile and write its pstats next to the {PROFILE_OPTION} report")
     print()
     print("Example:")
     print(f"python get_class_hierarchy_graph.py sample_script.py (sample_script.py is relative to {sys.argv[0]})")
@@ -295,15 +879,104 @@ def usage_info():
     print("python get_class_hierarchy_graph.py \"<full path to sample_script.py>\"")
     print("python get_class_hierarchy_graph.py <relative path to source_code_folder>")
     print("python get_class_hierarchy_graph.py \"<full path to source_code_folder>\"")
+    print(f"git diff --name-only | python get_class_hierarchy_graph.py <relative path to source_code_folder> {INCREMENTAL_OPTION} {CHANGED_PATHS_FILE_OPTION} -")
+    print(f"python get_class_hierarchy_graph.py vendor/a {SEARCH_PATH_OPTION} vendor/b{os.pathsep}vendor/c")
+    print(f"python get_class_hierarchy_graph.py <relative path to source_code_folder> {GITIGNORE_OPTION} {EXCLUDE_OPTION} node_modules/,tests/")
+
+def get_positive_int_option(option, default):
+    """
+    Gets the value of a command line option that expects a positive integer, e. g. --jobs 4 \\
+    Returns default if the option is not provided, the value if it is a positive integer \\
+    Otherwise, returns None
+    """
 
-def get_path_last_alias_str_info(path_alias_info, path_type):
+    value_str = get_option_value(option, str(default))
+
+    try:
+        value = int(value_str)
+        if value > 0:
+            return value
+    except ValueError:
+        pass
+
+    print(f"Error: {option} expects a positive integer, got {value_str}")
+    usage_info()
+    return None
+
+def get_graph_format_option():
+    """
+    Gets the value of the graph format option, e. g. --graph-format binary \\
+    Returns GRAPH_FORMAT_PICKLE if the option is not provided, the value if it is a graph format \\
+    Otherwise, returns None
+    """
+
+    graph_format = get_option_value(GRAPH_FORMAT_OPTION, GRAPH_FORMAT_PICKLE)
+    if graph_format in GRAPH_FORMATS:
+        return graph_format
+
+    print(f"Error: {GRAPH_FORMAT_OPTION} expects one of {', '.join(GRAPH_FORMATS)}, got {graph_format}")
+    usage_info()
+    return None
+
+def get_search_paths(source_code_path):
+    """
+    Gets the real paths of the roots from the --search-path option, separated by os.pathsep like PYTHONPATH, e. g. --search-path vendor/a:vendor/b \\
+    Returns [] if the option is not provided, the paths if source_code_path and the paths are folders with distinct names without dots \\
+    Otherwise, returns None
+    """
+
+    search_paths_str = get_option_value(SEARCH_PATH_OPTION)
+    if search_paths_str == None:
+        return []
+
+    search_paths = []
+
+    # key: name of root, value: path of root
+    root_name_paths = { get_name_directory_or_file(source_code_path): source_code_path }
+    for search_path in [source_code_path] + search_paths_str.split(os.pathsep):
+        search_path = search_path.strip()
+        if search_path == "":
+            continue
+
+        if not os.path.isdir(search_path):
+            print(f"Error: {SEARCH_PATH_OPTION} expects folders and the path to Python source code to be a folder, got {search_path}")
+            usage_info()
+            return None
+
+        search_path = os.path.realpath(search_path)
+        root_name = get_name_directory_or_file(search_path)
+        if "." in root_name:
+            print(f"Error: name of root {search_path} has a dot, so it cannot be in a module path")
+            return None
+
+        if search_path == source_code_path or search_path in search_paths:
+            continue
+        if root_name in root_name_paths:
+            print(f"Error: roots {root_name_paths[root_name]} and {search_path} have the same name {root_name}, which prefixes their module paths")
+            return None
+
+        root_name_paths[root_name] = search_path
+        search_paths.append(search_path)
+
+    return search_paths
+
+def get_path_last_alias_str_info(path_alias_info, path_type,
+                                previous_path_last_alias_str_info = None, paths_to_update = None):
     """
     Gets path last alias str info by retrieval and \\
     update, for wildcard imports, of alias info from path alias info
+
+    If previous_path_last_alias_str_info is provided, only the paths in paths_to_update are updated \\
+    and the last alias str info of the other paths is taken from previous_path_last_alias_str_info
     """
 
     path_last_alias_str_info = dict()
 
+    if previous_path_last_alias_str_info != None:
+        for path in path_alias_info:
+            if path not in paths_to_update and path in previous_path_last_alias_str_info:
+                path_last_alias_str_info[path] = previous_path_last_alias_str_info[path]
+
     for path in path_alias_info:
         if path in path_last_alias_str_info:
             continue
@@ -376,6 +1049,186 @@ def update_path_alias_dcts(visited_paths,
 
     return last_alias_str_info.keys(), True
 
+def get_graph_state(path_type, path_alias_info, module_parses, path_last_alias_str_info, codebase_root_path, search_paths = None):
+    """
+    Returns the graph state used by --incremental to update the class hierarchy graph of codebase_root_path and search_paths \\
+    Assumes path_alias_info is a copy from before the update of wildcard imports and that module_parses are module summaries
+    """
+
+    # key: source code path, value: module path, module summary
+    source_module_summaries = dict()
+    for source_code_path, module_path, module_parse in module_parses:
+        source_module_summaries[source_code_path] = (module_path, module_parse)
+
+    return {
+        "version": GRAPH_STATE_VERSION,
+        "codebase_root_path": codebase_root_path,
+        "search_paths": search_paths if search_paths != None else [],
+        "path_type": path_type,
+        "path_alias_info": path_alias_info,
+        "source_module_summaries": source_module_summaries,
+        "path_last_alias_str_info": path_last_alias_str_info
+    }
+
+def load_graph_state(graph_state_path, codebase_root_path, search_paths = None):
+    """
+    Loads the graph state dumped by a previous run at graph_state_path \\
+    Returns the graph state or None if it does not exist or is not for codebase_root_path and search_paths
+    """
+
+    if not os.path.exists(graph_state_path):
+        return None
+
+    graph_state = None
+    with open(graph_state_path, "rb") as f:
+        graph_state = pickle.load(f)
+    f.close()
+
+    if graph_state["version"] != GRAPH_STATE_VERSION or graph_state["codebase_root_path"] != codebase_root_path:
+        return None
+
+    # graph states of runs before --search-path have no search paths
+    previous_search_paths = graph_state["search_paths"] if "search_paths" in graph_state else []
+    if previous_search_paths != (search_paths if search_paths != None else []):
+        return None
+
+    return graph_state
+
+def load_previous_graph(graph_dump_paths):
+    """
+    Loads the class hierarchy graph dumped by a previous run at one of graph_dump_paths, pickle dump files or binary graph files, \\
+    so that the previous graph is found whatever the graph format of the previous run \\
+    If more than one of graph_dump_paths exists, the last modified one is of the previous run \\
+    Returns the class hierarchy graph or None if none of them exists
+    """
+
+    graph_dump_paths = [graph_dump_path for graph_dump_path in graph_dump_paths if os.path.exists(graph_dump_path)]
+    if len(graph_dump_paths) == 0:
+        return None
+    graph_dump_path = max(graph_dump_paths, key=os.path.getmtime)
+
+    if is_binary_graph_file(graph_dump_path):
+        compact_class_hierarchy_graph = load_binary_graph(graph_dump_path)
+        if compact_class_hierarchy_graph == None:
+            return None
+        return compact_class_hierarchy_graph.get_class_hierarchy_graph()
+
+    class_hierarchy_graph = None
+    with open(graph_dump_path, "rb") as f:
+        class_hierarchy_graph = pickle.load(f)
+    f.close()
+
+    return class_hierarchy_graph
+
+def get_changed_paths():
+    """
+    Gets the real paths of changed, added, and deleted files or folders from the --changed-paths option, comma separated, \\
+    and the --changed-paths-file option, a file with one path per line such as the output of git diff --name-only, or - for stdin \\
+    Relative paths are relative to the current working directory
+    """
+
+    changed_paths = []
+
+    changed_paths_str = get_option_value(CHANGED_PATHS_OPTION)
+    if changed_paths_str != None:
+        changed_paths.extend(changed_paths_str.split(","))
+
+    changed_paths_file = get_option_value(CHANGED_PATHS_FILE_OPTION)
+    if changed_paths_file == "-":
+        changed_paths.extend(sys.stdin.read().splitlines())
+    elif changed_paths_file != None:
+        with open(changed_paths_file) as file:
+            changed_paths.extend(file.read().splitlines())
+        file.close()
+
+    return set(os.path.realpath(changed_path.strip()) for changed_path in changed_paths if changed_path.strip() != "")
+
+def get_ignore_rules():
+    """
+    Gets the ignore rules of the scan from the --exclude and --include options, .gitignore-style patterns separated by commas, \\
+    e. g. --exclude node_modules/,build/, and the --gitignore option \\
+    Returns None if no files or folders are skipped
+    """
+
+    exclude_patterns = []
+    include_patterns = []
+
+    exclude_patterns_str = get_option_value(EXCLUDE_OPTION)
+    if exclude_patterns_str != None:
+        exclude_patterns.extend(pattern.strip() for pattern in exclude_patterns_str.split(",") if pattern.strip() != "")
+
+    include_patterns_str = get_option_value(INCLUDE_OPTION)
+    if include_patterns_str != None:
+        include_patterns.extend(pattern.strip() for pattern in include_patterns_str.split(",") if pattern.strip() != "")
+
+    ignore_rules = IgnoreRules(exclude_patterns, include_patterns, has_option(GITIGNORE_OPTION))
+    return ignore_rules if ignore_rules.has_rules() else None
+
+def get_unchanged_parsed_python_scripts(graph_state, changed_paths):
+    """
+    Returns the parsed Python scripts from graph_state of Python files that are not in or under a path in changed_paths \\
+    key: source code path, value: module path, (module summary, alias info)
+    """
+
+    path_alias_info = graph_state["path_alias_info"]
+
+    unchanged_parsed_python_scripts = dict()
+    for source_code_path, (module_path, module_summary) in graph_state["source_module_summaries"].items():
+        is_changed = False
+        for changed_path in changed_paths:
+            if source_code_path == changed_path or source_code_path.startswith(changed_path + os.sep):
+                is_changed = True
+                break
+
+        if not is_changed:
+            # copy as the update of wildcard imports replaces entries of the alias info
+            unchanged_parsed_python_scripts[source_code_path] = (module_path, (module_summary, list(path_alias_info[module_path])))
+
+    return unchanged_parsed_python_scripts
+
+def get_changed_module_paths(changed_paths, root_paths,
+                            path_alias_info, path_type, graph_state):
+    """
+    Returns the module paths that changed since the run that dumped graph_state: \\
+    module paths of Python files in changed_paths within the roots of root_paths, module paths that were added, deleted, or changed PathType, \\
+    module paths with changed alias info, e. g. of imports that resolve to another root of a multi-root run after a module was added, \\
+    and the folders of those module paths and of folders with changed entries
+    """
+
+    changed_module_paths = set()
+
+    for changed_path in changed_paths:
+        for codebase_parent_path, codebase_root_path in root_paths.values():
+            if changed_path != codebase_root_path and not changed_path.startswith(codebase_root_path + os.sep):
+                continue
+            relative_changed_path = os.path.relpath(changed_path, codebase_parent_path)
+            if relative_changed_path.endswith(PYTHON_SCRIPT_EXTENSION):
+                relative_changed_path = relative_changed_path[:-len(PYTHON_SCRIPT_EXTENSION)]
+            changed_module_paths.add(get_dot_notation_path(relative_changed_path))
+
+    previous_path_type = graph_state["path_type"]
+    previous_path_alias_info = graph_state["path_alias_info"]
+    for path in set(path_type.keys()) | set(previous_path_type.keys()):
+        if path not in path_type or path not in previous_path_type or path_type[path] != previous_path_type[path]:
+            changed_module_paths.add(path)
+        elif path_alias_info[path] != previous_path_alias_info[path]:
+            changed_module_paths.add(path)
+
+    # entries of the folder of an added or deleted module path change
+    for path in list(changed_module_paths):
+        dot_index = path.rfind(".")
+        if dot_index != -1:
+            changed_module_paths.add(path[:dot_index])
+
+    return changed_module_paths
+
+def dump_graph_state(graph_state, graph_state_dump_folder, graph_state_dump_filename):
+    """
+    Dumps the graph state to pickle file at graph_state_dump_folder\\graph_state_dump_filename
+    """
+
+    dump_graph(graph_state, graph_state_dump_folder, graph_state_dump_filename)
+
 if __name__ == "__main__":
     """
     Get input that corresponds to a Python code library (from command line arguments) \\
@@ -395,7 +1248,13 @@ if __name__ == "__main__":
     if source_code_path == None:
         exit(1)
 
+    search_paths = get_search_paths(source_code_path)
+    if search_paths == None:
+        exit(1)
+
     print(f"retrieval of class hierarchy graph of source code at {source_code_path}")
+    if search_paths:
+        print(f"and of source code at {', '.join(search_paths)}, with imports resolved in that order")
     print("does not account for definitions of classes with same names within same file or classes within closures")
 
     ast_dump_folder_path = None
@@ -406,48 +1265,132 @@ if __name__ == "__main__":
         ast_dump_filename_prefix = ""
         ast_dump_info = (ast_dump_folder_path, ast_dump_filename_prefix, True)
 
-    # key: module_path, value: list of list of the following entry
-        # alias_str, alias_name, path with alias_name, node
-        # or
-        # "del", alias_str
-    path_alias_info = dict()
-
     codebase_parent_path = get_parent_path(source_code_path)
     codebase_root_path = source_code_path
 
-    # first scan gets the module paths in dot notation and path_type
-    # since scan is recursive, shorter subsequence paths are before longer ones
-    module_paths = []
-
-    # key: path in dot notation, value: PathType
-    path_type = dict()
+    # the phases of the run are recorded with PROFILE_OPTION, the calls of the alias resolution functions of the graph scan are counted
+    run_profiler = get_run_profiler(source_code_path, get_name_directory_or_file(source_code_path), GRAPH_PROFILE_RUN_TYPE, GRAPH_PROFILE_PHASES)
+    if run_profiler != None:
+        run_profiler.count_calls(VisitorForGraph, "_get_alias_path_and_node_helper")
+        run_profiler.count_calls(VisitorForGraph, "_resolve_base_path")
 
-    get_alias_info(source_code_path, codebase_parent_path, codebase_root_path,
-                path_alias_info, module_paths, path_type)
+    # the visitors only read the top-level statements of each file, so module summaries are kept between the scans
+    # instead of full ast parses
+    keep_module_summaries = True
 
-    # key: module_path, value:
-        # key: alias_str, value: alias_name, path with alias_name, node
-    path_last_alias_str_info = get_path_last_alias_str_info(path_alias_info, path_type)
+    jobs = get_positive_int_option(JOBS_OPTION, 1)
+    if jobs == None:
+        exit(1)
 
-    # key: class identifier, value: list of identifiers of inherited classes, module path of class
-    class_hierarchy_graph = dict()
+    # ast dumps are written when a Python file is parsed, so no parse cache is used with DUMP_AST
+    parse_cache = None
+    if not has_option(NO_CACHE_OPTION) and not DUMP_AST:
+        parse_cache_max_size_mb = get_positive_int_option(CACHE_SIZE_OPTION, DEFAULT_PARSE_CACHE_MAX_SIZE_MB)
+        if parse_cache_max_size_mb == None:
+            exit(1)
+        parse_cache = ParseCache(get_parse_cache_path(source_code_path), parse_cache_max_size_mb * 1024 * 1024)
+        with profile_phase(run_profiler, "parse_cache_load"):
+            parse_cache.load()
+
+    # Python files without top-level statements for the alias info and the class hierarchy graph are not parsed,
+    # except with DUMP_AST, as ast dumps are written when a Python file is parsed
+    prefilter_info = None
+    if not has_option(NO_PREFILTER_OPTION) and not DUMP_AST:
+        prefilter_info = {
+            "num_python_scripts_read": 0,
+            "num_parses_avoided": 0
+        }
+
+    graph_format = get_graph_format_option()
+    if graph_format == None:
+        exit(1)
 
-    # key: (alias_name, path), value: resolved path of alias_name
-    # for memoization of the resolved path of an alias name in path
-    alias_name_path_resolved_path = dict()
+    # by default, every file and folder of the roots is scanned
+    ignore_rules = get_ignore_rules()
 
-    get_graph(source_code_path, codebase_parent_path, codebase_root_path,
-            class_hierarchy_graph, alias_name_path_resolved_path,
-            path_last_alias_str_info, path_type,
-            ast_dump_info)
+    # Python files are read by threads ahead of the parse, which bounds the memory of the contents read and not yet parsed
+    read_ahead = get_positive_int_option(READ_AHEAD_OPTION, DEFAULT_READ_AHEAD)
+    if read_ahead == None:
+        exit(1)
+    python_script_reader = PythonScriptReader(read_ahead)
+
+    name = get_name_directory_or_file(source_code_path)
+    pickle_dump_filename = name + CLASS_HIERARCHY_GRAPH_DUMP_SUFFIX + ".pkl"
+    if graph_format == GRAPH_FORMAT_BINARY:
+        pickle_dump_filename = name + CLASS_HIERARCHY_GRAPH_DUMP_SUFFIX + BINARY_GRAPH_EXTENSION
+    graph_state_dump_filename = name + GRAPH_STATE_DUMP_SUFFIX + ".pkl"
+    import_dependency_index_dump_filename = get_import_dependency_index_dump_filename(source_code_path)
+
+    # with --incremental, Python files that are not changed are not parsed
+    # and only the module paths that depend on changed module paths are resolved again
+    incremental = has_option(INCREMENTAL_OPTION)
+    save_graph_state = incremental or has_option(SAVE_STATE_OPTION)
+
+    graph_state = None
+    previous_class_hierarchy_graph = None
+    previous_import_dependency_index = None
+    changed_paths = None
+    if incremental:
+        with profile_phase(run_profiler, "previous_graph_load"):
+            graph_state = load_graph_state(os.path.join(FOLDER_WITH_CLASS_HIERARCHY_GRAPHS, graph_state_dump_filename), codebase_root_path, search_paths)
+            previous_class_hierarchy_graph = load_previous_graph([os.path.join(FOLDER_WITH_CLASS_HIERARCHY_GRAPHS, name + CLASS_HIERARCHY_GRAPH_DUMP_SUFFIX + extension)
+                                                                  for extension in [".pkl", BINARY_GRAPH_EXTENSION]])
+            previous_import_dependency_index = load_import_dependency_index(os.path.join(FOLDER_WITH_CLASS_HIERARCHY_GRAPHS, import_dependency_index_dump_filename))
+        if graph_state == None or previous_class_hierarchy_graph == None or previous_import_dependency_index == None:
+            print(f"Error: no previous class hierarchy graph and state for {source_code_path}, run with {SAVE_STATE_OPTION} first")
+            exit(1)
+
+        changed_paths = get_changed_paths()
+        if len(changed_paths) == 0:
+            print(f"Warning: no changed paths provided with {CHANGED_PATHS_OPTION} or {CHANGED_PATHS_FILE_OPTION}, "
+                  "the class hierarchy graph of the previous run is kept as it is")
+        print(f"incremental update of class hierarchy graph with {len(changed_paths)} changed paths")
+
+    class_hierarchy_graph, import_dependency_index, graph_state = build_class_hierarchy_graph(source_code_path, codebase_parent_path, codebase_root_path,
+                                                                                        keep_module_summaries, ast_dump_info, jobs, parse_cache,
+                                                                                        save_graph_state,
+                                                                                        graph_state, previous_class_hierarchy_graph, previous_import_dependency_index, changed_paths,
+                                                                                        search_paths, prefilter_info, ignore_rules, python_script_reader,
+                                                                                        run_profiler)
+
+    if parse_cache != None:
+        with profile_phase(run_profiler, "parse_cache_dump"):
+            parse_cache.dump()
 
     if LOG_GRAPH_INFO:
         print()
         print("class hierarchy graph information")
         print_class_hierarchy_graph_info(class_hierarchy_graph)
 
-    pickle_dump_filename = get_name_directory_or_file(source_code_path) + CLASS_HIERARCHY_GRAPH_DUMP_SUFFIX + ".pkl"
+    if parse_cache != None:
+        print()
+        parse_cache.print_info()
+
+    if prefilter_info != None:
+        print()
+        print(f"pre-filter: {prefilter_info['num_parses_avoided']} of {prefilter_info['num_python_scripts_read']} Python files read were not parsed, "
+              "without top-level import, class, def, del, or assignment statements")
+
+    if python_script_reader.num_python_scripts_read > 0:
+        print()
+        python_script_reader.print_info()
 
     print()
-    print(f"dump class hierarchy graph to {os.path.join(FOLDER_WITH_CLASS_HIERARCHY_GRAPHS, pickle_dump_filename)}")
-    dump_graph(class_hierarchy_graph, FOLDER_WITH_CLASS_HIERARCHY_GRAPHS, pickle_dump_filename)
\ No newline at end of file
+    with profile_phase(run_profiler, "dump"):
+        print(f"dump class hierarchy graph to {os.path.join(FOLDER_WITH_CLASS_HIERARCHY_GRAPHS, pickle_dump_filename)}")
+        if graph_format == GRAPH_FORMAT_BINARY:
+            dump_binary_graph(CompactClassHierarchyGraph(class_hierarchy_graph), os.path.join(FOLDER_WITH_CLASS_HIERARCHY_GRAPHS, pickle_dump_filename))
+        else:
+            dump_graph(class_hierarchy_graph, FOLDER_WITH_CLASS_HIERARCHY_GRAPHS, pickle_dump_filename)
+
+        print(f"dump import dependency index to {os.path.join(FOLDER_WITH_CLASS_HIERARCHY_GRAPHS, import_dependency_index_dump_filename)}")
+        dump_import_dependency_index(import_dependency_index, FOLDER_WITH_CLASS_HIERARCHY_GRAPHS, import_dependency_index_dump_filename)
+
+        if save_graph_state:
+            print(f"dump graph state to {os.path.join(FOLDER_WITH_CLASS_HIERARCHY_GRAPHS, graph_state_dump_filename)}")
+            dump_graph_state(graph_state, FOLDER_WITH_CLASS_HIERARCHY_GRAPHS, graph_state_dump_filename)
+
+    if run_profiler != None:
+        run_profiler.close()
+        print()
+        run_profiler.print_info()
@@ -0,0 +1,202 @@
+import copy
+import os
+import re
+
+GITIGNORE_FILENAME = ".gitignore"
+
+# folder of a git repository, which is not scanned with .gitignore files
+GIT_FOLDER_PATTERN = ".git/"
+
+def translate_ignore_pattern(pattern):
+    """
+    Returns the regular expression of pattern, a .gitignore-style pattern without a leading ! or a trailing /, \\
+    that matches paths relative to the folder of the pattern, with / separators \\
+    A pattern without a / matches the name of a file or folder at any depth, otherwise it matches from the folder of the pattern \\
+    * matches any characters other than /, ? matches one character other than /, [...] matches one character in the brackets, \\
+    and ** matches any folders as a leading **/, a trailing /**, or a /**/ \\
+    A character after a \\ is matched as is
+    """
+
+    is_anchored = "/" in pattern
+    if pattern.startswith("/"):
+        pattern = pattern[1:]
+
+    regex = "" if is_anchored else "(?:.*/)?"
+
+    segments = pattern.split("/")
+    for i, segment in enumerate(segments):
+        if segment == "**":
+            regex += ".*" if i == len(segments) - 1 else "(?:.*/)?"
+            continue
+
+        j = 0
+        while j < len(segment):
+            c = segment[j]
+            if c == "\\" and j + 1 < len(segment):
+                j += 1
+                regex += re.escape(segment[j])
+            elif c == "*":
+                regex += "[^/]*"
+                while j + 1 < len(segment) and segment[j + 1] == "*":
+                    j += 1
+            elif c == "?":
+                regex += "[^/]"
+            elif c == "[" and segment.find("]", j + 2) != -1:
+                end = segment.find("]", j + 2)
+                characters = segment[j + 1:end]
+                if characters[0] in ("!", "^"):
+                    characters = "^/" + characters[1:]
+                regex += "[" + characters.replace("\\", "\\\\") + "]"
+                j = end
+            else:
+                regex += re.escape(c)
+            j += 1
+
+        if i < len(segments) - 1:
+            regex += "/"
+
+    return regex
+
+def get_ignore_rule(pattern, folder_path):
+    """
+    Returns the rule of pattern, a line of a .gitignore file or a pattern of --exclude, for the paths within folder_path: \\
+    folder_path followed by a separator, regular expression of the pattern, whether it is negated with a leading !, \\
+    and whether it only matches folders with a trailing / \\
+    Returns None for blank lines and comments
+    """
+
+    # trailing spaces are ignored unless they are escaped
+    pattern = pattern.rstrip("\n\r")
+    while pattern.endswith(" ") and not pattern.endswith("\\ "):
+        pattern = pattern[:-1]
+
+    if pattern == "" or pattern.startswith("#"):
+        return None
+
+    is_negated = pattern.startswith("!")
+    if is_negated:
+        pattern = pattern[1:]
+
+    is_folder_only = pattern.endswith("/")
+    if is_folder_only:
+        pattern = pattern.rstrip("/")
+
+    if pattern == "":
+        return None
+
+    folder_prefix = folder_path if folder_path.endswith(os.sep) else folder_path + os.sep
+    return folder_prefix, re.compile(translate_ignore_pattern(pattern)), is_negated, is_folder_only
+
+def get_relative_path(path, folder_prefix):
+    """
+    Returns path relative to folder_prefix, a folder path followed by a separator, with / separators
+    """
+
+    relative_path = path[len(folder_prefix):]
+    if os.sep != "/":
+        relative_path = relative_path.replace(os.sep, "/")
+    return relative_path
+
+class IgnoreRules:
+    """
+    .gitignore-style rules for the files and folders to skip in the scan of a root \\
+    Paths are excluded by --exclude patterns and, if read_gitignore_files, by the .gitignore files of the scanned folders, \\
+    each of which applies to the paths within its folder, and Python files are scanned only if they match an --include pattern, if any \\
+    As with git, the last matching rule of the nearest .gitignore file decides whether a path is excluded, \\
+    --exclude patterns take precedence over .gitignore files, and the paths within an excluded folder are not scanned
+
+    The rules of a root are from for_root, and the rules of a folder within it are from get_folder_ignore_rules
+    """
+
+    def __init__(self, exclude_patterns = (), include_patterns = (), read_gitignore_files = False, root_path = None):
+        self.exclude_patterns = list(exclude_patterns)
+        self.include_patterns = list(include_patterns)
+        self.read_gitignore_files = read_gitignore_files
+        self.root_path = root_path
+
+        # rules of the .gitignore files of the folders from the root to the current folder, in that order, see get_ignore_rule
+        self.gitignore_rules = []
+
+        self.exclude_rules = []
+        self.include_rules = []
+        if root_path != None:
+            if read_gitignore_files:
+                self.gitignore_rules.append(get_ignore_rule(GIT_FOLDER_PATTERN, root_path))
+            for pattern in self.exclude_patterns:
+                exclude_rule = get_ignore_rule(pattern, root_path)
+                if exclude_rule != None:
+                    self.exclude_rules.append(exclude_rule)
+            for pattern in self.include_patterns:
+                include_rule = get_ignore_rule(pattern, root_path)
+                if include_rule != None:
+                    self.include_rules.append(include_rule)
+
+    def has_rules(self):
+        """
+        Returns whether any path may be skipped
+        """
+
+        return self.read_gitignore_files or len(self.exclude_patterns) > 0 or len(self.include_patterns) > 0
+
+    def for_root(self, root_path):
+        """
+        Returns the rules with the same patterns for the scan of the root at root_path
+        """
+
+        return IgnoreRules(self.exclude_patterns, self.include_patterns, self.read_gitignore_files, root_path)
+
+    def get_folder_ignore_rules(self, folder_path):
+        """
+        Returns the rules for the files and folders within the folder at folder_path, \\
+        which are these rules followed by the rules of the .gitignore file of the folder if read_gitignore_files
+        """
+
+        if not self.read_gitignore_files:
+            return self
+
+        gitignore_lines = None
+        try:
+            with open(os.path.join(folder_path, GITIGNORE_FILENAME), encoding="utf-8", errors="replace") as f:
+                gitignore_lines = f.read().splitlines()
+            f.close()
+        except OSError:
+            return self
+
+        folder_ignore_rules = copy.copy(self)
+        folder_ignore_rules.gitignore_rules = list(self.gitignore_rules)
+        for line in gitignore_lines:
+            gitignore_rule = get_ignore_rule(line, folder_path)
+            if gitignore_rule != None:
+                folder_ignore_rules.gitignore_rules.append(gitignore_rule)
+
+        return folder_ignore_rules
+
+    def is_excluded(self, path, is_folder):
+        """
+        Returns whether the file or folder at path, within the current folder, is excluded
+        """
+
+        is_path_excluded = False
+        for rules in (self.gitignore_rules, self.exclude_rules):
+            for folder_prefix, regex, is_negated, is_folder_only in rules:
+                if is_folder_only and not is_folder:
+                    continue
+                if regex.fullmatch(get_relative_path(path, folder_prefix)):
+                    is_path_excluded = not is_negated
+
+        return is_path_excluded
+
+    def is_included(self, path):
+        """
+        Returns whether the Python file at path is scanned: if there are no --include patterns or it matches one of them
+        """
+
+        if len(self.include_rules) == 0:
+            return True
+
+        is_path_included = False
+        for folder_prefix, regex, is_negated, _ in self.include_rules:
+            if regex.fullmatch(get_relative_path(path, folder_prefix)):
+                is_path_included = not is_negated
+
+        return is_path_included
@@ -0,0 +1,185 @@
+import os
+import pickle
+
+from util import *
+
+IMPORT_DEPENDENCY_INDEX_DUMP_SUFFIX = "_import_dependency_index"
+
+IMPORT_DEPENDENCY_INDEX_PATH_ARGUMENT_INDEX = 1 # 0-indexed
+QUERY_MODULE_PATH_ARGUMENT_INDEX = 2 # 0-indexed
+
+class ImportDependencyIndex:
+    """
+    Reverse import dependency index of a codebase \\
+    For each path in dot notation, records the paths that import it, \\
+    with an Import or ImportFrom (including from <path> import *) or, for folders, as an entry of the folder \\
+    and separately the paths that import it with a wildcard import
+    """
+
+    def __init__(self):
+        # key: imported path, value: set of paths with an alias entry with the imported path
+        self.path_importers = dict()
+
+        # key: imported path, value: set of paths with a wildcard import of the imported path
+        self.path_wildcard_importers = dict()
+
+    def add_alias_info(self, path, alias_info):
+        """
+        Adds the imports of path from alias_info, the alias info of path from before the update of wildcard imports
+        """
+
+        for alias_entries in alias_info:
+            is_wildcard_import = alias_entries[0][0] == "*"
+            for alias_entry in alias_entries:
+                if alias_entry[0] == "del":
+                    continue
+
+                imported_path = alias_entry[2]
+                if imported_path == None or imported_path == path:
+                    continue
+
+                if imported_path not in self.path_importers:
+                    self.path_importers[imported_path] = set()
+                self.path_importers[imported_path].add(path)
+
+                if is_wildcard_import:
+                    if imported_path not in self.path_wildcard_importers:
+                        self.path_wildcard_importers[imported_path] = set()
+                    self.path_wildcard_importers[imported_path].add(path)
+
+    def add_path_alias_info(self, path_alias_info):
+        """
+        Adds the imports of each path in path_alias_info, from before the update of wildcard imports
+        """
+
+        for path, alias_info in path_alias_info.items():
+            self.add_alias_info(path, alias_info)
+
+    def update(self, import_dependency_index):
+        """
+        Adds the imports recorded in import_dependency_index
+        """
+
+        for dct, other_dct in [(self.path_importers, import_dependency_index.path_importers),
+                                (self.path_wildcard_importers, import_dependency_index.path_wildcard_importers)]:
+            for imported_path, importers in other_dct.items():
+                if imported_path not in dct:
+                    dct[imported_path] = set()
+                dct[imported_path].update(importers)
+
+    def get_importers(self, path, wildcard_only=False):
+        """
+        Returns the paths that directly import path, or only those with a wildcard import if wildcard_only \\
+        An import of <path> is also an import of <path>.__init__
+        """
+
+        dct = self.path_wildcard_importers if wildcard_only else self.path_importers
+
+        importers = set()
+        paths = [path]
+        if is_identifier_rightmost_subsequence_of_identifier("__init__", path)[0] and len(path) > len("__init__"):
+            paths.append(path[:-len(".__init__")])
+        for p in paths:
+            if p in dct:
+                importers.update(dct[p])
+        return importers
+
+    def get_dependents(self, paths, wildcard_only=False):
+        """
+        Returns paths and the paths that import them, directly or transitively \\
+        If wildcard_only, only wildcard imports are followed
+        """
+
+        dependent_paths = set(paths)
+        paths_to_visit = list(paths)
+        while paths_to_visit:
+            path = paths_to_visit.pop()
+            for importer in self.get_importers(path, wildcard_only):
+                if importer not in dependent_paths:
+                    dependent_paths.add(importer)
+                    paths_to_visit.append(importer)
+
+        return dependent_paths
+
+    def get_affected_class_identifiers(self, paths, compact_class_hierarchy_graph):
+        """
+        Returns the identifiers of classes in compact_class_hierarchy_graph that an edit of paths could affect: \\
+        classes from paths and the paths that depend on them, found through the module path index of the graph, see CompactClassHierarchyGraph.get_module_path_class_ids, \\
+        and, transitively, the subclasses of those classes, found through the reverse-edge index, see CompactClassHierarchyGraph.get_descendant_class_ids \\
+        Both indices are kept by compact_class_hierarchy_graph, so a query after the first one does not scan the classes of the graph
+        """
+
+        dependent_class_ids = set()
+        for dependent_path in self.get_dependents(paths):
+            dependent_class_ids.update(compact_class_hierarchy_graph.get_module_path_class_ids(dependent_path))
+
+        affected_class_ids = dependent_class_ids | compact_class_hierarchy_graph.get_descendant_class_ids(dependent_class_ids)
+        return set(compact_class_hierarchy_graph.get_class_identifiers(affected_class_ids))
+
+def get_import_dependency_index_dump_filename(source_code_path):
+    """
+    Returns the filename of the import dependency index dump of the Python script or folder at source_code_path
+    """
+
+    return get_name_directory_or_file(source_code_path) + IMPORT_DEPENDENCY_INDEX_DUMP_SUFFIX + ".pkl"
+
+def dump_import_dependency_index(import_dependency_index, import_dependency_index_dump_folder, import_dependency_index_dump_filename):
+    """
+    Dumps the import dependency index to pickle file at import_dependency_index_dump_folder\\import_dependency_index_dump_filename
+    """
+
+    create_dump_folder(import_dependency_index_dump_folder)
+
+    filename_for_pickle_dump = os.path.join(import_dependency_index_dump_folder, import_dependency_index_dump_filename)
+    with open(filename_for_pickle_dump, "wb") as f:
+        pickle.dump((import_dependency_index.path_importers, import_dependency_index.path_wildcard_importers), f, pickle.HIGHEST_PROTOCOL)
+    f.close()
+
+def load_import_dependency_index(import_dependency_index_path):
+    """
+    Loads the import dependency index dumped at import_dependency_index_path \\
+    Returns the import dependency index or None if it does not exist
+    """
+
+    if not os.path.exists(import_dependency_index_path):
+        return None
+
+    import_dependency_index = ImportDependencyIndex()
+    with open(import_dependency_index_path, "rb") as f:
+        import_dependency_index.path_importers, import_dependency_index.path_wildcard_importers = pickle.load(f)
+    f.close()
+
+    return import_dependency_index
+
+def usage_info():
+    """
+    Outputs the proper usage of this script
+    """
+
+    print("Usage:")
+    print("python import_dependency_index.py [path to import dependency index pickle dump file] [module path in dot notation]")
+    print("can use python get_class_hierarchy_graph.py [path to Python source code] to generate the pickle dump file")
+    print()
+    print("Example:")
+    print("python import_dependency_index.py class_hierarchy_graphs/sample_inconsistent_codebase_import_dependency_index.pkl sample_inconsistent_codebase.b")
+
+if __name__ == "__main__":
+    """
+    Outputs the paths that import the given module path, directly and transitively
+    """
+
+    import_dependency_index_path = get_path(IMPORT_DEPENDENCY_INDEX_PATH_ARGUMENT_INDEX, usage_info)
+    if import_dependency_index_path == None:
+        exit(1)
+
+    if len(sys.argv) < QUERY_MODULE_PATH_ARGUMENT_INDEX + 1:
+        print("Error: expected module path")
+        usage_info()
+        exit(1)
+
+    module_path = sys.argv[QUERY_MODULE_PATH_ARGUMENT_INDEX]
+    import_dependency_index = load_import_dependency_index(import_dependency_index_path)
+
+    print(f"module paths that import {module_path}: {sorted(import_dependency_index.get_importers(module_path))}")
+    print(f"module paths that import {module_path} with a wildcard import: {sorted(import_dependency_index.get_importers(module_path, True))}")
+    print(f"module paths that depend on {module_path}: {sorted(import_dependency_index.get_dependents([module_path]) - { module_path })}")
@@ -0,0 +1,35 @@
+from util import *
+
+class ModulePathIndex:
+    """
+    Index of the files and folders of the directory scan of the roots of a run, built once by get_python_script_tasks \\
+    Maps each path to its module path in dot notation, its PathType, and the module paths of its parent packages, \\
+    so that imports are resolved and the scan is replayed with dictionary lookups instead of string scanning of paths
+    """
+
+    def __init__(self):
+        # key: path of file or folder, value: name of the file or folder, module path, PathType (None if not a Python file or folder),
+        # module paths of the folders that the path is in, nearest first (the last is the name of the root)
+        # in scan order: a folder before its entries, which are in the order of os.scandir
+        self.entries = dict()
+
+    def add(self, path, name, module_path, path_type, package_module_paths):
+        """
+        Adds the file or folder at path after the paths that were added before it
+        """
+
+        self.entries[path] = (name, module_path, path_type, package_module_paths)
+
+    def get_module_path(self, path):
+        """
+        Returns the module path of the file or folder at path or None if it is not in the index
+        """
+
+        return self.entries[path][1] if path in self.entries else None
+
+    def get_package_module_paths(self, path):
+        """
+        Returns the module paths of the folders that the file or folder at path is in, nearest first, or None if it is not in the index
+        """
+
+        return self.entries[path][3] if path in self.entries else None
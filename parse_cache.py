@@ -0,0 +1,163 @@
+import hashlib
+import os
+import pickle
+import sys
+
+from util import *
+
+FOLDER_WITH_PARSE_CACHES = "parse_caches"
+PARSE_CACHE_DUMP_SUFFIX = "_parse_cache"
+
+DEFAULT_PARSE_CACHE_MAX_SIZE_MB = 256
+
+# entries are discarded if the cache format or the Python version (ast node classes) changes
+PARSE_CACHE_VERSION = (1, sys.version_info[0], sys.version_info[1])
+
+class ParseCache:
+    """
+    On-disk cache of the parsed Python script, module summary and alias info, of each Python file \\
+    An entry is reused while the content hash of the file, its module path, and the codebase root path match \\
+    Least recently used entries are evicted when the pickled entries exceed max_size_bytes
+    """
+
+    def __init__(self, parse_cache_path, max_size_bytes):
+        self.parse_cache_path = parse_cache_path
+        self.max_size_bytes = max_size_bytes
+
+        # key: source code path, value: [content hash, module path, codebase root path, pickled parsed Python script, run of last use]
+        self.entries = dict()
+        self.run = 0
+
+        self.num_hits = 0
+        self.num_misses = 0
+        self.num_evicted = 0
+
+    def load(self):
+        """
+        Loads the entries from the parse cache file if it exists and is of the current PARSE_CACHE_VERSION
+        """
+
+        if not os.path.exists(self.parse_cache_path):
+            return
+
+        try:
+            with open(self.parse_cache_path, "rb") as f:
+                version, run, entries = pickle.load(f)
+            f.close()
+        except Exception as e:
+            print(f"Could not load parse cache {self.parse_cache_path}: {e}")
+            return
+
+        if version != PARSE_CACHE_VERSION:
+            return
+
+        self.run = run
+        self.entries = entries
+
+    def dump(self):
+        """
+        Evicts least recently used entries above max_size_bytes and dumps the entries to the parse cache file
+        """
+
+        self.run += 1
+
+        size_bytes = 0
+        entries = dict()
+        for source_code_path, entry in sorted(self.entries.items(), key=lambda item: item[1][4], reverse=True):
+            entry_size_bytes = len(entry[3])
+            if size_bytes + entry_size_bytes > self.max_size_bytes:
+                self.num_evicted += 1
+                continue
+            size_bytes += entry_size_bytes
+            entries[source_code_path] = entry
+        self.entries = entries
+
+        create_dump_folder(get_parent_path(self.parse_cache_path))
+
+        # writes to a temporary file first so that an interrupted dump does not leave a corrupt cache
+        temporary_parse_cache_path = self.parse_cache_path + ".tmp"
+        with open(temporary_parse_cache_path, "wb") as f:
+            pickle.dump((PARSE_CACHE_VERSION, self.run, self.entries), f, pickle.HIGHEST_PROTOCOL)
+        f.close()
+        os.replace(temporary_parse_cache_path, self.parse_cache_path)
+
+    def get_entry_content_hash(self, source_code_path, module_path, codebase_root_path):
+        """
+        Returns the content hash of the entry for source_code_path if it is for module_path and codebase_root_path, or None \\
+        The entry is valid for contents with this content hash, see get
+        """
+
+        entry = self.entries[source_code_path] if source_code_path in self.entries else None
+        if entry != None and entry[1] == module_path and entry[2] == codebase_root_path:
+            return entry[0]
+
+        return None
+
+    def get(self, source_code_path, module_path, codebase_root_path, content_hash):
+        """
+        Returns whether there is a valid entry for the file at source_code_path with contents of content_hash, see get_content_hash \\
+        content_hash is None if the file could not be read
+        """
+
+        entry = self.entries[source_code_path] if source_code_path in self.entries else None
+        if content_hash != None and entry != None and \
+            entry[0] == content_hash and entry[1] == module_path and entry[2] == codebase_root_path:
+            entry[4] = self.run + 1
+            self.num_hits += 1
+            return True
+
+        self.num_misses += 1
+        return False
+
+    def load_parsed_python_script(self, source_code_path):
+        """
+        Returns the parsed Python script of the entry for source_code_path \\
+        Assumes that get returned that the entry is valid
+        """
+
+        return pickle.loads(self.entries[source_code_path][3])
+
+    def put(self, source_code_path, module_path, codebase_root_path, content_hash, parsed_python_script):
+        """
+        Adds or replaces the entry for source_code_path \\
+        content_hash must be that of the contents that parsed_python_script was parsed from
+        """
+
+        if content_hash == None:
+            return
+
+        self.entries[source_code_path] = [content_hash, module_path, codebase_root_path,
+                                        pickle.dumps(parsed_python_script, pickle.HIGHEST_PROTOCOL), self.run + 1]
+
+    def print_info(self):
+        """
+        Prints the hit rate of the parse cache
+        """
+
+        num_lookups = self.num_hits + self.num_misses
+        hit_rate = 100 * self.num_hits / num_lookups if num_lookups > 0 else 0
+        print(f"parse cache: {self.num_hits} hits, {self.num_misses} misses, hit rate: {hit_rate:.1f}%, {self.num_evicted} entries evicted")
+
+def get_content_hash(source_code_path, python_script_bytes = None):
+    """
+    Returns the hash of the contents of the file at source_code_path, or of python_script_bytes if provided, \\
+    or None if the file could not be read
+    """
+
+    if python_script_bytes != None:
+        return hashlib.sha256(python_script_bytes).hexdigest()
+
+    try:
+        with open(source_code_path, "rb") as f:
+            content_hash = hashlib.sha256(f.read()).hexdigest()
+        f.close()
+        return content_hash
+    except OSError:
+        return None
+
+def get_parse_cache_path(source_code_path):
+    """
+    Returns the path of the parse cache file for the Python script or folder at source_code_path
+    """
+
+    return os.path.join(FOLDER_WITH_PARSE_CACHES, get_name_directory_or_file(source_code_path) + PARSE_CACHE_DUMP_SUFFIX + ".pkl")
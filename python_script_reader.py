@@ -0,0 +1,108 @@
+import collections
+import concurrent.futures
+import threading
+import time
+
+from util import *
+
+DEFAULT_READ_AHEAD = 32
+READ_AHEAD_THREADS = 4
+
+class PythonScriptReader:
+    """
+    Reads the contents of Python files with a pool of threads ahead of the thread that parses them, \\
+    so that the parse does not wait for each read on file systems with a high latency, such as network mounts \\
+    At most read_ahead contents are read and not yet parsed at a time, which bounds the memory used by the reads
+
+    The time of the reads (I/O), and of each stage the time that it waited for reads and its CPU time, are kept for print_info
+    """
+
+    def __init__(self, read_ahead = DEFAULT_READ_AHEAD, num_threads = READ_AHEAD_THREADS):
+        self.read_ahead = read_ahead
+        self.num_threads = min(num_threads, read_ahead)
+
+        self.num_python_scripts_read = 0
+        self.num_bytes_read = 0
+        # summed over the reader threads
+        self.read_seconds = 0
+        self.lock = threading.Lock()
+
+        # key: stage, value: [number of Python scripts, seconds waited for reads, CPU seconds], in order of the first map of the stage
+        self.stage_times = dict()
+
+    def read(self, source_code_path):
+        """
+        Returns the contents of the Python file at source_code_path as bytes, see read_python_script, \\
+        or None if it could not be read
+        """
+
+        start_time = time.perf_counter()
+        try:
+            python_script_bytes = read_python_script(source_code_path)
+        except OSError:
+            python_script_bytes = None
+        read_seconds = time.perf_counter() - start_time
+
+        with self.lock:
+            self.read_seconds += read_seconds
+            if python_script_bytes != None:
+                self.num_python_scripts_read += 1
+                self.num_bytes_read += len(python_script_bytes)
+
+        return python_script_bytes
+
+    def map(self, function, python_script_tasks, stage = "parse"):
+        """
+        Yields function(python_script_task, python_script_bytes) of each task from python_script_tasks, see get_python_script_tasks, \\
+        in task order, where python_script_bytes are the contents of the Python file of the task read ahead, or None if it could not be read \\
+        function is run in this thread, and its CPU time and the time waited for reads are added to the times of stage
+        """
+
+        if stage not in self.stage_times:
+            self.stage_times[stage] = [0, 0, 0]
+        stage_times = self.stage_times[stage]
+
+        python_script_tasks = iter(python_script_tasks)
+
+        # tasks and their reads in task order
+        pending_reads = collections.deque()
+
+        with concurrent.futures.ThreadPoolExecutor(self.num_threads) as executor:
+            try:
+                while True:
+                    while len(pending_reads) < self.read_ahead:
+                        python_script_task = next(python_script_tasks, None)
+                        if python_script_task == None:
+                            break
+                        pending_reads.append((python_script_task, executor.submit(self.read, python_script_task[0])))
+
+                    if len(pending_reads) == 0:
+                        break
+
+                    python_script_task, pending_read = pending_reads.popleft()
+
+                    start_time = time.perf_counter()
+                    python_script_bytes = pending_read.result()
+                    stage_times[1] += time.perf_counter() - start_time
+
+                    start_time = time.thread_time()
+                    result = function(python_script_task, python_script_bytes)
+                    stage_times[2] += time.thread_time() - start_time
+                    stage_times[0] += 1
+
+                    del python_script_bytes
+                    yield result
+            finally:
+                # reads of tasks that are not consumed are not waited for
+                for _, pending_read in pending_reads:
+                    pending_read.cancel()
+
+    def print_info(self):
+        """
+        Prints the I/O time of the reads and the time waited for reads and CPU time of each stage
+        """
+
+        print(f"read ahead: {self.num_python_scripts_read} Python files ({self.num_bytes_read / (1024 * 1024):.1f} MB) read by {self.num_threads} threads "
+              f"in {self.read_seconds:.3f} s of I/O, up to {self.read_ahead} files ahead")
+        for stage, (num_python_scripts, wait_seconds, cpu_seconds) in self.stage_times.items():
+            print(f"    {stage}: {num_python_scripts} Python files, {wait_seconds:.3f} s waited for reads, {cpu_seconds:.3f} s of CPU time")
@@ -0,0 +1,79 @@
+import os
+
+REPORT_BUFFER_SIZE = 1 << 20   # bytes
+
+class ReportSink:
+    """
+    Streams the records of a report to the file at info_dump_path as they are found \\
+    The file is created in info_folder_name on the first record, so no file is written for an empty report unless write_empty \\
+    Writes are buffered, with flush_per_record each record is flushed to the file once it is written
+    """
+
+    def __init__(self, info_folder_name, info_dump_path, info_identifier, flush_per_record=False, write_empty=False):
+        self.info_folder_name = info_folder_name
+        self.info_dump_path = info_dump_path
+        self.info_identifier = info_identifier
+        self.flush_per_record = flush_per_record
+        self.write_empty = write_empty
+
+        self.file = None
+        self.num_records = 0
+        self.failed = False
+
+    def open(self):
+        """
+        Creates the report file, replacing the file of a previous run
+        """
+
+        if not os.path.exists(self.info_folder_name):
+            os.mkdir(self.info_folder_name)
+
+        if os.path.exists(self.info_dump_path):
+            os.remove(self.info_dump_path)
+
+        self.file = open(self.info_dump_path, "w", buffering=REPORT_BUFFER_SIZE)
+
+    def write(self, record):
+        """
+        Writes record to the report file
+        """
+
+        self.num_records += 1
+        if self.failed:
+            return
+
+        try:
+            if self.file == None:
+                self.open()
+
+            self.file.write(record)
+            if self.flush_per_record:
+                self.file.flush()
+        except:
+            self.failed = True
+
+    def close(self):
+        """
+        Closes the report file and outputs where the report was dumped
+        """
+
+        if self.file == None and self.write_empty and not self.failed:
+            try:
+                self.open()
+            except:
+                self.failed = True
+
+        if self.file != None:
+            try:
+                self.file.close()
+            except:
+                self.failed = True
+            self.file = None
+
+        if self.num_records == 0 and not self.write_empty:
+            return
+
+        if self.failed:
+            print(f"Could not dump {self.info_identifier} information")
+        else:
+            print(f"Dumped {self.info_identifier} information to {self.info_dump_path}")
@@ -0,0 +1,243 @@
+import ast
+import json
+import os
+import pathlib
+
+from report_sink import *
+
+OUTPUT_FORMAT_TEXT = "text"
+OUTPUT_FORMAT_JSONL = "jsonl"
+OUTPUT_FORMAT_SARIF = "sarif"
+OUTPUT_FORMATS = [OUTPUT_FORMAT_TEXT, OUTPUT_FORMAT_JSONL, OUTPUT_FORMAT_SARIF]
+
+OUTPUT_FORMAT_EXTENSIONS = {
+    OUTPUT_FORMAT_JSONL: ".jsonl",
+    OUTPUT_FORMAT_SARIF: ".sarif"
+}
+
+CYCLE_INCONSISTENT_RECORD_TYPE = "cycle_inconsistent"
+SOURCE_LOGICAL_INCONSISTENT_RECORD_TYPE = "source_logical_inconsistent"
+INHERITED_LOGICAL_INCONSISTENT_RECORD_TYPE = "inherited_logical_inconsistent"
+
+SARIF_VERSION = "2.1.0"
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_TOOL_NAME = "inconsistency-checker"
+SARIF_TOOL_INFORMATION_URI = "https://github.com/JessHua159/inconsistency-checker"
+
+# key: record type, value: rule id and short description of the SARIF rule
+SARIF_RULES = {
+    CYCLE_INCONSISTENT_RECORD_TYPE: ("cycle-inconsistent", "Class is in cycle inheritance"),
+    SOURCE_LOGICAL_INCONSISTENT_RECORD_TYPE: ("source-logical-inconsistent", "Local precedence order of class conflicts with the MRO of an inherited class"),
+    INHERITED_LOGICAL_INCONSISTENT_RECORD_TYPE: ("inherited-logical-inconsistent", "Class inherits from a class with cyclic or logical inconsistency")
+}
+
+class ClassLineNumbers:
+    """
+    Line numbers of the ClassDef of classes in the class hierarchy graph \\
+    The class hierarchy graph does not store line numbers, so the source file of a class is parsed the first time \\
+    the line number of one of its classes is needed
+    """
+
+    def __init__(self, compact_class_hierarchy_graph):
+        self.compact_class_hierarchy_graph = compact_class_hierarchy_graph
+
+        # key: source path, value: dict with key: class name, value: line number of the first top-level ClassDef of the class name
+        self.source_path_class_line_numbers = dict()
+
+    def get_line_number(self, class_id):
+        """
+        Returns the line number of the ClassDef of the class with class_id \\
+        or None if the class is external or its source file cannot be parsed
+        """
+
+        if class_id == None or not self.compact_class_hierarchy_graph.is_in_graph(class_id):
+            return None
+
+        source_path = self.compact_class_hierarchy_graph.get_source_path(class_id)
+        class_line_numbers = self.source_path_class_line_numbers.get(source_path)
+        if class_line_numbers == None:
+            class_line_numbers = get_class_line_numbers(source_path)
+            self.source_path_class_line_numbers[source_path] = class_line_numbers
+
+        class_name = self.compact_class_hierarchy_graph.get_class_identifier(class_id).rsplit(".", 1)[-1]
+        return class_line_numbers.get(class_name)
+
+def get_class_line_numbers(source_path):
+    """
+    Returns dict with key: class name, value: line number of the first top-level ClassDef of the class name in the file at source_path \\
+    The first ClassDef is the one added to the class hierarchy graph
+    """
+
+    class_line_numbers = dict()
+    try:
+        with open(source_path, "rb") as file:
+            source_code = file.read()
+        file.close()
+
+        for node in ast.parse(source_code).body:
+            if isinstance(node, ast.ClassDef) and node.name not in class_line_numbers:
+                class_line_numbers[node.name] = node.lineno
+    except:
+        pass
+
+    return class_line_numbers
+
+class JsonLinesResultWriter:
+    """
+    Streams one JSON object per line to report_sink for each cycle, source logical inconsistent class, \\
+    and inherited logical inconsistent class
+    """
+
+    def __init__(self, compact_class_hierarchy_graph, report_sink):
+        self.compact_class_hierarchy_graph = compact_class_hierarchy_graph
+        self.report_sink = report_sink
+        self.class_line_numbers = ClassLineNumbers(compact_class_hierarchy_graph)
+
+    def get_class_record(self, class_id):
+        """
+        Returns the class identifier, source path, and line number of the class with class_id \\
+        The source path and line number are None for an external class
+        """
+
+        is_in_graph = class_id != None and self.compact_class_hierarchy_graph.is_in_graph(class_id)
+        return {
+            "class": self.compact_class_hierarchy_graph.get_class_identifier(class_id),
+            "source_path": self.compact_class_hierarchy_graph.get_source_path(class_id) if is_in_graph else None,
+            "line": self.class_line_numbers.get_line_number(class_id)
+        }
+
+    def write_record(self, record):
+        self.report_sink.write(json.dumps(record) + "\n")
+
+    def write_cycle(self, scc):
+        self.write_record({
+            "type": CYCLE_INCONSISTENT_RECORD_TYPE,
+            "classes": [self.get_class_record(class_id) for class_id in scc]
+        })
+
+    def write_source_logical_inconsistent(self, class_id, x, y, inherited_class_with_differing_precedence):
+        record = { "type": SOURCE_LOGICAL_INCONSISTENT_RECORD_TYPE }
+        record.update(self.get_class_record(class_id))
+        record["x"] = self.get_class_record(x)
+        record["y"] = self.get_class_record(y)
+        record["inherited_class"] = self.compact_class_hierarchy_graph.get_class_identifier(inherited_class_with_differing_precedence)
+        self.write_record(record)
+
+    def write_inherited_logical_inconsistent(self, class_id, inherited_class_id, inherited_class_status):
+        record = { "type": INHERITED_LOGICAL_INCONSISTENT_RECORD_TYPE }
+        record.update(self.get_class_record(class_id))
+        record["inherited_class"] = self.compact_class_hierarchy_graph.get_class_identifier(inherited_class_id)
+        record["inherited_class_status"] = inherited_class_status.name
+        self.write_record(record)
+
+    def close(self):
+        self.report_sink.close()
+
+class SarifResultWriter(JsonLinesResultWriter):
+    """
+    Streams a SARIF log with one run to report_sink \\
+    There is one result for each class in a cycle, source logical inconsistent class, and inherited logical inconsistent class
+    """
+
+    def __init__(self, compact_class_hierarchy_graph, report_sink):
+        super().__init__(compact_class_hierarchy_graph, report_sink)
+        self.num_results = 0
+
+    def get_location(self, class_id):
+        """
+        Returns the SARIF location of the ClassDef of the class with class_id, None for an external class
+        """
+
+        if class_id == None or not self.compact_class_hierarchy_graph.is_in_graph(class_id):
+            return None
+
+        physical_location = { "artifactLocation": { "uri": get_sarif_uri(self.compact_class_hierarchy_graph.get_source_path(class_id)) } }
+        line_number = self.class_line_numbers.get_line_number(class_id)
+        if line_number != None:
+            physical_location["region"] = { "startLine": line_number }
+
+        return {
+            "physicalLocation": physical_location,
+            "logicalLocations": [{ "fullyQualifiedName": self.compact_class_hierarchy_graph.get_class_identifier(class_id), "kind": "type" }]
+        }
+
+    def write_result(self, record_type, class_id, message, related_class_ids=[]):
+        result = {
+            "ruleId": SARIF_RULES[record_type][0],
+            "level": "error",
+            "message": { "text": message },
+            "locations": [self.get_location(class_id)]
+        }
+
+        related_locations = []
+        for related_class_id in related_class_ids:
+            related_location = self.get_location(related_class_id)
+            if related_location != None:
+                related_location["id"] = len(related_locations)
+                related_locations.append(related_location)
+        if len(related_locations) > 0:
+            result["relatedLocations"] = related_locations
+
+        # the results are streamed inside the results array of the run
+        if self.num_results == 0:
+            self.report_sink.write(self.get_sarif_log_start() + json.dumps(result))
+        else:
+            self.report_sink.write(",\n" + json.dumps(result))
+        self.num_results += 1
+
+    def get_sarif_log_start(self):
+        rules = [{ "id": rule_id, "shortDescription": { "text": description } } for rule_id, description in SARIF_RULES.values()]
+        tool = { "driver": { "name": SARIF_TOOL_NAME, "informationUri": SARIF_TOOL_INFORMATION_URI, "rules": rules } }
+        return f'{{"version": "{SARIF_VERSION}", "$schema": "{SARIF_SCHEMA}", "runs": [{{"tool": {json.dumps(tool)}, "results": [\n'
+
+    def write_cycle(self, scc):
+        cycle_class_identifiers = self.compact_class_hierarchy_graph.get_class_identifiers(scc)
+        for class_id in scc:
+            class_identifier = self.compact_class_hierarchy_graph.get_class_identifier(class_id)
+            message = f"Class {class_identifier} is in cycle inheritance: {cycle_class_identifiers}. Class {class_identifier} is cycle inconsistent."
+            self.write_result(CYCLE_INCONSISTENT_RECORD_TYPE, class_id, message, [other_class_id for other_class_id in scc if other_class_id != class_id])
+
+    def write_source_logical_inconsistent(self, class_id, x, y, inherited_class_with_differing_precedence):
+        class_identifier = self.compact_class_hierarchy_graph.get_class_identifier(class_id)
+        x_identifier = self.compact_class_hierarchy_graph.get_class_identifier(x)
+        y_identifier = self.compact_class_hierarchy_graph.get_class_identifier(y)
+        inherited_class_identifier = self.compact_class_hierarchy_graph.get_class_identifier(inherited_class_with_differing_precedence)
+
+        message = f"Linearization of class {class_identifier} cannot be computed: class {x_identifier} before class {y_identifier} in local precedence order of class {class_identifier}, "
+        message += f"class {y_identifier} before class {x_identifier} in precedence order of class {inherited_class_identifier}. Class {class_identifier} is source logical inconsistent."
+        self.write_result(SOURCE_LOGICAL_INCONSISTENT_RECORD_TYPE, class_id, message, [x, y])
+
+    def write_inherited_logical_inconsistent(self, class_id, inherited_class_id, inherited_class_status):
+        class_identifier = self.compact_class_hierarchy_graph.get_class_identifier(class_id)
+        inherited_class_identifier = self.compact_class_hierarchy_graph.get_class_identifier(inherited_class_id)
+
+        message = f"Linearization of class {class_identifier} could not be computed since parent class {inherited_class_identifier} is {inherited_class_status.name.replace('_', ' ')}. "
+        message += f"Class {class_identifier} is inherited logical inconsistent."
+        self.write_result(INHERITED_LOGICAL_INCONSISTENT_RECORD_TYPE, class_id, message, [inherited_class_id])
+
+    def close(self):
+        if self.num_results == 0:
+            self.report_sink.write(self.get_sarif_log_start())
+        self.report_sink.write("\n]}]}\n")
+        self.report_sink.close()
+
+def get_sarif_uri(source_path):
+    """
+    Returns the SARIF artifact uri of source_path
+    """
+
+    path = pathlib.Path(source_path)
+    if path.is_absolute():
+        return path.as_uri()
+    return path.as_posix()
+
+def get_result_writer(output_format, compact_class_hierarchy_graph, report_sink):
+    """
+    Returns the result writer of output_format that streams to report_sink or None for OUTPUT_FORMAT_TEXT
+    """
+
+    if output_format == OUTPUT_FORMAT_JSONL:
+        return JsonLinesResultWriter(compact_class_hierarchy_graph, report_sink)
+    elif output_format == OUTPUT_FORMAT_SARIF:
+        return SarifResultWriter(compact_class_hierarchy_graph, report_sink)
+    return None
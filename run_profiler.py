@@ -0,0 +1,207 @@
+import contextlib
+import cProfile
+import functools
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+from util import *
+
+PROFILE_OPTION = "--profile"
+CPROFILE_PHASE_OPTION = "--cprofile-phase"
+
+FOLDER_WITH_PROFILES = "profiles"
+PROFILE_DUMP_SUFFIX = "_profile"
+PROFILE_STATS_EXTENSION = ".pstats"
+
+class RunProfiler:
+    """
+    Records the wall time, CPU time, and peak memory of each phase of a run, and the number of calls of counted functions \\
+    Phases are run one after another with phase, memory is traced with tracemalloc from start to close, \\
+    and the phase named cprofile_phase, if any, is also profiled with cProfile
+
+    The report is written as JSON to profile_report_path, and the pstats of cprofile_phase to a file next to it, see get_profile_stats_path
+    """
+
+    def __init__(self, script, path, profile_report_path, cprofile_phase = None):
+        self.script = script
+        self.path = path
+        self.profile_report_path = profile_report_path
+        self.cprofile_phase = cprofile_phase
+
+        # list of dict with phase, wall seconds, CPU seconds, peak memory bytes, memory bytes at the end, and calls of counted functions
+        # in the order that the phases ran
+        self.phases = []
+
+        # key: qualified name of counted function, value: number of calls
+        self.function_calls = dict()
+
+        self.profile_stats_path = None
+        self.start_wall_time = None
+        self.start_cpu_time = None
+
+    def start(self):
+        """
+        Starts the trace of memory allocations and the total times of the run
+        """
+
+        if not os.path.exists(FOLDER_WITH_PROFILES):
+            os.mkdir(FOLDER_WITH_PROFILES)
+
+        tracemalloc.start()
+        self.start_wall_time = time.perf_counter()
+        self.start_cpu_time = time.process_time()
+
+    def count_calls(self, owner, function_name):
+        """
+        Replaces the function function_name of owner, a class or module, with a function that counts its calls \\
+        Calls from within owner, including recursive calls, are counted as they look up function_name on owner
+        """
+
+        function = getattr(owner, function_name)
+        qualified_name = function.__qualname__
+        function_calls = self.function_calls
+        function_calls[qualified_name] = 0
+
+        @functools.wraps(function)
+        def counted_function(*args, **kwargs):
+            function_calls[qualified_name] += 1
+            return function(*args, **kwargs)
+
+        setattr(owner, function_name, counted_function)
+
+    @contextlib.contextmanager
+    def phase(self, phase):
+        """
+        Records the times, peak memory, and calls of counted functions of the statements within the with statement as phase
+        """
+
+        previous_function_calls = dict(self.function_calls)
+        profile = cProfile.Profile() if phase == self.cprofile_phase else None
+
+        tracemalloc.reset_peak()
+        start_wall_time = time.perf_counter()
+        start_cpu_time = time.process_time()
+        if profile != None:
+            profile.enable()
+
+        try:
+            yield
+        finally:
+            if profile != None:
+                profile.disable()
+            wall_seconds = time.perf_counter() - start_wall_time
+            cpu_seconds = time.process_time() - start_cpu_time
+            memory_bytes, peak_memory_bytes = tracemalloc.get_traced_memory()
+
+            function_calls = dict()
+            for qualified_name, num_calls in self.function_calls.items():
+                if num_calls != previous_function_calls[qualified_name]:
+                    function_calls[qualified_name] = num_calls - previous_function_calls[qualified_name]
+
+            self.phases.append({
+                "phase": phase,
+                "wall_seconds": wall_seconds,
+                "cpu_seconds": cpu_seconds,
+                "peak_memory_bytes": peak_memory_bytes,
+                "memory_bytes": memory_bytes,
+                "function_calls": function_calls
+            })
+
+            if profile != None:
+                self.profile_stats_path = get_profile_stats_path(self.profile_report_path, phase)
+                profile.dump_stats(self.profile_stats_path)
+
+    def close(self):
+        """
+        Stops the trace of memory allocations and writes the report
+        """
+
+        wall_seconds = time.perf_counter() - self.start_wall_time
+        cpu_seconds = time.process_time() - self.start_cpu_time
+        _, peak_memory_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        # the peaks of the phases, as the peak is reset at the start of each phase
+        for phase_info in self.phases:
+            peak_memory_bytes = max(peak_memory_bytes, phase_info["peak_memory_bytes"])
+
+        profile_report = {
+            "script": self.script,
+            "path": self.path,
+            "python_version": sys.version.split()[0],
+            "wall_seconds": wall_seconds,
+            "cpu_seconds": cpu_seconds,
+            "peak_memory_bytes": peak_memory_bytes,
+            "phases": self.phases,
+            "function_calls": self.function_calls,
+            "cprofile_phase": self.cprofile_phase,
+            "cprofile_stats_path": self.profile_stats_path
+        }
+
+        with open(self.profile_report_path, "w") as f:
+            json.dump(profile_report, f, indent=4)
+        f.close()
+
+    def print_info(self):
+        """
+        Prints the times and peak memory of each phase and the calls of counted functions
+        """
+
+        print(f"profile: written to {self.profile_report_path}")
+        for phase_info in self.phases:
+            print(f"    {phase_info['phase']}: {phase_info['wall_seconds']:.3f} s wall, {phase_info['cpu_seconds']:.3f} s CPU, "
+                  f"{phase_info['peak_memory_bytes'] / (1024 * 1024):.1f} MB peak memory")
+        for qualified_name, num_calls in self.function_calls.items():
+            print(f"    {qualified_name}: {num_calls} calls")
+
+        if self.cprofile_phase != None:
+            if self.profile_stats_path != None:
+                print(f"    cProfile of {self.cprofile_phase} written to {self.profile_stats_path}")
+            else:
+                print(f"    no phase {self.cprofile_phase} to profile with cProfile, phases: {', '.join(phase_info['phase'] for phase_info in self.phases)}")
+
+def get_run_profiler(path, name, run_type, profile_phases):
+    """
+    Returns the started run profiler of the --profile option for a run of run_type, graph or check, of the script with path, \\
+    the source code or graph file named name, or None if neither --profile nor --cprofile-phase is provided \\
+    --cprofile-phase <phase> also profiles phase, one of profile_phases, with cProfile \\
+    Exits if the phase is not one of profile_phases
+    """
+
+    cprofile_phase = get_option_value(CPROFILE_PHASE_OPTION)
+    if not has_option(PROFILE_OPTION) and not has_option(CPROFILE_PHASE_OPTION):
+        return None
+
+    if has_option(CPROFILE_PHASE_OPTION) and cprofile_phase not in profile_phases:
+        print(f"Error: {CPROFILE_PHASE_OPTION} expects one of {', '.join(profile_phases)}, got {cprofile_phase}")
+        exit(1)
+
+    run_profiler = RunProfiler(os.path.basename(sys.argv[0]), path, get_profile_report_path(name, run_type), cprofile_phase)
+    run_profiler.start()
+    return run_profiler
+
+def profile_phase(run_profiler, phase):
+    """
+    Returns the context manager of phase of run_profiler, or one that does nothing if run_profiler is None
+    """
+
+    if run_profiler == None:
+        return contextlib.nullcontext()
+    return run_profiler.phase(phase)
+
+def get_profile_report_path(name, run_type):
+    """
+    Returns the path of the profile report of a run of run_type, graph or check, for the source code or graph file named name
+    """
+
+    return os.path.join(FOLDER_WITH_PROFILES, name + "_" + run_type + PROFILE_DUMP_SUFFIX + ".json")
+
+def get_profile_stats_path(profile_report_path, phase):
+    """
+    Returns the path of the pstats file of phase next to the profile report at profile_report_path
+    """
+
+    return profile_report_path[:-len(".json")] + "_" + phase + PROFILE_STATS_EXTENSION
@@ -0,0 +1,34 @@
+import os
+import pickle
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# the scripts import their helper modules from the root of the repository
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+SAMPLE_CODEBASE_PATH = os.path.join(REPO_ROOT, "sample_inconsistent_codebase")
+
+def run_script(script, args, cwd):
+    """
+    Runs script of the repository with args in cwd, where it writes its output folders \\
+    Returns the output of the script, fails the test if it exits with an error
+    """
+
+    completed_process = subprocess.run([sys.executable, os.path.join(REPO_ROOT, script)] + args,
+                                       cwd=cwd, capture_output=True, text=True)
+    assert completed_process.returncode == 0, completed_process.stdout + completed_process.stderr
+    return completed_process.stdout
+
+def load_pickle(path):
+    """
+    Returns the object of the pickle dump file at path
+    """
+
+    with open(path, "rb") as f:
+        obj = pickle.load(f)
+    f.close()
+
+    return obj
@@ -0,0 +1,65 @@
+import struct
+from array import array
+
+import compact_class_hierarchy_graph
+from compact_class_hierarchy_graph import *
+
+CLASS_HIERARCHY_GRAPH = {
+    "pkg.a.A": (["pkg.b.B", "external.E"], "/src/pkg/a.py"),
+    "pkg.b.B": ([], "/src/pkg/b.py"),
+    "pkg.b.C": (["pkg.a.A", "pkg.b.B"], "/src/pkg/b.py")
+}
+
+def dump_graph_file(tmp_path):
+    """
+    Writes the binary graph file of CLASS_HIERARCHY_GRAPH to a folder of tmp_path that does not exist yet and returns its path
+    """
+
+    binary_graph_dump_path = str(tmp_path / "graphs" / "nested" / ("pkg" + BINARY_GRAPH_EXTENSION))
+    dump_binary_graph(CompactClassHierarchyGraph(CLASS_HIERARCHY_GRAPH), binary_graph_dump_path)
+    return binary_graph_dump_path
+
+def test_binary_graph_round_trip(tmp_path):
+    binary_graph_dump_path = dump_graph_file(tmp_path)
+
+    assert is_binary_graph_file(binary_graph_dump_path)
+    loaded_compact_class_hierarchy_graph = load_binary_graph(binary_graph_dump_path)
+    assert list(loaded_compact_class_hierarchy_graph.get_class_hierarchy_graph().items()) == list(CLASS_HIERARCHY_GRAPH.items())
+
+def test_truncated_binary_graph_is_not_loaded(tmp_path):
+    binary_graph_dump_path = dump_graph_file(tmp_path)
+    with open(binary_graph_dump_path, "rb") as f:
+        binary_graph_bytes = f.read()
+    f.close()
+
+    truncated_path = str(tmp_path / ("truncated" + BINARY_GRAPH_EXTENSION))
+    for size in range(len(binary_graph_bytes)):
+        with open(truncated_path, "wb") as f:
+            f.write(binary_graph_bytes[:size])
+        f.close()
+        assert load_binary_graph(truncated_path) == None
+
+def test_binary_graph_with_foreign_section_sizes_is_not_loaded(tmp_path):
+    binary_graph_dump_path = dump_graph_file(tmp_path)
+    with open(binary_graph_dump_path, "rb") as f:
+        binary_graph_bytes = f.read()
+    f.close()
+
+    header_size = struct.calcsize(BINARY_GRAPH_HEADER_FORMAT)
+    magic, version, class_id_size, num_classes, num_class_identifiers, num_edges, num_source_paths = \
+        struct.unpack_from(BINARY_GRAPH_HEADER_FORMAT, binary_graph_bytes)
+    for header in [struct.pack(BINARY_GRAPH_HEADER_FORMAT, magic, version, class_id_size, num_classes, 2 ** 40, num_edges, num_source_paths),
+                   struct.pack(BINARY_GRAPH_HEADER_FORMAT, magic, version, class_id_size, num_classes, num_class_identifiers, num_edges + 1, num_source_paths),
+                   struct.pack(BINARY_GRAPH_HEADER_FORMAT, magic, version, class_id_size, num_class_identifiers + 1, num_class_identifiers, num_edges, num_source_paths)]:
+        with open(binary_graph_dump_path, "wb") as f:
+            f.write(header + binary_graph_bytes[header_size:])
+        f.close()
+        assert load_binary_graph(binary_graph_dump_path) == None
+
+def test_dump_sections_does_not_byteswap_the_sections(tmp_path, monkeypatch):
+    monkeypatch.setattr(compact_class_hierarchy_graph.sys, "byteorder", "big")
+
+    section = array(CLASS_ID_TYPECODE, [1, 2, 3])
+    dump_sections(str(tmp_path / "sections"), b"", [section])
+
+    assert section == array(CLASS_ID_TYPECODE, [1, 2, 3])
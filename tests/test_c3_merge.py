@@ -0,0 +1,78 @@
+import random
+
+from benchmarks.reference_c3_merge import *
+
+NUM_GRAPHS = 500
+NUM_CLASSES = 12
+SEED = 0
+
+class PrecedenceOrderMismatchRecorder:
+    """
+    Result writer of get_c3_linearizations that keeps the source logical inconsistent information of each class, key: class id
+    """
+
+    def __init__(self):
+        self.precedence_order_mismatch_infos = dict()
+
+    def write_source_logical_inconsistent(self, class_id, x, y, inherited_class_with_differing_precedence):
+        self.precedence_order_mismatch_infos[class_id] = (x, y, inherited_class_with_differing_precedence)
+
+    def write_inherited_logical_inconsistent(self, class_id, inherited_class_id, inherited_class_linearization):
+        pass
+
+def get_random_graph(rng):
+    """
+    Returns a class hierarchy graph without cycles of NUM_CLASSES classes, each of which inherits from up to 3 earlier classes \\
+    in random order, and from an external class 10% of the time, so that many classes are source logical inconsistent
+    """
+
+    class_hierarchy_graph = dict()
+    for i in range(NUM_CLASSES):
+        inherited_class_identifiers = [f"m.C{j}" for j in rng.sample(range(i), min(i, rng.randrange(4)))]
+        if rng.random() < 0.1:
+            inherited_class_identifiers.insert(rng.randrange(len(inherited_class_identifiers) + 1), "external.E")
+        class_hierarchy_graph[f"m.C{i}"] = (inherited_class_identifiers, "/src/m.py")
+
+    return class_hierarchy_graph
+
+def get_c3_merge_results(compact_class_hierarchy_graph):
+    """
+    Returns the c3 linearizations, as lists of class ids or LinearizationStatus, and the source logical inconsistent information \\
+    of get_c3_linearizations, or the type of the exception that it raised
+    """
+
+    precedence_order_mismatch_recorder = PrecedenceOrderMismatchRecorder()
+    try:
+        c3_linearizations, linearization_nodes = get_c3_linearizations(compact_class_hierarchy_graph, set(), None, precedence_order_mismatch_recorder)
+    except Exception as e:
+        return type(e)
+
+    c3_linearizations = [linearization if isinstance(linearization, LinearizationStatus) else linearization_nodes.get_class_ids(linearization)
+                         for linearization in c3_linearizations]
+    return c3_linearizations, precedence_order_mismatch_recorder.precedence_order_mismatch_infos
+
+def get_reference_c3_merge_results(compact_class_hierarchy_graph):
+    """
+    Returns the results of get_reference_c3_linearizations, or the type of the exception that it raised
+    """
+
+    try:
+        return get_reference_c3_linearizations(compact_class_hierarchy_graph)
+    except Exception as e:
+        return type(e)
+
+def test_c3_merge_matches_reference_merge():
+    rng = random.Random(SEED)
+
+    num_source_logical_inconsistent = 0
+    for _ in range(NUM_GRAPHS):
+        compact_class_hierarchy_graph = CompactClassHierarchyGraph(get_random_graph(rng))
+
+        # the reference merge raises IndexError for some graphs in get_precedence_order_mismatch, which the merge keeps
+        c3_merge_results = get_c3_merge_results(compact_class_hierarchy_graph)
+        assert c3_merge_results == get_reference_c3_merge_results(compact_class_hierarchy_graph)
+
+        if isinstance(c3_merge_results, tuple):
+            num_source_logical_inconsistent += len(c3_merge_results[1])
+
+    assert num_source_logical_inconsistent > 0
@@ -0,0 +1,41 @@
+from class_linearizations import *
+from check_inheritance_consistency import *
+
+CLASS_HIERARCHY_GRAPH = {
+    "pkg.a.A": (["pkg.b.B", "external.E"], "/src/pkg/a.py"),
+    "pkg.b.B": ([], "/src/pkg/b.py"),
+    "pkg.b.C": (["pkg.a.A", "pkg.b.B"], "/src/pkg/b.py"),
+    "pkg.b.D": (["pkg.b.B", "pkg.a.A"], "/src/pkg/b.py")
+}
+
+def dump_class_linearizations_file(tmp_path):
+    """
+    Writes the class linearizations file of CLASS_HIERARCHY_GRAPH to tmp_path and returns its path
+    """
+
+    compact_class_hierarchy_graph = CompactClassHierarchyGraph(CLASS_HIERARCHY_GRAPH)
+    c3_linearizations, linearization_nodes = get_class_linearizations(compact_class_hierarchy_graph)
+
+    class_linearizations_dump_path = str(tmp_path / ("pkg" + CLASS_LINEARIZATIONS_DUMP_SUFFIX + CLASS_LINEARIZATIONS_EXTENSION))
+    dump_class_linearizations(compact_class_hierarchy_graph, c3_linearizations, linearization_nodes, class_linearizations_dump_path)
+    return class_linearizations_dump_path
+
+def test_class_linearizations_round_trip(tmp_path):
+    class_linearizations = load_class_linearizations(dump_class_linearizations_file(tmp_path))
+
+    assert class_linearizations.get_mro(class_linearizations.find_class_id("pkg.b.C")) == ["pkg.b.C", "pkg.a.A", "pkg.b.B", "external.E"]
+    assert class_linearizations.get("pkg.b.D") == LinearizationStatus.source_logical_inconsistent
+    assert class_linearizations.get("external.E") == None
+
+def test_truncated_class_linearizations_are_not_loaded(tmp_path):
+    class_linearizations_dump_path = dump_class_linearizations_file(tmp_path)
+    with open(class_linearizations_dump_path, "rb") as f:
+        class_linearizations_bytes = f.read()
+    f.close()
+
+    truncated_path = str(tmp_path / ("truncated" + CLASS_LINEARIZATIONS_EXTENSION))
+    for size in range(len(class_linearizations_bytes)):
+        with open(truncated_path, "wb") as f:
+            f.write(class_linearizations_bytes[:size])
+        f.close()
+        assert load_class_linearizations(truncated_path) == None
@@ -0,0 +1,181 @@
+import os
+import re
+
+import pytest
+
+from get_class_hierarchy_graph import *
+
+# pattern, path relative to the folder of the pattern, and whether the pattern matches the path
+PATTERN_CASES = [
+    # unanchored patterns match at any depth, patterns with a / are anchored to the folder of the pattern
+    ("foo.py", "foo.py", True),
+    ("foo.py", "a/b/foo.py", True),
+    ("/foo.py", "foo.py", True),
+    ("/foo.py", "a/foo.py", False),
+    ("a/foo.py", "a/foo.py", True),
+    ("a/foo.py", "b/a/foo.py", False),
+    ("*.py", "a/b.py", True),
+    ("a/*.py", "a/b.py", True),
+    ("a/*.py", "a/b/c.py", False),
+    ("?.py", "a.py", True),
+    ("?.py", "ab.py", False),
+    ("a?b", "a/b", False),
+
+    # leading **/, trailing /**, and /**/
+    ("**/foo", "foo", True),
+    ("**/foo", "a/b/foo", True),
+    ("**/a/foo", "x/a/foo", True),
+    ("**/a/foo", "x/b/foo", False),
+    ("a/**", "a/b", True),
+    ("a/**", "a/b/c.py", True),
+    ("a/**", "a", False),
+    ("a/**", "b/a/c", False),
+    ("a/**/b", "a/b", True),
+    ("a/**/b", "a/x/b", True),
+    ("a/**/b", "a/x/y/b", True),
+    ("a/**/b", "ab", False),
+    ("a/**/b", "a/x/bb", False),
+
+    # character classes
+    ("[abc].py", "b.py", True),
+    ("[abc].py", "d.py", False),
+    ("[!x].py", "y.py", True),
+    ("[!x].py", "x.py", False),
+    ("a[!x]b", "a/b", False),
+    ("[a-c]*.py", "cat.py", True),
+
+    # escaped characters
+    ("\\*.py", "*.py", True),
+    ("\\*.py", "a.py", False),
+    ("\\#a", "#a", True),
+    ("foo\\ ", "foo ", True),
+]
+
+# line of a .gitignore file, path relative to its folder, whether the path is a folder, and whether the path is excluded
+GITIGNORE_LINE_CASES = [
+    # trailing spaces are ignored unless they are escaped
+    ("foo  ", "foo", False, True),
+    ("foo  ", "foo ", False, False),
+    ("foo\\ ", "foo ", False, True),
+    ("foo\\ ", "foo", False, False),
+
+    # folder-only patterns
+    ("build/", "build", True, True),
+    ("build/", "build", False, False),
+    ("build/", "a/build", True, True),
+    ("/build/", "a/build", True, False),
+
+    # negation, comments, and blank lines
+    ("!foo.py", "foo.py", False, False),
+    ("#foo.py", "#foo.py", False, False),
+    ("\\!foo.py", "!foo.py", False, True),
+    ("", "foo.py", False, False),
+]
+
+@pytest.mark.parametrize("pattern, relative_path, is_match", PATTERN_CASES)
+def test_translate_ignore_pattern(pattern, relative_path, is_match):
+    assert (re.fullmatch(translate_ignore_pattern(pattern), relative_path) != None) == is_match
+
+@pytest.mark.parametrize("line, relative_path, is_folder, is_excluded", GITIGNORE_LINE_CASES)
+def test_gitignore_line(tmp_path, line, relative_path, is_folder, is_excluded):
+    with open(tmp_path / GITIGNORE_FILENAME, "w") as f:
+        f.write(line + "\n")
+    f.close()
+
+    root_path = str(tmp_path)
+    folder_ignore_rules = IgnoreRules(read_gitignore_files=True).for_root(root_path).get_folder_ignore_rules(root_path)
+    assert folder_ignore_rules.is_excluded(os.path.join(root_path, *relative_path.split("/")), is_folder) == is_excluded
+
+def write_files(root_path, files):
+    """
+    Writes files, key: path relative to root_path with / separators, value: contents
+    """
+
+    for relative_path, contents in files.items():
+        path = os.path.join(root_path, *relative_path.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(contents)
+        f.close()
+
+def get_scanned_module_paths(root_path, ignore_rules):
+    """
+    Returns the set of module paths of the Python scripts scanned within root_path with the rules of ignore_rules for the root
+    """
+
+    python_script_tasks = get_python_script_tasks(root_path, "", ignore_rules=ignore_rules.for_root(root_path))
+    return {module_path for _, module_path, _, _ in python_script_tasks}
+
+def test_negation_in_nested_gitignore(tmp_path):
+    root_path = str(tmp_path / "pkg")
+    write_files(root_path, {
+        ".gitignore": "*.py\n!/main.py\n",
+        "main.py": "",
+        "util.py": "",
+        "sub/.gitignore": "!keep.py\n",
+        "sub/keep.py": "",
+        "sub/other.py": "",
+        "sub/deeper/keep.py": ""
+    })
+
+    assert get_scanned_module_paths(root_path, IgnoreRules(read_gitignore_files=True)) == {"pkg.main", "pkg.sub.keep", "pkg.sub.deeper.keep"}
+
+def test_negation_does_not_include_path_in_excluded_folder(tmp_path):
+    root_path = str(tmp_path / "pkg")
+    write_files(root_path, {
+        ".gitignore": "build/\n!build/keep.py\nbuild.py/\n",
+        "build/keep.py": "",
+        "build/other.py": "",
+        "a/build/gen.py": "",
+        "build.py": "",
+        "main.py": ""
+    })
+
+    assert get_scanned_module_paths(root_path, IgnoreRules(read_gitignore_files=True)) == {"pkg.build", "pkg.main"}
+
+def test_exclude_and_include_patterns(tmp_path):
+    root_path = str(tmp_path / "pkg")
+    write_files(root_path, {
+        ".gitignore": "!tests/\n",
+        "a.py": "",
+        "tests/test_a.py": "",
+        "gen/a_pb2.py": "",
+        "sub/b.py": ""
+    })
+
+    # --exclude patterns take precedence over .gitignore files
+    ignore_rules = IgnoreRules(["tests/", "*_pb2.py"], ["sub/**"], True)
+    assert get_scanned_module_paths(root_path, ignore_rules) == {"pkg.sub.b"}
+
+def get_module_paths_by_listdir(source_code_path, relative_import_path):
+    """
+    Yields the source code path and module path of each Python script within source_code_path, \\
+    scanned with os.listdir as before the ignore rules, the reference for get_python_script_tasks without rules
+    """
+
+    name = os.path.basename(source_code_path)
+    if os.path.isfile(source_code_path) and source_code_path.endswith(PYTHON_SCRIPT_EXTENSION):
+        yield source_code_path, relative_import_path + name[:-len(PYTHON_SCRIPT_EXTENSION)]
+    elif os.path.isdir(source_code_path):
+        for filename in os.listdir(source_code_path):
+            yield from get_module_paths_by_listdir(os.path.join(source_code_path, filename), relative_import_path + name + ".")
+
+def test_scan_without_rules_matches_listdir_scan(tmp_path):
+    root_path = str(tmp_path / "pkg")
+    write_files(root_path, {
+        ".gitignore": "*.py\n",
+        "__init__.py": "",
+        "a.py": "",
+        "notes.txt": "",
+        "sub/__init__.py": "",
+        "sub/b.py": "",
+        "sub/deeper/c.py": "",
+        "sub/.hidden/d.py": ""
+    })
+
+    module_paths = list(get_module_paths_by_listdir(root_path, ""))
+    assert len(module_paths) == 6
+
+    for ignore_rules in [None, IgnoreRules().for_root(root_path)]:
+        python_script_tasks = get_python_script_tasks(root_path, "", ignore_rules=ignore_rules)
+        assert [(source_code_path, module_path) for source_code_path, module_path, _, _ in python_script_tasks] == module_paths
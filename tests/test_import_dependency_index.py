@@ -0,0 +1,50 @@
+from import_dependency_index import *
+from compact_class_hierarchy_graph import *
+
+CLASS_HIERARCHY_GRAPH = {
+    "pkg.a.A": ([], "/src/pkg/a.py"),
+    "pkg.a.A.Inner": (["external.E"], "/src/pkg/a.py"),
+    "pkg.b.B": (["pkg.a.A"], "/src/pkg/b.py"),
+    "pkg.c.C": ([], "/src/pkg/c.py"),
+    "pkg.d.D": (["pkg.c.C", "external.E"], "/src/pkg/d.py"),
+    "pkg.e.E": (["pkg.b.B"], "/src/pkg/e.py"),
+    "pkg.f.F": ([], "/src/pkg/f.py")
+}
+
+def get_import_dependency_index():
+    """
+    Returns the import dependency index where pkg.c imports pkg.a and pkg.f imports pkg.e
+    """
+
+    import_dependency_index = ImportDependencyIndex()
+    import_dependency_index.path_importers = {"pkg.a": {"pkg.c"}, "pkg.e": {"pkg.f"}}
+    return import_dependency_index
+
+def get_affected_class_identifiers_by_scan(import_dependency_index, paths, class_hierarchy_graph):
+    """
+    Returns the affected class identifiers of paths by a scan of every class of class_hierarchy_graph, the reference for get_affected_class_identifiers
+    """
+
+    dependent_paths = import_dependency_index.get_dependents(paths)
+    affected_class_identifiers = {class_identifier for class_identifier in class_hierarchy_graph
+                                  if class_identifier[:class_identifier.rfind(".")] in dependent_paths}
+
+    num_affected_class_identifiers = None
+    while num_affected_class_identifiers != len(affected_class_identifiers):
+        num_affected_class_identifiers = len(affected_class_identifiers)
+        for class_identifier, (inherited_class_identifiers, _) in class_hierarchy_graph.items():
+            if any(inherited_class_identifier in affected_class_identifiers for inherited_class_identifier in inherited_class_identifiers):
+                affected_class_identifiers.add(class_identifier)
+
+    return affected_class_identifiers
+
+def test_affected_class_identifiers():
+    import_dependency_index = get_import_dependency_index()
+    compact_class_hierarchy_graph = CompactClassHierarchyGraph(CLASS_HIERARCHY_GRAPH)
+
+    assert import_dependency_index.get_affected_class_identifiers(["pkg.a"], compact_class_hierarchy_graph) == \
+        {"pkg.a.A", "pkg.b.B", "pkg.c.C", "pkg.d.D", "pkg.e.E"}
+
+    for paths in [["pkg.a.A"], ["pkg.b"], ["pkg.e"], ["pkg.f"], ["pkg.b", "pkg.d"], ["pkg.g"]]:
+        assert import_dependency_index.get_affected_class_identifiers(paths, compact_class_hierarchy_graph) == \
+            get_affected_class_identifiers_by_scan(import_dependency_index, paths, CLASS_HIERARCHY_GRAPH)
@@ -0,0 +1,95 @@
+import os
+import shutil
+
+from conftest import SAMPLE_CODEBASE_PATH, load_pickle, run_script
+
+GRAPH_SCRIPT = "get_class_hierarchy_graph.py"
+
+def get_graph_path(cwd, name):
+    """
+    Returns the path of the class hierarchy graph pickle dump file of the source code named name, written in cwd
+    """
+
+    return os.path.join(cwd, "class_hierarchy_graphs", name + "_class_hierarchy_graph.pkl")
+
+def write_module(path, contents):
+    with open(path, "w") as f:
+        f.write(contents)
+    f.close()
+
+def assert_incremental_graph_matches_full_build(tmp_path, source_code_path, changed_paths):
+    """
+    Updates the graph in tmp_path/incremental with changed_paths and asserts that it is equal, \\
+    with the same order of classes, to the graph of a full build without the parse cache in tmp_path/full
+    """
+
+    incremental_cwd = str(tmp_path / "incremental")
+    full_cwd = str(tmp_path / "full")
+    os.makedirs(full_cwd, exist_ok=True)
+
+    run_script(GRAPH_SCRIPT, [source_code_path, "--incremental", "--changed-paths", ",".join(changed_paths)], incremental_cwd)
+    run_script(GRAPH_SCRIPT, [source_code_path, "--no-cache"], full_cwd)
+
+    name = os.path.basename(source_code_path)
+    incremental_graph = load_pickle(get_graph_path(incremental_cwd, name))
+    full_graph = load_pickle(get_graph_path(full_cwd, name))
+    assert list(incremental_graph.items()) == list(full_graph.items())
+
+def test_incremental_graph_matches_full_build(tmp_path):
+    source_code_path = str(tmp_path / "pkg")
+    shutil.copytree(SAMPLE_CODEBASE_PATH, source_code_path, ignore=shutil.ignore_patterns("__pycache__"))
+
+    # wildcard importer of a module whose names change
+    write_module(os.path.join(source_code_path, "base.py"), "class Base:\n    pass\n")
+    write_module(os.path.join(source_code_path, "star.py"),
+                 "from base import *\n\nclass S(Base):\n    pass\n\nclass T(Extra):\n    pass\n")
+
+    incremental_cwd = str(tmp_path / "incremental")
+    os.makedirs(incremental_cwd)
+    run_script(GRAPH_SCRIPT, [source_code_path, "--save-state"], incremental_cwd)
+
+    # added module
+    added_path = os.path.join(source_code_path, "added.py")
+    write_module(added_path, "from star import S\nfrom a import A\n\nclass N(S, A):\n    pass\n")
+    assert_incremental_graph_matches_full_build(tmp_path, source_code_path, [added_path])
+
+    # edited module, the names that star.py imports with its wildcard import change
+    base_path = os.path.join(source_code_path, "base.py")
+    write_module(base_path, "from b import Y\n\nclass Base(Y):\n    pass\n\nclass Extra:\n    pass\n")
+    assert_incremental_graph_matches_full_build(tmp_path, source_code_path, [base_path])
+
+    # edited modules of the sample codebase
+    a_path = os.path.join(source_code_path, "a.py")
+    write_module(a_path, "from b import B, Y\nfrom c import C\n\nclass A(C, B):\n    pass\n\nclass X:\n    pass\n")
+    assert_incremental_graph_matches_full_build(tmp_path, source_code_path, [a_path])
+
+    # deleted modules
+    os.remove(added_path)
+    assert_incremental_graph_matches_full_build(tmp_path, source_code_path, [added_path])
+
+    os.remove(base_path)
+    assert_incremental_graph_matches_full_build(tmp_path, source_code_path, [base_path])
+
+def test_incremental_without_changed_paths_warns(tmp_path):
+    source_code_path = str(tmp_path / "pkg")
+    shutil.copytree(SAMPLE_CODEBASE_PATH, source_code_path, ignore=shutil.ignore_patterns("__pycache__"))
+
+    cwd = str(tmp_path / "incremental")
+    os.makedirs(cwd)
+    run_script(GRAPH_SCRIPT, [source_code_path, "--save-state"], cwd)
+
+    output = run_script(GRAPH_SCRIPT, [source_code_path, "--incremental"], cwd)
+    assert "Warning: no changed paths" in output
+
+def test_incremental_graph_of_a_binary_graph_run(tmp_path):
+    source_code_path = str(tmp_path / "pkg")
+    shutil.copytree(SAMPLE_CODEBASE_PATH, source_code_path, ignore=shutil.ignore_patterns("__pycache__"))
+
+    incremental_cwd = str(tmp_path / "incremental")
+    os.makedirs(incremental_cwd)
+    run_script(GRAPH_SCRIPT, [source_code_path, "--save-state", "--graph-format", "binary"], incremental_cwd)
+
+    # the previous graph is the binary graph file, the incremental update writes the pickle dump file
+    added_path = os.path.join(source_code_path, "added.py")
+    write_module(added_path, "from a import A\n\nclass N(A):\n    pass\n")
+    assert_incremental_graph_matches_full_build(tmp_path, source_code_path, [added_path])
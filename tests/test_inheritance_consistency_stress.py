@@ -0,0 +1,187 @@
+import os
+from array import array
+
+from conftest import SAMPLE_CODEBASE_PATH, load_pickle, run_script
+
+from check_inheritance_consistency import *
+
+# deeper than the recursion limit, so that a recursive search fails with RecursionError
+CHAIN_DEPTH = 100000
+NUM_SUBCLASSES = 100000
+NUM_BASES = 1000
+
+def get_chain_graph(depth, cycle=False):
+    """
+    Returns the class hierarchy graph of an inheritance chain of depth classes, where class c<i> inherits from c<i - 1> \\
+    If cycle, class c0 inherits from the last class of the chain
+    """
+
+    class_hierarchy_graph = {"m.c0": ([f"m.c{depth - 1}"] if cycle else [], "m.py")}
+    for i in range(1, depth):
+        class_hierarchy_graph[f"m.c{i}"] = ([f"m.c{i - 1}"], "m.py")
+
+    return class_hierarchy_graph
+
+def get_fan_in_graph(num_subclasses, num_bases):
+    """
+    Returns the class hierarchy graph of num_subclasses classes that inherit from one base class \\
+    and of one class that inherits from the first num_bases of those classes
+    """
+
+    class_hierarchy_graph = {"m.Base": ([], "m.py")}
+    for i in range(num_subclasses):
+        class_hierarchy_graph[f"m.S{i}"] = (["m.Base"], "m.py")
+    class_hierarchy_graph["m.Many"] = ([f"m.S{i}" for i in range(num_bases)], "m.py")
+
+    return class_hierarchy_graph
+
+def get_linearization(compact_class_hierarchy_graph, c3_linearizations, linearization_nodes, class_identifier):
+    """
+    Returns the c3 linearization of class_identifier as a list of class identifiers, or its LinearizationStatus
+    """
+
+    linearization = c3_linearizations[compact_class_hierarchy_graph.find_class_id(class_identifier)]
+    if isinstance(linearization, LinearizationStatus):
+        return linearization
+    return compact_class_hierarchy_graph.get_class_identifiers(linearization_nodes.get_class_ids(linearization))
+
+def get_python_mro(class_hierarchy_graph, class_identifier):
+    """
+    Returns the MRO that Python computes for class_identifier, with classes created from class_hierarchy_graph, \\
+    as a list of class identifiers without object
+    """
+
+    classes = dict()
+    def get_class(identifier):
+        if identifier not in classes:
+            bases = tuple(get_class(inherited_class_identifier) for inherited_class_identifier in class_hierarchy_graph[identifier][0])
+            classes[identifier] = type(identifier, bases, {})
+        return classes[identifier]
+
+    return [cls.__name__ for cls in get_class(class_identifier).__mro__ if cls != object]
+
+def find_sccs_recursive(class_hierarchy_graph):
+    """
+    Recursive Tarjan's algorithm of the original checker on the dict class hierarchy graph, the reference for find_sccs
+    """
+
+    sccs = []
+
+    node_info = dict()  # key: class_identifier, value: [index, lowlink, onStack]
+    for class_identifier in class_hierarchy_graph:
+        node_info[class_identifier] = [None, None, False]
+
+    def strongconnect(v, index):
+        node_info[v][0] = index
+        node_info[v][1] = index
+        index += 1
+        stack.append(v)
+        node_info[v][2] = True
+
+        for w in class_hierarchy_graph[v][0]:
+            if w not in class_hierarchy_graph:
+                continue
+
+            if node_info[w][0] == None:
+                index = strongconnect(w, index)
+                node_info[v][1] = min(node_info[v][1], node_info[w][1])
+            elif node_info[w][2]:
+                node_info[v][1] = min(node_info[v][1], node_info[w][0])
+
+        if node_info[v][1] == node_info[v][0]:
+            scc = []
+            w = None
+            while w != v:
+                w = stack.pop()
+                node_info[w][2] = False
+                scc.append(w)
+            sccs.append(scc)
+
+        return index
+
+    index = 0
+    stack = []
+    for class_identifier in class_hierarchy_graph:
+        if node_info[class_identifier][0] == None:
+            index = strongconnect(class_identifier, index)
+
+    return sccs
+
+def get_linearization_order_recursive(class_hierarchy_graph, class_identifier, visited, linearization_order):
+    """
+    Recursive DFS of the original checker on the dict class hierarchy graph, the reference for get_linearization_order
+    """
+
+    if class_identifier in visited or class_identifier not in class_hierarchy_graph:
+        return
+
+    visited.add(class_identifier)
+
+    for inherited_class_identifier in class_hierarchy_graph[class_identifier][0]:
+        get_linearization_order_recursive(class_hierarchy_graph, inherited_class_identifier, visited, linearization_order)
+
+    linearization_order.append(class_identifier)
+
+def get_linearization_order_identifiers(compact_class_hierarchy_graph):
+    """
+    Returns the linearization order of the whole graph with get_linearization_order, as class identifiers
+    """
+
+    visited = bytearray(compact_class_hierarchy_graph.num_classes)
+    linearization_order = array(CLASS_ID_TYPECODE)
+    for class_id in range(compact_class_hierarchy_graph.num_classes):
+        get_linearization_order(compact_class_hierarchy_graph, class_id, visited, linearization_order)
+
+    return compact_class_hierarchy_graph.get_class_identifiers(linearization_order)
+
+def test_sample_codebase_matches_recursive_search(tmp_path):
+    run_script("get_class_hierarchy_graph.py", [SAMPLE_CODEBASE_PATH, "--no-cache"], str(tmp_path))
+    class_hierarchy_graph = load_pickle(os.path.join(str(tmp_path), "class_hierarchy_graphs",
+                                                     "sample_inconsistent_codebase_class_hierarchy_graph.pkl"))
+    compact_class_hierarchy_graph = CompactClassHierarchyGraph(class_hierarchy_graph)
+
+    sccs = [compact_class_hierarchy_graph.get_class_identifiers(scc) for scc in find_sccs(compact_class_hierarchy_graph)]
+    assert sccs == find_sccs_recursive(class_hierarchy_graph)
+    assert any(len(scc) > 1 for scc in sccs)
+
+    visited = set()
+    linearization_order = []
+    for class_identifier in class_hierarchy_graph:
+        get_linearization_order_recursive(class_hierarchy_graph, class_identifier, visited, linearization_order)
+    assert get_linearization_order_identifiers(compact_class_hierarchy_graph) == linearization_order
+
+def test_deep_inheritance_chain():
+    class_hierarchy_graph = get_chain_graph(CHAIN_DEPTH)
+    compact_class_hierarchy_graph = CompactClassHierarchyGraph(class_hierarchy_graph)
+
+    sccs = find_sccs(compact_class_hierarchy_graph)
+    assert len(sccs) == CHAIN_DEPTH
+    assert all(len(scc) == 1 for scc in sccs)
+
+    assert get_linearization_order_identifiers(compact_class_hierarchy_graph) == list(class_hierarchy_graph)
+
+    c3_linearizations, linearization_nodes = get_class_linearizations(compact_class_hierarchy_graph)
+    linearization = get_linearization(compact_class_hierarchy_graph, c3_linearizations, linearization_nodes, f"m.c{CHAIN_DEPTH - 1}")
+    assert linearization == [f"m.c{i}" for i in range(CHAIN_DEPTH - 1, -1, -1)]
+
+def test_deep_inheritance_cycle():
+    compact_class_hierarchy_graph = CompactClassHierarchyGraph(get_chain_graph(CHAIN_DEPTH, cycle=True))
+
+    sccs = find_sccs(compact_class_hierarchy_graph)
+    assert len(sccs) == 1
+    assert len(sccs[0]) == CHAIN_DEPTH
+
+    class_statuses = get_class_statuses(compact_class_hierarchy_graph)
+    assert set(class_statuses.values()) == {LinearizationStatus.cycle_inconsistent}
+
+def test_wide_fan_in_hierarchy():
+    class_hierarchy_graph = get_fan_in_graph(NUM_SUBCLASSES, NUM_BASES)
+    compact_class_hierarchy_graph = CompactClassHierarchyGraph(class_hierarchy_graph)
+
+    sccs = [compact_class_hierarchy_graph.get_class_identifiers(scc) for scc in find_sccs(compact_class_hierarchy_graph)]
+    assert sccs == find_sccs_recursive(class_hierarchy_graph)
+
+    c3_linearizations, linearization_nodes = get_class_linearizations(compact_class_hierarchy_graph)
+    for class_identifier in ["m.Base", "m.S0", f"m.S{NUM_SUBCLASSES - 1}", "m.Many"]:
+        linearization = get_linearization(compact_class_hierarchy_graph, c3_linearizations, linearization_nodes, class_identifier)
+        assert linearization == get_python_mro(class_hierarchy_graph, class_identifier)
@@ -0,0 +1,61 @@
+import ast
+
+import pytest
+
+from util import *
+
+# contents of Python files, as bytes so that their coding declaration is used, and whether they have top-level statements
+# that are kept by get_module_summary
+PYTHON_SCRIPT_CASES = [
+    # class only inside a string or comment
+    (b"print('class A: pass')\n", False),
+    (b"# class A:\nprint(1)\n", False),
+    (b"print(1)  # import os\n", False),
+    (b"print('''\nx = 1\n''')\n", False),
+    (b"print(f'{x}: {y}')\n", False),
+    (b"print('a = 1'); print(\"b: int\")\n", False),
+
+    # statements after a backslash line continuation
+    (b"print(1, \\\n      2)\n", False),
+    (b"x \\\n    = 1\n", True),
+    (b"print(1) \\\n    ; x = 1\n", True),
+    (b"print \\\n    (1); print(2)\n", False),
+
+    # ;-joined statements
+    (b"print(1); x = 1\n", True),
+    (b"print(1); import os\n", True),
+    (b"print(1); print(2)\n", False),
+    (b"pass; x: int\n", True),
+    (b"if x: y = 1; z = 2\n", False),
+    (b"for x in y: pass\nprint(x); z = x\n", True),
+
+    # non-UTF-8 PEP 263 coding declaration
+    (b"# -*- coding: latin-1 -*-\nprint('\xe9')\n", False),
+    (b"# -*- coding: latin-1 -*-\nx = '\xe9'\n", True),
+    (b"# vim: set fileencoding=cp1252 :\nprint('\x93a = 1\x94')\n", False),
+
+    # only nested defs
+    (b"if True:\n    def f():\n        pass\n", False),
+    (b"try:\n    class A:\n        pass\nexcept ImportError:\n    import os\n", False),
+    (b"with open(p) as f:\n    def g(): x = 1\n", False),
+    (b"def f():\n    def g():\n        pass\n", True),
+
+    # assignments and other statements
+    (b"x: int = 1\n", True),
+    (b"x += 1\n", False),
+    (b"x == 1\n", False),
+    (b"assert x, 'y = 1'\n", False),
+    (b"d = {'a': 1}\n", True),
+    (b"print(lambda x: x)\n", False),
+    (b"", False),
+]
+
+@pytest.mark.parametrize("python_script_bytes, expected", PYTHON_SCRIPT_CASES)
+def test_has_module_summary_statements(python_script_bytes, expected):
+    python_script_contents = decode_python_script(python_script_bytes)
+
+    # the pre-filter never skips a Python file whose module summary has statements
+    has_statements = len(get_module_summary(ast.parse(python_script_contents)).body) > 0
+    assert has_statements == expected
+
+    assert has_module_summary_statements(python_script_contents) == expected
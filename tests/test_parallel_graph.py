@@ -0,0 +1,36 @@
+import email
+import os
+
+from conftest import SAMPLE_CODEBASE_PATH, run_script
+
+GRAPH_SCRIPT = "get_class_hierarchy_graph.py"
+
+# Python source code of the standard library, with packages, relative imports, and wildcard imports
+EMAIL_PACKAGE_PATH = os.path.dirname(email.__file__)
+
+def get_graph_bytes(tmp_path, source_code_path, args):
+    """
+    Builds the class hierarchy graph of source_code_path with args in a folder of tmp_path for args, \\
+    so that a build with the same args uses the parse cache of the previous one \\
+    Returns the bytes of the pickle dump file of the graph
+    """
+
+    cwd = str(tmp_path / "_".join(arg.strip("-") for arg in args))
+    os.makedirs(cwd, exist_ok=True)
+    run_script(GRAPH_SCRIPT, [source_code_path] + args, cwd)
+
+    with open(os.path.join(cwd, "class_hierarchy_graphs", os.path.basename(source_code_path) + "_class_hierarchy_graph.pkl"), "rb") as f:
+        graph_bytes = f.read()
+    f.close()
+
+    return graph_bytes
+
+def test_parallel_graph_matches_serial_graph(tmp_path):
+    for source_code_path in [SAMPLE_CODEBASE_PATH, EMAIL_PACKAGE_PATH]:
+        source_tmp_path = tmp_path / os.path.basename(source_code_path)
+        serial_graph_bytes = get_graph_bytes(source_tmp_path, source_code_path, ["--no-cache", "--jobs", "1"])
+        assert get_graph_bytes(source_tmp_path, source_code_path, ["--no-cache", "--jobs", "4"]) == serial_graph_bytes
+
+        # cold, then warm parse cache
+        for _ in range(2):
+            assert get_graph_bytes(source_tmp_path, source_code_path, ["--jobs", "4"]) == serial_graph_bytes
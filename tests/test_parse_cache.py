@@ -0,0 +1,53 @@
+import functools
+import glob
+import hashlib
+import os
+import re
+
+from conftest import SAMPLE_CODEBASE_PATH, run_script
+
+from get_class_hierarchy_graph import *
+
+GRAPH_SCRIPT = "get_class_hierarchy_graph.py"
+
+def get_num_python_scripts_read(output):
+    """
+    Returns the number of Python files read ahead in the output of a graph build
+    """
+
+    return int(re.search(r"read ahead: (\d+) Python files", output).group(1))
+
+def test_each_python_file_is_read_once(tmp_path):
+    num_python_scripts = len(glob.glob(os.path.join(SAMPLE_CODEBASE_PATH, "**", "*.py"), recursive=True))
+
+    # cold parse cache, then warm parse cache
+    for _ in range(2):
+        output = run_script(GRAPH_SCRIPT, [SAMPLE_CODEBASE_PATH], str(tmp_path))
+        assert get_num_python_scripts_read(output) == num_python_scripts
+
+def test_parse_cache_entry_is_of_the_parsed_contents(tmp_path):
+    source_code_path = str(tmp_path / "m.py")
+    with open(source_code_path, "w") as f:
+        f.write("class A:\n    pass\n")
+    f.close()
+
+    def map_and_edit(function, python_script_tasks):
+        """
+        Edits each Python file, then reads it and runs its task as PythonScriptReader.map does
+        """
+
+        for python_script_task in python_script_tasks:
+            with open(python_script_task[0], "w") as f:
+                f.write("class B:\n    pass\n")
+            f.close()
+            yield function(python_script_task, read_python_script(python_script_task[0]))
+
+    parse_cache = ParseCache(str(tmp_path / "parse_cache.pkl"), DEFAULT_PARSE_CACHE_MAX_SIZE_MB * 1024 * 1024)
+    get_alias_info_from_task = functools.partial(get_alias_info_from_python_script_task, None, None, True, False)
+    python_script_tasks = [(source_code_path, "m", None, ())]
+    list(get_parsed_python_scripts(python_script_tasks, get_alias_info_from_task, map_and_edit, "", parse_cache))
+
+    content_hash, _, _, _, _ = parse_cache.entries[source_code_path]
+    assert content_hash == hashlib.sha256(b"class B:\n    pass\n").hexdigest()
+    module_summary, _ = parse_cache.load_parsed_python_script(source_code_path)
+    assert [node.name for node in module_summary.body] == ["B"]
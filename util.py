@@ -1,13 +1,48 @@
 import ast
 import enum
+import io
 import os
+import re
 import sys
+import tokenize
 
 DIRECTORY_SEPARATOR = { "\\", "/" }
 
 FOLDER_WITH_CLASS_HIERARCHY_GRAPHS = "class_hierarchy_graphs"
 CLASS_HIERARCHY_GRAPH_DUMP_SUFFIX = "_class_hierarchy_graph"
 
+# keywords that start the top-level statements kept by get_module_summary, other than Assign and AnnAssign
+MODULE_SUMMARY_KEYWORDS = { "class", "def", "del", "from", "import" }
+
+# keywords that start compound statements that are not kept by get_module_summary, the rest of their line is not top-level
+COMPOUND_STATEMENT_KEYWORDS = { "async", "elif", "else", "except", "finally", "for", "if", "try", "while", "with" }
+
+# keywords that start simple statements that are not Assign or AnnAssign
+NON_ASSIGNMENT_STATEMENT_KEYWORDS = { "assert", "break", "continue", "global", "nonlocal", "pass", "raise", "return" }
+
+# line that starts with a keyword of MODULE_SUMMARY_KEYWORDS
+MODULE_SUMMARY_LINE_PATTERN = re.compile(r"^(?:class|def|del|from|import)\b", re.MULTILINE)
+
+# tokens of Python source code scanned by has_module_summary_statements: strings (with any prefix), comments, explicit line joins,
+# brackets, line ends, semicolons, and operators that end with = or are :
+PYTHON_TOKEN_PATTERN = re.compile(
+    r"(?P<string>[rRbBuUfF]{0,2}(?:"
+    r'"""[^"\\]*(?:(?:\\.|"(?!""))[^"\\]*)*"""'
+    r"|'''[^'\\]*(?:(?:\\.|'(?!''))[^'\\]*)*'''"
+    r'|"[^"\\\r\n]*(?:\\.[^"\\\r\n]*)*"'
+    r"|'[^'\\\r\n]*(?:\\.[^'\\\r\n]*)*'))"
+    r"|(?P<comment>#[^\r\n]*)"
+    r"|(?P<line_join>\\(?:\r\n|\r|\n))"
+    r"|(?P<open_bracket>[(\[{])"
+    r"|(?P<close_bracket>[)\]}])"
+    r"|(?P<line_end>\r\n|\r|\n)"
+    r"|(?P<semicolon>;)"
+    r"|(?P<operator>[-+*/%&|^@<>!=:]*=|:)",
+    re.DOTALL)
+
+# indentation, then whitespace and explicit line joins, and first word of a statement
+PYTHON_STATEMENT_START_PATTERN = re.compile(r"([ \t\f]*)(?:[ \t\f]|\\(?:\r\n|\r|\n))*(\w*)")
+
 class PathType(enum.Enum):
     file = 0
     folder = file + 1
@@ -47,26 +82,54 @@ def get_path(argument_index, usage_info):
 
     return None
 
-def get_name_directory_or_file(path):
+def has_option(option):
+    """
+    Returns whether option, e. g. --no-cache, is provided as a command line argument
+    """
+
+    return option in sys.argv
+
+def get_option_value(option, default=None):
+    """
+    Gets the value provided after option, e. g. --jobs 4, from command line arguments \\
+    Returns the value or default if option is not provided or is not followed by a value
+    """
+
+    argv = sys.argv
+    if option not in argv:
+        return default
+
+    value_index = argv.index(option) + 1
+    if value_index >= len(argv):
+        return default
+
+    return argv[value_index]
+
+def get_name_directory_or_file(path, is_file = None):
     """
     Given a path to a directory or file \\
-    returns the respective directory name or filename
+    returns the respective directory name or filename \\
+    is_file is whether path is a file, checked with the file system if not provided
 
     Examples: \\
     given <path to file>/filename.py, returns filename \\
     given <path to folder>/name_of_folder, returns name_of_folder
     """
 
-    name = ""
-    index = len(path) - 1
-    if os.path.isfile(path):
-        index = path.rfind(".") - 1
+    if is_file == None:
+        is_file = os.path.isfile(path)
 
-    while index >= 0 and path[index] not in DIRECTORY_SEPARATOR:
-        name = path[index] + name
-        index -= 1
+    end_index = len(path)
+    if is_file:
+        end_index = path.rfind(".")
+        if end_index <= 0:
+            return ""
 
-    return name
+    begin_index = 0
+    for separator in DIRECTORY_SEPARATOR:
+        begin_index = max(begin_index, path.rfind(separator, 0, end_index) + 1)
+
+    return path[begin_index:end_index]
 
 def get_parent_path(path):
     """
@@ -84,6 +147,15 @@ def get_parent_path(path):
 
     return path[:directory_separator_index]
 
+def create_dump_folder(dump_folder):
+    """
+    Creates dump_folder, the folder of a dump file, and its missing parent folders if it does not exist \\
+    Nothing is created if dump_folder is empty, i. e. the dump file is in the current folder
+    """
+
+    if dump_folder and not os.path.exists(dump_folder):
+        os.makedirs(dump_folder, exist_ok=True)
+
 def path_contains_os_directory_separator(path):
     """
     Given a path, checks to see if it contains os directory separator
@@ -184,19 +256,181 @@ def get_ast_node_str(ast_node, field_name=None):
         return ast_node_str
     return None
 
-def get_path_of_node_module(node, source_code_path, codebase_parent_path, codebase_root_path, alias_name):
+def get_module_summary(ast_parse):
+    """
+    Given ast_parse, the ast.Module of a Python file, returns a compact ast.Module that only keeps \\
+    the top-level statements used for alias info and the class hierarchy graph \\
+    (Import, ImportFrom, ClassDef, FunctionDef, Assign, AnnAssign, Delete)
+
+    ClassDef nodes only keep name and bases, FunctionDef nodes only keep name \\
+    and Assign and AnnAssign nodes only keep targets
+    """
+
+    body = []
+    for node in ast_parse.body:
+        summary_node = None
+        if isinstance(node, ast.Import) or isinstance(node, ast.ImportFrom) or isinstance(node, ast.Delete):
+            summary_node = node
+        elif isinstance(node, ast.ClassDef):
+            summary_node = ast.ClassDef(name=node.name, bases=node.bases, keywords=[], body=[], decorator_list=[])
+        elif isinstance(node, ast.FunctionDef):
+            summary_node = ast.FunctionDef(name=node.name, args=None, body=[], decorator_list=[])
+        elif isinstance(node, ast.Assign):
+            summary_node = ast.Assign(targets=node.targets, value=None)
+        elif isinstance(node, ast.AnnAssign):
+            summary_node = ast.AnnAssign(target=node.target, annotation=None, value=None, simple=node.simple)
+
+        if summary_node != None:
+            if summary_node is not node:
+                ast.copy_location(summary_node, node)
+            body.append(summary_node)
+
+    return ast.Module(body=body, type_ignores=[])
+
+def read_python_script(source_code_path):
+    """
+    Returns the contents of the Python file at source_code_path as bytes, decoded by decode_python_script
+    """
+
+    with open(source_code_path, "rb") as f:
+        python_script_bytes = f.read()
+    f.close()
+
+    return python_script_bytes
+
+def decode_python_script(python_script_bytes):
+    """
+    Returns python_script_bytes, the contents of a Python file, decoded with the encoding of its coding declaration or UTF-8 BOM \\
+    or UTF-8 otherwise, as the interpreter does (PEP 263), instead of the default encoding of the platform \\
+    Raises SyntaxError or UnicodeDecodeError if the contents cannot be decoded
+
+    Line ends are kept as they are, the ast parse and has_module_summary_statements handle \\r\\n and \\r
+    """
+
+    encoding, _ = tokenize.detect_encoding(io.BytesIO(python_script_bytes).readline)
+    return python_script_bytes.decode(encoding)
+
+def has_module_summary_statements(python_script_contents):
+    """
+    Returns whether python_script_contents, the contents of a Python file, may have top-level statements \\
+    that are kept by get_module_summary, without an ast parse \\
+    Returns True for contents that can be parsed and have such statements, and may return True for contents without them
+
+    Lines that start with a keyword of MODULE_SUMMARY_KEYWORDS are searched for first \\
+    Otherwise, the tokens of PYTHON_TOKEN_PATTERN are scanned for the top-level statements: \\
+    a top-level statement that does not start with a keyword may be an Assign or AnnAssign if it has = or : outside of brackets
+    """
+
+    if MODULE_SUMMARY_LINE_PATTERN.search(python_script_contents):
+        return True
+
+    # left to the ast parse, which fails for these contents
+    if "\0" in python_script_contents or python_script_contents.startswith("\ufeff"):
+        return True
+
+    depth = 0
+
+    # whether the statement of the current logical line is top-level, so that a semicolon starts another top-level statement,
+    # and whether it may be an Assign or AnnAssign
+    is_top_level_statement = False
+    may_be_assignment = False
+
+    # position of the next statement and whether it is at the start of a line
+    statement_start = 0
+    at_line_start = True
+
+    position = 0
+    while True:
+        if statement_start != None:
+            indentation, word = PYTHON_STATEMENT_START_PATTERN.match(python_script_contents, statement_start).groups()
+
+            # a form feed resets the indentation
+            if at_line_start and indentation and indentation[-1] != "\f":
+                is_top_level_statement = False
+                may_be_assignment = False
+            elif word in MODULE_SUMMARY_KEYWORDS:
+                return True
+            else:
+                is_top_level_statement = word not in COMPOUND_STATEMENT_KEYWORDS
+                may_be_assignment = is_top_level_statement and word not in NON_ASSIGNMENT_STATEMENT_KEYWORDS
+            statement_start = None
+
+        token = PYTHON_TOKEN_PATTERN.search(python_script_contents, position)
+        if token == None:
+            break
+        position = token.end()
+
+        token_type = token.lastgroup
+        if token_type == "open_bracket":
+            depth += 1
+        elif token_type == "close_bracket":
+            depth -= 1
+            if depth < 0:
+                return True
+        elif depth > 0:
+            continue
+        elif token_type == "line_end":
+            statement_start = position
+            at_line_start = True
+        elif token_type == "semicolon" and is_top_level_statement:
+            statement_start = position
+            at_line_start = False
+        elif token_type == "operator" and may_be_assignment and token.group() in ("=", ":"):
+            return True
+
+    # unclosed brackets, the contents cannot be parsed or were not scanned as by the parser
+    return depth != 0
+
+def get_root_name_of_module(module, root_name, module_search_index = None):
+    """
+    Returns the name of the root that the non-relative import of module in dot notation resolves to: \\
+    the root of the longest prefix of module in module_search_index, see get_module_search_index in get_class_hierarchy_graph.py \\
+    or root_name, the name of the root of the importing Python script, if module_search_index is not provided or has no prefix of module
+    """
+
+    if module_search_index != None:
+        module_prefix = module
+        while True:
+            if module_prefix in module_search_index:
+                return module_search_index[module_prefix]
+
+            dot_index = module_prefix.rfind(".")
+            if dot_index == -1:
+                break
+            module_prefix = module_prefix[:dot_index]
+
+    return root_name
+
+def get_path_of_node_module(node, source_code_path, codebase_parent_path, codebase_root_path, alias_name, module_search_index = None,
+                            package_module_paths = None):
     """
     Given an Import or ImportFrom node, source code path, codebase parent path, codebase root path, and alias_name \\
     alias_name only used if node is ast.Import \\
     returns the path of node module in codebase or None if none
+
+    If module_search_index of a multi-root run is provided, non-relative imports are resolved against the roots in it
+
+    package_module_paths are the module paths of the folders that source_code_path is in, nearest first, \\
+    see ModulePathIndex, so that relative imports within the root and the name of the root are found without string scanning of paths
     """
 
     # edge case of the os drive name in module not handled
 
+    root_name = None
+    if package_module_paths:
+        root_name = package_module_paths[-1]
+    else:
+        root_name = get_name_directory_or_file(codebase_root_path)
+
     if isinstance(node, ast.ImportFrom):
         module = node.module
         num_dots = node.level
-        if node.level > 0:
+        if package_module_paths != None and 0 < num_dots <= len(package_module_paths):
+            resolved_path = package_module_paths[num_dots - 1]
+            if module:
+                resolved_path += "." + module
+            return resolved_path
+        elif node.level > 0: # relative ImportFrom from outside of the packages of the root
             path = source_code_path
             for i in range(num_dots):
                 path = get_parent_path(path)
@@ -214,9 +448,9 @@ def get_path_of_node_module(node, source_code_path, codebase_parent_path, codeba
             else:
                 return None
         else: # non-relative ImportFrom
-            return get_name_directory_or_file(codebase_root_path) + "." + module
+            return get_root_name_of_module(module, root_name, module_search_index) + "." + module
     elif isinstance(node, ast.Import):
-        return get_name_directory_or_file(codebase_root_path) + "." + alias_name
+        return get_root_name_of_module(alias_name, root_name, module_search_index) + "." + alias_name
 
 def remove_alias_str_entry(node, dct):
     """
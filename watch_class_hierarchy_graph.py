@@ -0,0 +1,336 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+
+from check_inheritance_consistency import LinearizationStatus, get_class_statuses, get_changed_class_identifiers, \
+    get_affected_class_identifiers, get_affected_class_statuses, get_status_changes, print_status_changes
+from compact_class_hierarchy_graph import CompactClassHierarchyGraph
+from get_class_hierarchy_graph import CACHE_SIZE_OPTION, JOBS_OPTION, NO_CACHE_OPTION, PYTHON_SCRIPT_EXTENSION, \
+    build_class_hierarchy_graph, get_positive_int_option
+from parse_cache import *
+from util import *
+
+SOURCE_CODE_PATH_ARGUMENT_INDEX = 1 # 0-indexed
+
+POLL_OPTION = "--poll"
+POLL_INTERVAL_OPTION = "--poll-interval-ms"
+DEFAULT_POLL_INTERVAL_MS = 500
+
+# changes are collected until no event is received for DEBOUNCE_MS, as editors write a file in several steps
+DEBOUNCE_MS = 50
+
+# inotify(7) event masks
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+INOTIFY_WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+INOTIFY_EVENT_HEADER_FORMAT = "iIII"    # wd, mask, cookie, len
+INOTIFY_EVENT_HEADER_SIZE = struct.calcsize(INOTIFY_EVENT_HEADER_FORMAT)
+INOTIFY_READ_SIZE = 1 << 16
+
+def is_watched_path(path, is_directory):
+    """
+    Returns whether a change of path can change the class hierarchy graph: Python files and folders
+    """
+
+    return is_directory or path.endswith(PYTHON_SCRIPT_EXTENSION)
+
+class InotifyWatcher:
+    """
+    Watches the folders under source_code_path with inotify(7) \\
+    Folders that are created are watched as they are found \\
+    If source_code_path is a Python file, its folder is watched, as editors may replace the file when saving it
+    """
+
+    def __init__(self, source_code_path):
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        # key: watch descriptor, value: path of watched folder
+        self.watch_paths = dict()
+
+        self.source_file_path = None
+        if os.path.isdir(source_code_path):
+            self.add_watches(source_code_path)
+        else:
+            self.source_file_path = source_code_path
+            self.add_watch(os.path.dirname(source_code_path))
+
+    def add_watches(self, path):
+        """
+        Watches the folder at path and the folders under it
+        """
+
+        self.add_watch(path)
+        for folder_path, folder_names, _ in os.walk(path):
+            for folder_name in folder_names:
+                self.add_watch(os.path.join(folder_path, folder_name))
+
+    def add_watch(self, path):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), INOTIFY_WATCH_MASK)
+        if wd >= 0:
+            self.watch_paths[wd] = path
+
+    def get_changed_paths(self, timeout):
+        """
+        Waits up to timeout seconds for changes \\
+        Returns the paths of changed, added, and deleted Python files and folders
+        """
+
+        changed_paths = set()
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        while len(ready) > 0:
+            self.read_events(changed_paths)
+            ready, _, _ = select.select([self.fd], [], [], DEBOUNCE_MS / 1000)
+
+        return changed_paths
+
+    def read_events(self, changed_paths):
+        try:
+            buffer = os.read(self.fd, INOTIFY_READ_SIZE)
+        except BlockingIOError:
+            return
+
+        offset = 0
+        while offset + INOTIFY_EVENT_HEADER_SIZE <= len(buffer):
+            wd, mask, _, name_length = struct.unpack_from(INOTIFY_EVENT_HEADER_FORMAT, buffer, offset)
+            name = buffer[offset + INOTIFY_EVENT_HEADER_SIZE:offset + INOTIFY_EVENT_HEADER_SIZE + name_length].rstrip(b"\0")
+            offset += INOTIFY_EVENT_HEADER_SIZE + name_length
+
+            if mask & IN_Q_OVERFLOW:
+                # events were dropped, every watched folder is taken as changed
+                changed_paths.update(self.watch_paths.values())
+                continue
+
+            watch_path = self.watch_paths.get(wd)
+            if watch_path == None:
+                continue
+
+            if mask & IN_IGNORED:
+                del self.watch_paths[wd]
+                continue
+
+            path = os.path.join(watch_path, os.fsdecode(name)) if name_length > 0 else watch_path
+            is_directory = (mask & IN_ISDIR) != 0
+            if not is_watched_path(path, is_directory):
+                continue
+            if self.source_file_path != None and path != self.source_file_path:
+                continue
+
+            if is_directory and mask & (IN_CREATE | IN_MOVED_TO):
+                self.add_watches(path)
+            changed_paths.add(os.path.realpath(path))
+
+class PollingWatcher:
+    """
+    Watches source_code_path by comparing the modification times of its Python files and folders every poll_interval_ms
+    """
+
+    def __init__(self, source_code_path, poll_interval_ms):
+        self.source_code_path = source_code_path
+        self.poll_interval_ms = poll_interval_ms
+        self.path_stats = self.get_path_stats()
+
+    def get_path_stats(self):
+        """
+        Returns dict with key: path of Python file or folder, value: modification time and size
+        """
+
+        path_stats = dict()
+        if not os.path.isdir(self.source_code_path):
+            try:
+                stat = os.stat(self.source_code_path)
+                path_stats[self.source_code_path] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                pass
+            return path_stats
+
+        for folder_path, _, filenames in os.walk(self.source_code_path):
+            path_stats[folder_path] = None
+            for filename in filenames:
+                path = os.path.join(folder_path, filename)
+                if not is_watched_path(path, False):
+                    continue
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                path_stats[path] = (stat.st_mtime_ns, stat.st_size)
+
+        return path_stats
+
+    def get_changed_paths(self, timeout):
+        """
+        Polls for changes until timeout seconds pass \\
+        Returns the paths of changed, added, and deleted Python files and folders
+        """
+
+        end_time = time.monotonic() + timeout
+        while True:
+            path_stats = self.get_path_stats()
+
+            changed_paths = set()
+            for path, path_stat in path_stats.items():
+                if path not in self.path_stats or self.path_stats[path] != path_stat:
+                    changed_paths.add(path)
+            for path in self.path_stats:
+                if path not in path_stats:
+                    changed_paths.add(path)
+            self.path_stats = path_stats
+
+            if len(changed_paths) > 0 or time.monotonic() >= end_time:
+                return changed_paths
+
+            time.sleep(min(self.poll_interval_ms / 1000, max(0, end_time - time.monotonic())))
+
+def get_watcher(source_code_path, poll_interval_ms):
+    """
+    Returns an InotifyWatcher if inotify is available and --poll is not provided, otherwise a PollingWatcher
+    """
+
+    if not has_option(POLL_OPTION) and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(source_code_path)
+        except (OSError, AttributeError) as e:
+            print(f"inotify is not available ({e}), polling for changes every {poll_interval_ms} ms")
+
+    return PollingWatcher(source_code_path, poll_interval_ms)
+
+def get_num_inconsistent_classes(class_statuses):
+    """
+    Returns dict with key: LinearizationStatus, value: number of classes with the status
+    """
+
+    num_inconsistent_classes = dict()
+    for status in class_statuses.values():
+        num_inconsistent_classes[status] = num_inconsistent_classes.get(status, 0) + 1
+    return num_inconsistent_classes
+
+def print_class_statuses_summary(class_statuses):
+    num_inconsistent_classes = get_num_inconsistent_classes(class_statuses)
+    print(f"number of classes that are cycle inconsistent: {num_inconsistent_classes.get(LinearizationStatus.cycle_inconsistent, 0)}")
+    print(f"number of classes that are source logical inconsistent: {num_inconsistent_classes.get(LinearizationStatus.source_logical_inconsistent, 0)}")
+    print(f"number of classes that are inherited logical inconsistent: {num_inconsistent_classes.get(LinearizationStatus.inherited_logical_inconsistent, 0)}")
+
+def usage_info():
+    """
+    Outputs the proper usage of this script
+    """
+
+    print("Usage:")
+    print("python watch_class_hierarchy_graph.py [path to Python source code] [options]")
+    print()
+    print("Options:")
+    print(f"{JOBS_OPTION} N: read and parse Python files of the first build with N worker processes")
+    print(f"{NO_CACHE_OPTION}: do not use the parse cache for the first build")
+    print(f"{CACHE_SIZE_OPTION} MB: maximum size of the parse cache, {DEFAULT_PARSE_CACHE_MAX_SIZE_MB} MB by default")
+    print(f"{POLL_OPTION}: poll for changes instead of using inotify")
+    print(f"{POLL_INTERVAL_OPTION} MS: interval of polling for changes, {DEFAULT_POLL_INTERVAL_MS} ms by default")
+    print()
+    print("Example:")
+    print("python watch_class_hierarchy_graph.py sample_inconsistent_codebase")
+
+if __name__ == "__main__":
+    """
+    Builds the class hierarchy graph of the source code and checks it for inconsistencies once \\
+    then watches the source code for changes and, on each change, updates the class hierarchy graph in memory \\
+    as with --incremental of get_class_hierarchy_graph.py, checks only the changed classes and their descendants, \\
+    and outputs the inconsistencies that were introduced or resolved
+    """
+
+    source_code_path = get_path(SOURCE_CODE_PATH_ARGUMENT_INDEX, usage_info)
+    if source_code_path == None:
+        exit(1)
+
+    jobs = get_positive_int_option(JOBS_OPTION, 1)
+    poll_interval_ms = get_positive_int_option(POLL_INTERVAL_OPTION, DEFAULT_POLL_INTERVAL_MS)
+    if jobs == None or poll_interval_ms == None:
+        exit(1)
+
+    parse_cache = None
+    if not has_option(NO_CACHE_OPTION):
+        parse_cache_max_size_mb = get_positive_int_option(CACHE_SIZE_OPTION, DEFAULT_PARSE_CACHE_MAX_SIZE_MB)
+        if parse_cache_max_size_mb == None:
+            exit(1)
+        parse_cache = ParseCache(get_parse_cache_path(source_code_path), parse_cache_max_size_mb * 1024 * 1024)
+        parse_cache.load()
+
+    codebase_parent_path = get_parent_path(source_code_path)
+    codebase_root_path = source_code_path
+
+    # the watcher is started before the first build so that changes during the build are not missed
+    watcher = get_watcher(source_code_path, poll_interval_ms)
+
+    print(f"build class hierarchy graph of source code at {source_code_path}")
+    start_time = time.perf_counter()
+
+    # the graph state keeps the module summaries and alias info of each Python file for the updates
+    class_hierarchy_graph, import_dependency_index, graph_state = build_class_hierarchy_graph(source_code_path, codebase_parent_path, codebase_root_path,
+                                                                                        True, None, jobs, parse_cache,
+                                                                                        True)
+    if parse_cache != None:
+        parse_cache.dump()
+
+    class_statuses = get_class_statuses(CompactClassHierarchyGraph(class_hierarchy_graph))
+
+    print(f"number of classes in class hierarchy graph: {len(class_hierarchy_graph)}")
+    print_class_statuses_summary(class_statuses)
+    print(f"build and check time: {(time.perf_counter() - start_time) * 1000:.0f} ms")
+
+    print()
+    print(f"watching {source_code_path} for changes, press Ctrl+C to stop")
+
+    try:
+        while True:
+            changed_paths = watcher.get_changed_paths(poll_interval_ms / 1000)
+            if len(changed_paths) == 0:
+                continue
+
+            print()
+            print(f"{len(changed_paths)} changed paths")
+            start_time = time.perf_counter()
+
+            previous_class_hierarchy_graph = class_hierarchy_graph
+            class_hierarchy_graph, import_dependency_index, graph_state = build_class_hierarchy_graph(source_code_path, codebase_parent_path, codebase_root_path,
+                                                                                                True, None, 1, None,
+                                                                                                True,
+                                                                                                graph_state, previous_class_hierarchy_graph, import_dependency_index, changed_paths)
+            build_time = time.perf_counter()
+
+            compact_class_hierarchy_graph = CompactClassHierarchyGraph(class_hierarchy_graph)
+            changed_class_identifiers = get_changed_class_identifiers(previous_class_hierarchy_graph, class_hierarchy_graph)
+            affected_class_identifiers = get_affected_class_identifiers(compact_class_hierarchy_graph, changed_class_identifiers)
+            affected_class_statuses = get_affected_class_statuses(compact_class_hierarchy_graph, affected_class_identifiers)
+
+            previous_class_statuses = class_statuses
+            class_statuses = dict()
+            for class_identifier in class_hierarchy_graph:
+                class_statuses[class_identifier] = affected_class_statuses.get(class_identifier, previous_class_statuses.get(class_identifier))
+
+            print_status_changes(get_status_changes(previous_class_statuses, class_statuses, changed_class_identifiers | affected_class_identifiers))
+
+            end_time = time.perf_counter()
+            print(f"{len(changed_class_identifiers)} changed classes, {len(affected_class_identifiers)} classes checked")
+            print_class_statuses_summary(class_statuses)
+            print(f"update time: {(end_time - start_time) * 1000:.0f} ms (build {(build_time - start_time) * 1000:.0f} ms, check {(end_time - build_time) * 1000:.0f} ms)")
+    except KeyboardInterrupt:
+        print()
+        print("stopped watching")